@@ -52,7 +52,18 @@ function main () {
     python manage.py migrate
 
     # Generate project seeds.
-    python manage.py seed
+    # If SEED_SNAPSHOT is set, a saved snapshot of that name is restored instead, when models are unchanged.
+    # Otherwise seeds are generated (with any SEED_ARGS) and saved to the snapshot, for the next start.
+    if [[ -n "${SEED_SNAPSHOT}" ]]
+    then
+        if ! python manage.py snapshot restore "${SEED_SNAPSHOT}"
+        then
+            python manage.py seed ${SEED_ARGS}
+            python manage.py snapshot save "${SEED_SNAPSHOT}"
+        fi
+    else
+        python manage.py seed ${SEED_ARGS}
+    fi
 
     echo ""
     echo -e "${text_blue}Setup complete. Running project serve at ${text_orange}http://127.0.0.1:8041/${text_reset}"
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     # Django REST Package.
     'rest_framework',
     'rest_framework.authtoken',
+    'django_filters',
 
     # Built-in Django apps.
     'django.contrib.admin',
@@ -146,6 +147,17 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Only create a UserProfile row once a user's profile is first saved, instead of on every user creation.
+# Until then, `user.profile` returns an unsaved profile with default values.
+LAZY_USER_PROFILES = False
+
+# Directory that `manage.py snapshot` saves and restores seeded database copies in.
+DB_SNAPSHOT_DIR = BASE_DIR.joinpath('snapshots')
+
+# Database sessions, that also keep user session tracking up to date when session keys change.
+SESSION_ENGINE = 'test_app.sessions'
+
+
 # Django REST settings.
 REST_FRAMEWORK = {
     # Use Django's standard `django.contrib.auth` permissions, or allow read-only access for unauthenticated users.
@@ -156,4 +168,15 @@ REST_FRAMEWORK = {
     # API pagination settings.
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+
+    # API throttle rates, by scope. See test_app/throttling.py.
+    'DEFAULT_THROTTLE_RATES': {
+        'user_bucket': '1000/min',
+        'ip_bucket': '2000/min',
+        'api_parse_user_bucket': '300/min',
+        'api_parse_ip_bucket': '600/min',
+    },
 }
+
+# Cache to share throttle buckets between processes with. Buckets are process-local if None.
+THROTTLE_CACHE_ALIAS = None
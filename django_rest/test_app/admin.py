@@ -2,38 +2,274 @@
 Admin views for Django REST test project app.
 """
 
+# System Imports.
+import time
+from datetime import timedelta
+
 # Third-Party Imports.
 from django.conf import settings
-from django.contrib import admin
-from django.contrib.admin.models import LogEntry
+from django.contrib import admin, messages
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.admin.utils import unquote
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import GroupAdmin, UserAdmin
 from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.sessions.models import Session
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import connections, router, transaction
+from django.db.models import F, Max, Min, Q, QuerySet
+from django.http import HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.html import format_html
+
+# Internal Imports.
+from test_app.bulk import bulk_insert_rows
+from test_app.forms import (
+    GroupMembersForm,
+    PreloadedAutocompleteInlineForm,
+    PreloadedAutocompleteSelect,
+    UserBulkActionForm,
+)
+from test_app.models import ModelVersion, UserSession
+from test_app.paginators import CappedCountPaginator, EstimatedCountPaginator
+from test_app.search import filter_users
 
 
 # region Admin Inlines
 
-class GroupUserInline(admin.TabularInline):
-    model = Group.user_set.through
+class UserSessionInline(admin.TabularInline):
+    model = UserSession
     extra = 0
+    can_delete = False
+    fields = ('session', 'get_expire_date', 'date_created')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('session')
+
+    def get_expire_date(self, obj):
+        return obj.session.expire_date
+    get_expire_date.short_description = 'Expire Date'
+
+
+class PreloadedAutocompleteInline(admin.TabularInline):
+    """Inline that selects related objects with autocomplete widgets, in a constant number of queries.
+
+    Related objects of `autocomplete_fields` are loaded along with the inline rows, and used to label each
+    row's widget, rather than each widget querying its own label.
+    """
+    form = PreloadedAutocompleteInlineForm
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(*self.autocomplete_fields)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.autocomplete_fields:
+            kwargs['widget'] = PreloadedAutocompleteSelect(db_field, self.admin_site, using=kwargs.get('using'))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
-class PermissionGroupInline(admin.TabularInline):
+class PermissionGroupInline(PreloadedAutocompleteInline):
     model = Permission.group_set.through
     extra = 0
+    autocomplete_fields = ('group',)
 
 
-class PermissionUserInline(admin.TabularInline):
+class PermissionUserInline(PreloadedAutocompleteInline):
     model = Permission.user_set.through
     extra = 0
+    autocomplete_fields = ('user',)
 
 # endregion Admin Inlines
 
 
+# region Admin Utilities
+
+# Query param for keyset pagination position.
+KEYSET_VAR = 'after'
+
+# Query param to request exact counts, instead of estimates.
+EXACT_COUNT_VAR = 'exact_count'
+
+
+class IndexedDateQuerySet(QuerySet):
+    """QuerySet that serves admin date hierarchy lookups from an index on the date field.
+
+    Date hierarchies normally find the first and last dates with a single MIN/MAX query, and list
+    dates with a DISTINCT query, which both read every row. Here the first and last dates are each found
+    with an indexed "ORDER BY ... LIMIT 1" lookup, and dates are listed by stepping between periods that have rows.
+    """
+
+    def aggregate(self, *args, **kwargs):
+        aggregates = list(kwargs.values())
+        if args or not aggregates or not all(self._is_field_min_max(aggregate) for aggregate in aggregates):
+            return super().aggregate(*args, **kwargs)
+
+        results = {}
+        for name, aggregate in kwargs.items():
+            field_name = aggregate.get_source_expressions()[0].name
+            ordered = self.filter(**{'{0}__isnull'.format(field_name): False}).order_by(
+                field_name if isinstance(aggregate, Min) else '-{0}'.format(field_name),
+            )
+            results[name] = ordered.values_list(field_name, flat=True).first()
+
+        return results
+
+    def datetimes(self, field_name, kind, *args, **kwargs):
+        """Lists the start of each period that has rows, with one indexed lookup per listed period.
+
+        Starting from the first value, each lookup finds the first value at or after the start of the next period,
+        skipping over periods without rows.
+        """
+        ordered_values = self.filter(**{'{0}__isnull'.format(field_name): False}).order_by(field_name)
+        current = ordered_values.values_list(field_name, flat=True).first()
+
+        periods = []
+        while current is not None:
+            if timezone.is_aware(current):
+                current = timezone.localtime(current)
+
+            # Truncate value to the start of its period.
+            period = current.replace(hour=0, minute=0, second=0, microsecond=0)
+            if kind in ('year', 'month'):
+                period = period.replace(day=1)
+            if kind == 'year':
+                period = period.replace(month=1)
+            periods.append(period)
+
+            if kind == 'year':
+                next_period = period.replace(year=period.year + 1)
+            elif kind == 'month':
+                next_period = period.replace(year=period.year + period.month // 12, month=period.month % 12 + 1)
+            else:
+                next_period = period + timedelta(days=1)
+
+            current = ordered_values.filter(
+                **{'{0}__gte'.format(field_name): next_period},
+            ).values_list(field_name, flat=True).first()
+
+        return periods
+
+    def _is_field_min_max(self, aggregate):
+        """Returns True if aggregate is a MIN or MAX of a single field."""
+        source_expressions = aggregate.get_source_expressions()
+        return (
+            isinstance(aggregate, (Min, Max))
+            and len(source_expressions) == 1
+            and isinstance(source_expressions[0], F)
+            and aggregate.filter is None
+        )
+
+
+class EstimatedCountChangeList(ChangeList):
+    """Changelist for admins using EstimatedCountAdminMixin, which adds a link to request an exact count."""
+
+    def __init__(self, *args, **kwargs):
+        self.exact_count_link = None
+        super().__init__(*args, **kwargs)
+
+    def get_filters_params(self, *args, **kwargs):
+        lookup_params = super().get_filters_params(*args, **kwargs)
+        lookup_params.pop(EXACT_COUNT_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        super().get_results(request)
+
+        if self.paginator.count_estimated or self.paginator.count_capped:
+            self.exact_count_link = self.get_query_string({EXACT_COUNT_VAR: '1'})
+
+
+class EstimatedCountAdminMixin:
+    """ModelAdmin mixin that estimates or caps changelist counts, rather than counting every row.
+
+    Shows "about N" for estimates, and "N+" for capped counts, with a link to count exactly.
+    Custom changelist classes should extend EstimatedCountChangeList.
+    """
+
+    paginator = EstimatedCountPaginator
+
+    # Avoid counting the unfiltered table again, when filters are applied.
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return EstimatedCountChangeList
+
+    def get_paginator(self, request, *args, **kwargs):
+        paginator = super().get_paginator(request, *args, **kwargs)
+        paginator.exact_count = EXACT_COUNT_VAR in request.GET
+        return paginator
+
+
+class KeysetChangeList(EstimatedCountChangeList):
+    """Changelist that adds a "next page" link, which continues after the last displayed row.
+
+    Unlike page numbers, the link stays cheap however far in it is, and works past the counted pages.
+    Uses the `keyset_field` of the model admin, plus primary key, in descending order.
+    Only applies when the default ordering is used.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.keyset_after = self.parse_keyset(request.GET.get(KEYSET_VAR))
+        self.keyset_next_link = None
+        super().__init__(request, *args, **kwargs)
+
+        # Do not carry keyset position into filter and sort links.
+        self.params.pop(KEYSET_VAR, None)
+
+    def parse_keyset(self, value):
+        """Returns (datetime, pk) for a keyset query param value, or None if not provided or invalid."""
+        if not value:
+            return None
+
+        value, _, pk = value.rpartition(',')
+        try:
+            return parse_datetime(value), int(pk)
+        except (TypeError, ValueError):
+            return None
+
+    def get_filters_params(self, *args, **kwargs):
+        lookup_params = super().get_filters_params(*args, **kwargs)
+        lookup_params.pop(KEYSET_VAR, None)
+        return lookup_params
+
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        if self.keyset_after is not None and self.keyset_after[0] is not None and ORDER_VAR not in self.params:
+            value, pk = self.keyset_after
+            field_name = self.model_admin.keyset_field
+            # The separate "<=" condition lets the database read the range from an index.
+            queryset = queryset.filter(
+                Q(**{'{0}__lte'.format(field_name): value}),
+                Q(**{'{0}__lt'.format(field_name): value}) | Q(pk__lt=pk),
+            )
+        return queryset
+
+    def get_results(self, request):
+        super().get_results(request)
+
+        if ORDER_VAR not in self.params and len(self.result_list) >= self.list_per_page:
+            last = list(self.result_list)[-1]
+            self.keyset_next_link = self.get_query_string(
+                {KEYSET_VAR: '{0},{1}'.format(getattr(last, self.model_admin.keyset_field).isoformat(), last.pk)},
+                [PAGE_VAR],
+            )
+
+
+# endregion Admin Utilities
+
+
 # region Admin Definitions
 
-class DjangoLogAdmin(admin.ModelAdmin):
+class DjangoLogAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     """
     Admin handling for Django's built-in admin view "LogEntry" models.
     """
@@ -42,12 +278,22 @@ class DjangoLogAdmin(admin.ModelAdmin):
     if settings.DEBUG:
         list_display = ('id',) + list_display
 
+    # Load displayed relations in the page query, with a join.
+    list_select_related = ('user', 'content_type')
+
     # Default field ordering in admin list view.
-    ordering = ('-action_time', 'user__username', 'content_type')
+    # Matches the (action_time, id) index, so pages are read straight from the index, with no sort or join.
+    ordering = ('-action_time', '-id')
+
+    # Field to page through with "next page" links, along with id, when using default ordering.
+    keyset_field = 'action_time'
 
     # Date filtering in admin list view.
     date_hierarchy = 'action_time'
 
+    # Adds "next page" link to pagination.
+    change_list_template = 'admin/test_app/keyset_change_list.html'
+
     # Read only fields for admin detail view.
     readonly_fields = ('id', 'action_time')
 
@@ -70,11 +316,35 @@ class DjangoLogAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Returns queryset that builds the date hierarchy from indexed range lookups."""
+        queryset = super().get_queryset(request)
+        return IndexedDateQuerySet(model=queryset.model, query=queryset.query, using=queryset.db)
 
-class DjangoUserAdmin(UserAdmin):
+    def get_changelist(self, request, **kwargs):
+        """Returns changelist class that supports "next page" links past the counted pages."""
+        return KeysetChangeList
+
+
+class DjangoUserAdmin(EstimatedCountAdminMixin, UserAdmin):
     """
     Admin handling for Django's built-in authentication "User" models.
     """
+    inlines = [UserSessionInline]
+
+    # Actions available in admin list view.
+    # Bulk actions run as set-based queries, so they stay fast when applied to all users of a large changelist.
+    # All require user change permission. Group and permission actions also require change permission on those models.
+    actions = [
+        'activate_users',
+        'deactivate_users',
+        'add_to_group',
+        'remove_from_group',
+        'grant_permission',
+        'revoke_sessions',
+    ]
+    action_form = UserBulkActionForm
+
     # Fields to display in admin list view.
     list_display = ('username', 'first_name', 'last_name', 'email', 'is_active', 'last_login')
     if settings.DEBUG:
@@ -86,8 +356,8 @@ class DjangoUserAdmin(UserAdmin):
     # Fields to filter by in admin list view.
     list_filter = ('is_active',)
 
-    # Display many-to-many in more user-friendly format, in admin list view.
-    filter_horizontal = ('user_permissions', 'groups',)
+    # Select many-to-many values with search-as-you-type widgets, which only render selected values.
+    autocomplete_fields = ('user_permissions', 'groups')
 
     # Read only fields for admin detail view.
     readonly_fields = ('id', 'date_joined', 'last_login')
@@ -109,13 +379,172 @@ class DjangoUserAdmin(UserAdmin):
     class Media:
         js = ['admin/js/list_filter_collapse.js']
 
+    def get_search_results(self, request, queryset, search_term):
+        """Searches using the user search index, instead of a "LIKE" scan per search field."""
+        if not search_term:
+            return queryset, False
+        return filter_users(queryset, search_term), False
+
+    def formfield_for_manytomany(self, db_field, request=None, **kwargs):
+        if db_field.name == 'user_permissions':
+            # Permission labels include their content type.
+            kwargs['queryset'] = Permission.objects.select_related('content_type')
+        return super().formfield_for_manytomany(db_field, request=request, **kwargs)
+
+    def activate_users(self, request, queryset):
+        """Activates selected users, with a single UPDATE."""
+        self._bulk_set_active(request, queryset, True)
+    activate_users.short_description = 'Activate selected users'
+    activate_users.allowed_permissions = ('change',)
+
+    def deactivate_users(self, request, queryset):
+        """Deactivates selected users, with a single UPDATE."""
+        self._bulk_set_active(request, queryset, False)
+    deactivate_users.short_description = 'Deactivate selected users'
+    deactivate_users.allowed_permissions = ('change',)
+
+    def add_to_group(self, request, queryset):
+        """Adds selected users to the group chosen in the action form, with batched inserts."""
+        group = self._get_action_form_value(request, 'group')
+        if group is None:
+            return
+
+        start_time = time.monotonic()
+        with transaction.atomic():
+            users = self._bulk_add_relation(queryset, get_user_model().groups.through, 'group', group)
+            self._bulk_log_change(request, users, 'Added to group "{0}".'.format(group))
+            ModelVersion.objects.bump(get_user_model(), Group)
+
+        self._message_bulk_result(request, 'Added {0} users to group "{1}"', len(users), start_time, group)
+    add_to_group.short_description = 'Add selected users to group'
+    add_to_group.allowed_permissions = ('change_groups',)
+
+    def remove_from_group(self, request, queryset):
+        """Removes selected users from the group chosen in the action form, with a single DELETE."""
+        group = self._get_action_form_value(request, 'group')
+        if group is None:
+            return
+
+        start_time = time.monotonic()
+        with transaction.atomic():
+            memberships = get_user_model().groups.through.objects.filter(group=group, user__in=queryset)
+            users = list(memberships.values_list('user_id', 'user__username'))
+            memberships.delete()
+            self._bulk_log_change(request, users, 'Removed from group "{0}".'.format(group))
+            ModelVersion.objects.bump(get_user_model(), Group)
+
+        self._message_bulk_result(request, 'Removed {0} users from group "{1}"', len(users), start_time, group)
+    remove_from_group.short_description = 'Remove selected users from group'
+    remove_from_group.allowed_permissions = ('change_groups',)
+
+    def grant_permission(self, request, queryset):
+        """Grants the permission chosen in the action form to selected users, with batched inserts."""
+        permission = self._get_action_form_value(request, 'permission')
+        if permission is None:
+            return
+
+        start_time = time.monotonic()
+        with transaction.atomic():
+            users = self._bulk_add_relation(
+                queryset,
+                get_user_model().user_permissions.through,
+                'permission',
+                permission,
+            )
+            self._bulk_log_change(request, users, 'Granted permission "{0}".'.format(permission))
+            ModelVersion.objects.bump(get_user_model(), Permission)
+
+        self._message_bulk_result(request, 'Granted {0} users permission "{1}"', len(users), start_time, permission)
+    grant_permission.short_description = 'Grant permission to selected users'
+    grant_permission.allowed_permissions = ('change_permissions',)
+
+    # Actions pass if any of their allowed permissions pass, so these each combine both required permissions.
+    def has_change_groups_permission(self, request):
+        """Returns True if user can change both users and groups, for the group membership actions."""
+        return self.has_change_permission(request) and request.user.has_perm('auth.change_group')
+
+    def has_change_permissions_permission(self, request):
+        """Returns True if user can change both users and permissions, for the grant permission action."""
+        return self.has_change_permission(request) and request.user.has_perm('auth.change_permission')
+
+    def _bulk_set_active(self, request, queryset, is_active):
+        """Sets is_active for selected users that do not have that value yet. Logs each changed user."""
+        start_time = time.monotonic()
+        with transaction.atomic():
+            changed = get_user_model().objects.filter(
+                pk__in=queryset.order_by().values('pk'),
+            ).exclude(is_active=is_active)
+            users = list(changed.values_list('pk', 'username'))
+            changed.update(is_active=is_active)
+            self._bulk_log_change(request, users, 'Activated.' if is_active else 'Deactivated.')
+            ModelVersion.objects.bump(get_user_model())
+
+        self._message_bulk_result(
+            request,
+            'Activated {0} users' if is_active else 'Deactivated {0} users',
+            len(users),
+            start_time,
+        )
+
+    def _bulk_add_relation(self, queryset, through_model, field_name, value):
+        """Inserts many-to-many rows between selected users and a single related object.
+
+        Users that already have the relation are skipped.
+        :return: List of (pk, username) for users that the relation was added to.
+        """
+        users = list(queryset.exclude(
+            pk__in=through_model.objects.filter(**{field_name: value}).values('user_id'),
+        ).order_by('pk').values_list('pk', 'username'))
+
+        bulk_insert_rows(through_model, ('user', field_name), [(pk, value.pk) for pk, username in users])
+        return users
+
+    def _bulk_log_change(self, request, users, message):
+        """Records a change LogEntry for each provided (pk, username), with a bulk insert."""
+        connection = connections[router.db_for_write(LogEntry)]
+        action_time = LogEntry._meta.get_field('action_time').get_db_prep_value(timezone.now(), connection)
+        content_type_id = ContentType.objects.get_for_model(get_user_model()).pk
+
+        bulk_insert_rows(
+            LogEntry,
+            ('action_time', 'user', 'content_type', 'object_id', 'object_repr', 'action_flag', 'change_message'),
+            [
+                (action_time, request.user.pk, content_type_id, str(pk), username[:200], CHANGE, message)
+                for pk, username in users
+            ],
+        )
+
+    def _get_action_form_value(self, request, field_name):
+        """Returns object selected in action form field. Shows an error message if none was selected."""
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if not form.is_valid() or form.cleaned_data[field_name] is None:
+            self.message_user(request, 'Select a {0} to apply the action with.'.format(field_name), messages.ERROR)
+            return None
+        return form.cleaned_data[field_name]
+
+    def _message_bulk_result(self, request, message, row_count, start_time, *args):
+        """Shows bulk action result message, with number of rows affected and elapsed time."""
+        self.message_user(request, '{0} in {1:.2f} seconds.'.format(
+            message.format(row_count, *args),
+            time.monotonic() - start_time,
+        ))
+
+    def revoke_sessions(self, request, queryset):
+        """Logs selected users out of all their tracked sessions."""
+        deleted_count = Session.objects.filter(user_session__user__in=queryset).delete()[1].get(Session._meta.label, 0)
+        self.message_user(request, 'Revoked {0} sessions.'.format(deleted_count))
+    revoke_sessions.short_description = 'Log out of all sessions'
+    revoke_sessions.allowed_permissions = ('change',)
+
 
 class DjangoGroupAdmin(GroupAdmin):
     """
     Admin handling for Django's built-in permission "Group" models.
-    """
-    inlines = [GroupUserInline]
 
+    Group members are managed on a separate paginated page, rather than as an inline, so that
+    the group change page does not grow with the number of members.
+    """
     # Fields to display in admin list view.
     list_display = ('name',)
     if settings.DEBUG:
@@ -124,16 +553,16 @@ class DjangoGroupAdmin(GroupAdmin):
     # Default field ordering in admin list view.
     ordering = ('name',)
 
-    # Display many-to-many in more user-friendly format, in admin list view.
-    filter_horizontal = ('permissions',)
+    # Select many-to-many values with search-as-you-type widgets, which only render selected values.
+    autocomplete_fields = ('permissions',)
 
     # Read only fields for admin detail view.
-    readonly_fields = ('id',)
+    readonly_fields = ('id', 'get_members_link')
 
     # Fieldset organization for admin detail view.
     fieldsets = (
         (None, {
-            'fields': ('name', 'permissions')
+            'fields': ('name', 'permissions', 'get_members_link')
         }),
         ('Advanced', {
             'classes': ('collapse',),
@@ -141,8 +570,107 @@ class DjangoGroupAdmin(GroupAdmin):
         }),
     )
 
+    # Number of members to display per page of members view.
+    members_per_page = 100
 
-class DjangoPermissionAdmin(admin.ModelAdmin):
+    # Max number of members to count for the change page members link.
+    members_count_cap = 10000
+
+    def get_urls(self):
+        return [
+            path(
+                '<path:object_id>/members/',
+                self.admin_site.admin_view(self.members_view),
+                name='auth_group_members',
+            ),
+        ] + super().get_urls()
+
+    def get_members_link(self, obj):
+        """
+        Returns link to group members page, with number of members.
+
+        Members are counted no further than `members_count_cap`, so large groups show as "10,000+ members".
+        """
+        if obj is None or obj.pk is None:
+            return '-'
+
+        memberships = get_user_model().groups.through.objects.filter(group=obj).order_by('user_id')
+        paginator = CappedCountPaginator(memberships, self.members_per_page)
+        paginator.count_cap = self.members_count_cap
+        return format_html(
+            '<a href="{0}">Manage {1}{2} members</a>',
+            reverse('admin:auth_group_members', args=[obj.pk], current_app=self.admin_site.name),
+            '{0:,}'.format(paginator.count),
+            '+' if paginator.count_capped else '',
+        )
+    get_members_link.short_description = 'Members'
+
+    def members_view(self, request, object_id):
+        """
+        Lists one page of group members, with forms to add members by autocomplete search and remove selected members.
+
+        Members are paged by user id, with "next page" links, so each page is a single indexed range query.
+        """
+        group = self.get_object(request, unquote(object_id))
+        if group is None:
+            return self._get_obj_does_not_exist_redirect(request, self.opts, object_id)
+        if not self.has_view_or_change_permission(request, group):
+            raise PermissionDenied
+
+        add_form = GroupMembersForm(admin_site=self.admin_site)
+        if request.method == 'POST':
+            if not self.has_change_permission(request, group):
+                raise PermissionDenied
+
+            if '_add' in request.POST:
+                add_form = GroupMembersForm(request.POST, admin_site=self.admin_site)
+                if add_form.is_valid():
+                    users = add_form.cleaned_data['users']
+                    group.user_set.add(*users)
+                    message = 'Added {0} members.'.format(len(users))
+                    self.log_change(request, group, message)
+                    self.message_user(request, message)
+                    return HttpResponseRedirect(request.get_full_path())
+
+            elif '_remove' in request.POST:
+                user_ids = [int(user_id) for user_id in request.POST.getlist('remove') if user_id.isdigit()]
+                memberships = get_user_model().groups.through.objects.filter(group=group, user_id__in=user_ids)
+                with transaction.atomic():
+                    removed_ids = list(memberships.values_list('user_id', flat=True))
+                    group.user_set.remove(*removed_ids)
+                message = 'Removed {0} members.'.format(len(removed_ids))
+                self.log_change(request, group, message)
+                self.message_user(request, message)
+                return HttpResponseRedirect(request.get_full_path())
+
+        # Read one more member than displayed, to know if there is a next page.
+        after = request.GET.get(KEYSET_VAR, '')
+        memberships = get_user_model().groups.through.objects.filter(group=group).select_related('user')
+        if after.isdigit():
+            memberships = memberships.filter(user_id__gt=int(after))
+        members = [membership.user for membership in memberships.order_by('user_id')[:self.members_per_page + 1]]
+
+        next_link = None
+        if len(members) > self.members_per_page:
+            members = members[:self.members_per_page]
+            next_link = '?{0}={1}'.format(KEYSET_VAR, members[-1].pk)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Members of {0}'.format(group),
+            'opts': self.opts,
+            'original': group,
+            'add_form': add_form,
+            'media': self.media + add_form.media,
+            'members': members,
+            'is_first_page': not after,
+            'next_link': next_link,
+            'has_change_permission': self.has_change_permission(request, group),
+        }
+        return TemplateResponse(request, 'admin/test_app/group_members.html', context)
+
+
+class DjangoPermissionAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     """
     Admin handling for Django's built-in "Permission" models.
     """
@@ -156,6 +684,11 @@ class DjangoPermissionAdmin(admin.ModelAdmin):
     # Default field ordering in admin list view.
     ordering = ('content_type__app_label', 'content_type__model', 'name')
 
+    # Fields to search by, in admin list view and permission autocomplete widgets.
+    # Matched anywhere in the value, so "user" finds both "add_user" and "Can add user". Neither field is
+    # indexed, so each search checks every permission. That table only grows with the number of models.
+    search_fields = ('codename', 'name')
+
     # Read only fields for admin detail view.
     readonly_fields = ('id',)
 
@@ -170,8 +703,12 @@ class DjangoPermissionAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Loads content types along with permissions, as permission labels include them."""
+        return super().get_queryset(request).select_related('content_type')
+
 
-class DjangoSessionAdmin(admin.ModelAdmin):
+class DjangoSessionAdmin(EstimatedCountAdminMixin, admin.ModelAdmin):
     """
     Admin handling for Django's built-in "Session" models.
     """
@@ -191,14 +728,38 @@ class DjangoSessionAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_changelist(self, request, **kwargs):
+        """Returns changelist class that loads session users for the whole page at once."""
+        return SessionChangeList
+
+    def preload_sessions(self, sessions):
+        """Decodes provided sessions and fetches their users, using a single user query.
+
+        Results are stored on each session, for use by the list display methods.
+        """
+        user_model = get_user_model()
+        user_ids = {}
+        for session in sessions:
+            user_id = self.get_session_data(session).get('_auth_user_id')
+            if user_id is not None:
+                try:
+                    user_ids[session.pk] = user_model._meta.pk.to_python(user_id)
+                except ValidationError:
+                    pass
+
+        users = user_model.objects.in_bulk(set(user_ids.values()))
+        for session in sessions:
+            session._session_user = users.get(user_ids.get(session.pk))
+
     def get_session_data(self, obj):
         """
-        Alias for getting decoded session data.
+        Alias for getting decoded session data. Only decodes once per session instance.
         """
         # Decode our session data, or attempt to.
-        return_val = obj.get_decoded()
+        if not hasattr(obj, '_session_data'):
+            obj._session_data = obj.get_decoded()
 
-        return return_val
+        return obj._session_data
 
     def is_valid(self, obj):
         """
@@ -215,13 +776,23 @@ class DjangoSessionAdmin(admin.ModelAdmin):
         """
         Returns associated user model, or the string 'Anonymous' if session is corrupted or for a non-login.
         """
-        try:
-            user_id = self.get_session_data(obj)['_auth_user_id']
-            return get_user_model().objects.get(id=user_id)
-        except KeyError:
+        if not hasattr(obj, '_session_user'):
+            self.preload_sessions([obj])
+
+        if obj._session_user is None:
             return 'Anonymous'
+        return obj._session_user
     get_session_user.short_description = 'Session User'
 
+
+class SessionChangeList(EstimatedCountChangeList):
+    """Session admin changelist, which preloads session users for the displayed page."""
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.result_list = list(self.result_list)
+        self.model_admin.preload_sessions(self.result_list)
+
 # endregion Admin Definitions
 
 
@@ -9,3 +9,7 @@ from django.apps import AppConfig
 class TestAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'test_app'
+
+    def ready(self):
+        # Register app signals.
+        from test_app import signals  # noqa: F401
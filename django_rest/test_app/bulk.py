@@ -0,0 +1,163 @@
+"""
+Bulk data helpers for Django REST test project app.
+"""
+
+# System Imports.
+import time
+from contextlib import contextmanager
+
+# Third-Party Imports.
+from django.db import connections, router, transaction
+
+# Internal Imports.
+from test_app.models import ModelVersion
+
+
+def bulk_insert_rows(model, field_names, rows, using=None):
+    """Inserts rows of already database-ready values, as one repeated prepared statement.
+
+    Bypasses model instances, as building one instance per row is slower than the insert itself.
+    Skips model signals, so callers are responsible for ModelVersion bumps and search indexing.
+
+    :param model: Model class to insert into.
+    :param field_names: Names of the model fields that each row provides values for, in row order.
+    :param rows: Iterable of value tuples.
+    :param using: Database alias. Defaults to the write database of the model.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    connection = connections[using or router.db_for_write(model)]
+    columns = [model._meta.get_field(field_name).column for field_name in field_names]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO {0} ({1}) VALUES ({2})'.format(
+                connection.ops.quote_name(model._meta.db_table),
+                ', '.join(connection.ops.quote_name(column) for column in columns),
+                ', '.join(['%s'] * len(columns)),
+            ),
+            rows,
+        )
+
+
+def delete_in_batches(queryset, batch_size, sleep, max_rate=None, stdout=None):
+    """Deletes all rows of an ordered queryset, one batch per transaction. Returns number of rows deleted.
+
+    :param queryset: Rows to delete. Should be ordered by an indexed field, so each batch is an index scan.
+    :param batch_size: Max number of rows to delete per transaction.
+    :param sleep: Seconds to pause between batches.
+    :param max_rate: Optional max number of rows to delete per second. Pauses are extended to stay under it.
+    :param stdout: Optional output stream, to write progress to after each batch.
+    """
+    model = queryset.model
+    deleted_count = 0
+    start_time = time.monotonic()
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            break
+
+        with transaction.atomic(), ModelVersion.objects.batched():
+            model._default_manager.filter(pk__in=pks).delete()
+
+        deleted_count += len(pks)
+        elapsed = time.monotonic() - start_time
+        if stdout is not None:
+            stdout.write('Deleted {0} rows ({1:.0f} rows/s)...'.format(
+                deleted_count,
+                deleted_count / max(elapsed, 0.001),
+            ))
+
+        if len(pks) < batch_size:
+            break
+
+        pause = sleep
+        if max_rate:
+            pause = max(pause, deleted_count / max_rate - elapsed)
+        if pause > 0:
+            time.sleep(pause)
+
+    return deleted_count
+
+
+# Table recording indexes dropped by deferred_indexes(), so they can be recreated if a load is interrupted.
+DEFERRED_INDEX_TABLE = 'test_app_deferred_index'
+
+
+def restore_deferred_indexes(using='default'):
+    """Recreates indexes left dropped by an interrupted `deferred_indexes()` block. Returns number of indexes created.
+
+    Only supported on SQLite.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return 0
+
+    with connection.cursor() as cursor:
+        if DEFERRED_INDEX_TABLE not in connection.introspection.table_names(cursor):
+            return 0
+        cursor.execute('SELECT name, sql FROM {0}'.format(DEFERRED_INDEX_TABLE))
+        indexes = cursor.fetchall()
+
+    if indexes:
+        _create_deferred_indexes(connection, indexes)
+    return len(indexes)
+
+
+@contextmanager
+def deferred_indexes(*models, using='default', unique=False):
+    """Drops non-unique indexes of the provided model tables for the duration of the block, then recreates them.
+
+    Building an index once from all rows is much faster than updating it for each inserted row.
+    Unique indexes are kept by default, so constraints are still enforced during inserts. With `unique=True`,
+    unique indexes that are not part of a table definition are dropped too. Only use that for rows that are
+    distinct by construction, as duplicates are only detected when the indexes are recreated, which then fails.
+    Only supported on SQLite.
+
+    Dropped indexes are recorded in the same transaction that drops them. If the process is killed before
+    they are recreated, `restore_deferred_indexes()` recreates them, which this also does on entry.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        yield
+        return
+
+    restore_deferred_indexes(using=using)
+
+    tables = [model._meta.db_table for model in models]
+    query = 'SELECT name, sql FROM sqlite_master WHERE type = \'index\' AND sql IS NOT NULL AND tbl_name IN ({0})'
+    query = query.format(', '.join(['%s'] * len(tables)))
+    if not unique:
+        query += ' AND sql NOT LIKE \'CREATE UNIQUE %%\''
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(query, tables)
+        indexes = cursor.fetchall()
+        cursor.execute(
+            'CREATE TABLE IF NOT EXISTS {0} (name TEXT NOT NULL PRIMARY KEY, sql TEXT NOT NULL)'.format(
+                DEFERRED_INDEX_TABLE,
+            ),
+        )
+        cursor.executemany('INSERT INTO {0} (name, sql) VALUES (%s, %s)'.format(DEFERRED_INDEX_TABLE), indexes)
+        for name, sql in indexes:
+            cursor.execute('DROP INDEX {0}'.format(connection.ops.quote_name(name)))
+
+    try:
+        yield
+    finally:
+        _create_deferred_indexes(connection, indexes)
+
+
+def _create_deferred_indexes(connection, indexes):
+    """Recreates dropped indexes from their (name, sql) values, and removes their deferred index records."""
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute('SELECT name FROM sqlite_master WHERE type = \'index\'')
+        existing_names = {name for name, in cursor.fetchall()}
+        for name, sql in indexes:
+            if name not in existing_names:
+                cursor.execute(sql)
+        cursor.executemany(
+            'DELETE FROM {0} WHERE name = %s'.format(DEFERRED_INDEX_TABLE),
+            [(name,) for name, sql in indexes],
+        )
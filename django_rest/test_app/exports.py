@@ -0,0 +1,141 @@
+"""
+Data export logic for Django REST test project app.
+"""
+
+# System Imports.
+import csv
+import io
+from collections import defaultdict
+
+# Third-Party Imports.
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+# Columns included in each exported user row, in output order.
+USER_EXPORT_FIELDS = (
+    'id',
+    'username',
+    'email',
+    'first_name',
+    'last_name',
+    'is_active',
+    'is_staff',
+    'is_superuser',
+    'last_login',
+    'date_joined',
+    'groups',
+    'permissions',
+    'address_1',
+    'address_2',
+    'city',
+    'state',
+    'zipcode',
+)
+USER_EXPORT_PROFILE_FIELDS = ('address_1', 'address_2', 'city', 'state', 'zipcode')
+
+
+def iter_user_export_chunks(queryset, chunk_size=500):
+    """Yields lists of user export rows (as dicts), reading users in primary key order.
+
+    Each chunk is read with a keyset query (pk > last seen pk) plus one batched query per relation,
+    so memory use and per-chunk query count stay constant regardless of table size.
+    No database cursor is held open between chunks.
+
+    :param queryset: User queryset to export.
+    :param chunk_size: Number of users to read per chunk.
+    """
+    user_model = queryset.model
+    group_through = user_model.groups.through
+    permission_through = user_model.user_permissions.through
+
+    queryset = queryset.select_related('profile').order_by('pk')
+    last_pk = None
+    while True:
+        chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        users = list(chunk_queryset[:chunk_size])
+        if not users:
+            return
+
+        user_ids = [user.pk for user in users]
+
+        # Batch related data for entire chunk.
+        groups = defaultdict(list)
+        for user_id, group_name in group_through.objects.filter(
+            user_id__in=user_ids,
+        ).order_by('group__name').values_list('user_id', 'group__name'):
+            groups[user_id].append(group_name)
+
+        permissions = defaultdict(list)
+        for user_id, app_label, codename in permission_through.objects.filter(
+            user_id__in=user_ids,
+        ).order_by(
+            'permission__content_type__app_label', 'permission__codename',
+        ).values_list('user_id', 'permission__content_type__app_label', 'permission__codename'):
+            permissions[user_id].append('{0}.{1}'.format(app_label, codename))
+
+        rows = []
+        for user in users:
+            row = {
+                'id': user.pk,
+                'username': user.username,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'is_active': user.is_active,
+                'is_staff': user.is_staff,
+                'is_superuser': user.is_superuser,
+                'last_login': user.last_login,
+                'date_joined': user.date_joined,
+                'groups': groups[user.pk],
+                'permissions': permissions[user.pk],
+            }
+
+            # Users may not have a profile row. Export blank values in such case.
+            profile = getattr(user, 'profile', None)
+            for field in USER_EXPORT_PROFILE_FIELDS:
+                row[field] = getattr(profile, field, '') if profile is not None else ''
+
+            rows.append(row)
+
+        yield rows
+
+        if len(users) < chunk_size:
+            return
+        last_pk = users[-1].pk
+
+
+def iter_ndjson(row_chunks):
+    """Yields newline-delimited JSON text, one string per chunk of rows."""
+    encoder = DjangoJSONEncoder()
+    for rows in row_chunks:
+        yield ''.join('{0}\n'.format(encoder.encode(row)) for row in rows)
+
+
+def iter_csv(row_chunks, fields=USER_EXPORT_FIELDS):
+    """Yields CSV text, starting with a header line, then one string per chunk of rows.
+
+    List values (such as groups) are joined with semicolons.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(fields)
+    yield buffer.getvalue()
+
+    for rows in row_chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow([_csv_value(row[field]) for field in fields])
+        yield buffer.getvalue()
+
+
+def _csv_value(value):
+    """Converts a single export value to its CSV representation."""
+    if isinstance(value, list):
+        return ';'.join(value)
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
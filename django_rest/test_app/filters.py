@@ -0,0 +1,45 @@
+"""
+Filters for Django REST test project app.
+"""
+
+# Third-Party Imports.
+from django.contrib.auth import get_user_model
+from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
+
+
+class IndexedBooleanFilter(filters.BooleanFilter):
+    """Boolean filter that compares using `IN`, so the database can use an index for it.
+
+    Django renders boolean exact lookups as a bare `WHERE field` or `WHERE NOT field`,
+    which SQLite cannot serve from an index.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        return self.get_method(qs)(**{'{0}__in'.format(self.field_name): [value]})
+
+
+class UserFilterSet(filters.FilterSet):
+    """Filters for REST API user list.
+
+    Every filter is backed by a database index. See User and UserProfile model Meta.
+    """
+
+    # Flag filters.
+    is_active = IndexedBooleanFilter()
+    is_staff = IndexedBooleanFilter()
+
+    # Datetime ranges. Provided as "<field>_after" and "<field>_before" query params.
+    date_joined = filters.IsoDateTimeFromToRangeFilter()
+    last_login = filters.IsoDateTimeFromToRangeFilter()
+
+    # Relation filters.
+    group = filters.NumberFilter(field_name='groups')
+    state = filters.CharFilter(field_name='profile__state')
+    zipcode = filters.CharFilter(field_name='profile__zipcode')
+
+    class Meta:
+        model = get_user_model()
+        fields = ['is_active', 'is_staff']
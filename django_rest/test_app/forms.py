@@ -6,6 +6,11 @@ Forms for Django REST test project app.
 
 # Third-Party Imports.
 from django import forms
+from django.contrib import admin
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect, AutocompleteSelectMultiple
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
 
 # Internal Imports.
 
@@ -33,3 +38,76 @@ class ApiSendForm(forms.Form):
             'If left empty, will send <br>{"success": true}.'
         )
     )
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """Autocomplete select that labels its selected value from an already loaded object, when one is provided.
+
+    Standard autocomplete widgets run a query per widget to label their selected value, which adds a
+    query per row when rendering inlines.
+    """
+
+    # Loaded object for the selected value. Set per form.
+    selected_object = None
+
+    def optgroups(self, name, value, attr=None):
+        selected_object = self.selected_object
+        if selected_object is None or [str(item) for item in value] != [str(selected_object.pk)]:
+            return super().optgroups(name, value, attr)
+
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(self.create_option(
+            name,
+            selected_object.pk,
+            self.choices.field.label_from_instance(selected_object),
+            True,
+            len(options),
+        ))
+        return [(None, options, 0)]
+
+
+class PreloadedAutocompleteInlineForm(forms.ModelForm):
+    """Inline form that passes its already loaded related objects to its PreloadedAutocompleteSelect widgets."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if self.instance.pk is None:
+            return
+
+        for field_name, field in self.fields.items():
+            # Admin wraps relation widgets, to add "add/change related" links.
+            widget = getattr(field.widget, 'widget', field.widget)
+            if isinstance(widget, PreloadedAutocompleteSelect):
+                widget.selected_object = getattr(self.instance, field_name)
+
+
+class GroupMembersForm(forms.Form):
+    """Adds users to a group, selected with an admin autocomplete search."""
+
+    def __init__(self, *args, admin_site, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Widget only renders selected users, and searches the rest through the user admin.
+        self.fields['users'] = forms.ModelMultipleChoiceField(
+            queryset=get_user_model().objects.all(),
+            widget=AutocompleteSelectMultiple(get_user_model().groups.through._meta.get_field('user'), admin_site),
+            help_text='Search users by name or email.',
+        )
+
+
+class UserBulkActionForm(ActionForm):
+    """User admin action form, with the group or permission to apply group/permission actions with."""
+
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.all(),
+        required=False,
+        widget=AutocompleteSelect(get_user_model().groups.through._meta.get_field('group'), admin.site),
+    )
+    permission = forms.ModelChoiceField(
+        queryset=Permission.objects.select_related('content_type'),
+        required=False,
+        widget=AutocompleteSelect(get_user_model().user_permissions.through._meta.get_field('permission'), admin.site),
+    )
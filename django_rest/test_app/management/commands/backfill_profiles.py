@@ -0,0 +1,53 @@
+"""
+Command to create missing UserProfile models.
+"""
+
+# Third-Party Imports.
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Internal Imports.
+from test_app.models import ModelVersion, UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Creates UserProfile models for all users that do not have one yet, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of profiles to create per batch.')
+
+    def handle(self, *args, **kwargs):
+        """
+        The logic of the command.
+        """
+        batch_size = kwargs['batch_size']
+        users_without_profiles = get_user_model().objects.filter(profile__isnull=True).order_by('pk')
+
+        # Walk users in primary key order, so each batch query starts where the last one ended.
+        created_count = 0
+        last_pk = 0
+        while True:
+            user_ids = list(
+                users_without_profiles.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size],
+            )
+            if not user_ids:
+                break
+
+            with transaction.atomic():
+                # Profiles may be created concurrently, by user saves or first profile access on a live site.
+                # Skip those, rather than failing the whole batch, and only count profiles that were still missing.
+                missing_count = len(user_ids) - UserProfile.objects.filter(user_id__in=user_ids).count()
+                UserProfile.objects.bulk_create(
+                    [UserProfile(user_id=user_id) for user_id in user_ids],
+                    ignore_conflicts=True,
+                )
+
+                # Bulk inserts skip model signals, so update change version directly.
+                ModelVersion.objects.bump(UserProfile)
+
+            created_count += missing_count
+            last_pk = user_ids[-1]
+            self.stdout.write('Created {0} profiles...'.format(created_count))
+
+        self.stdout.write(self.style.SUCCESS('Done. Created {0} profiles.'.format(created_count)))
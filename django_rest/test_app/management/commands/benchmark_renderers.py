@@ -0,0 +1,86 @@
+"""
+Command to compare REST API renderer output size and speed.
+"""
+
+# System Imports.
+import io
+import timeit
+
+# Third-Party Imports.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+# Internal Imports.
+from test_app.renderers import MessagePackParser, MessagePackRenderer, msgpack
+from test_app.serializers import UserSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compares bytes and encode/decode time of JSON and MessagePack for a page of REST users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users per page.')
+        parser.add_argument('--repeat', type=int, default=20, help='Number of encode/decode runs to average.')
+
+    def handle(self, *args, **kwargs):
+        """
+        The logic of the command.
+        """
+        if msgpack is None:
+            raise CommandError('The msgpack package is not installed.')
+
+        page_data = self.get_page_data(kwargs['users'])
+        formats = (
+            ('JSON', JSONRenderer(), JSONParser()),
+            ('MessagePack', MessagePackRenderer(), MessagePackParser()),
+        )
+
+        self.stdout.write('Page of {0} users, averaged over {1} runs:'.format(kwargs['users'], kwargs['repeat']))
+        self.stdout.write('{0:<12} {1:>12} {2:>12} {3:>12}'.format('Format', 'Bytes', 'Encode ms', 'Decode ms'))
+        for name, renderer, parser in formats:
+            content = renderer.render(page_data)
+            encode_time = timeit.timeit(lambda: renderer.render(page_data), number=kwargs['repeat'])
+            decode_time = timeit.timeit(lambda: parser.parse(io.BytesIO(content)), number=kwargs['repeat'])
+
+            self.stdout.write('{0:<12} {1:>12} {2:>12.2f} {3:>12.2f}'.format(
+                name,
+                len(content),
+                encode_time / kwargs['repeat'] * 1000,
+                decode_time / kwargs['repeat'] * 1000,
+            ))
+
+    def get_page_data(self, user_count):
+        """Returns paginated REST user list data, for temporarily created users.
+
+        Users are created in a transaction that is rolled back, so the database is left unchanged.
+        """
+        with transaction.atomic():
+            group = Group.objects.create(name='benchmark_renderers_group')
+            users = get_user_model().objects.bulk_create_with_profiles([
+                get_user_model()(
+                    username='benchmark_user_{0}'.format(index),
+                    email='benchmark_user_{0}@example.com'.format(index),
+                    first_name='First{0}'.format(index),
+                    last_name='Last{0}'.format(index),
+                    password='unusable',
+                )
+                for index in range(user_count)
+            ])
+            group.user_set.add(*users)
+
+            prefetch_related_objects(users, 'groups', 'user_permissions')
+            page_data = {
+                'count': user_count,
+                'next': None,
+                'previous': None,
+                'results': UserSerializer(users, many=True).data,
+            }
+
+            transaction.set_rollback(True)
+
+        return page_data
@@ -0,0 +1,92 @@
+"""
+Command to delete old rows from BaseAbstractModel tables.
+"""
+
+# System Imports.
+import re
+import time
+from datetime import timedelta
+
+# Third-Party Imports.
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Internal Imports.
+from test_app.bulk import delete_in_batches
+from test_app.models import BaseAbstractModel
+
+
+# Seconds per unit, for "--older-than" durations.
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes rows older than the given age, by date_created, in small batches. '
+        'Each batch is committed separately, so an interrupted run can be resumed by running it again.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            required=True,
+            help='Model to purge, as "app_label.ModelName" or "ModelName" for this app. Ex: test_app.ApiRequestJson',
+        )
+        parser.add_argument(
+            '--older-than',
+            required=True,
+            help='Age of rows to delete, as <number><unit>, where unit is one of s, m, h, d, w. Ex: 30d',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of rows to delete per batch.')
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.1,
+            help='Seconds to pause between batches, so other connections can write.',
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        The logic of the command.
+        """
+        model = self.get_model(kwargs['model'])
+        cutoff = timezone.now() - self.parse_duration(kwargs['older_than'])
+        batch_size = kwargs['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        self.stdout.write('Deleting {0} rows created before {1}.'.format(model._meta.label, cutoff.isoformat()))
+
+        # Oldest rows are deleted first, using the date_created index. As each batch is committed on its own, an
+        # interrupted run leaves only fully deleted batches behind, and a rerun picks up from the oldest remaining row.
+        old_rows = model._default_manager.filter(date_created__lt=cutoff).order_by('date_created', 'pk')
+        start_time = time.monotonic()
+        deleted_count = delete_in_batches(old_rows, batch_size, kwargs['sleep'], stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS('Done. Deleted {0} rows in {1:.1f} seconds.'.format(
+            deleted_count,
+            time.monotonic() - start_time,
+        )))
+
+    def get_model(self, model_name):
+        """Returns model class for provided name. Only models with a date_created field are allowed."""
+        if '.' not in model_name:
+            model_name = 'test_app.{0}'.format(model_name)
+
+        try:
+            model = apps.get_model(model_name)
+        except (LookupError, ValueError):
+            raise CommandError('Unknown model "{0}".'.format(model_name))
+
+        if not issubclass(model, BaseAbstractModel):
+            raise CommandError('Model "{0}" does not have a date_created field.'.format(model._meta.label))
+
+        return model
+
+    def parse_duration(self, value):
+        """Returns timedelta for a "<number><unit>" duration string."""
+        match = re.fullmatch(r'(\d+)([smhdw])', value.strip())
+        if match is None:
+            raise CommandError('Invalid --older-than value "{0}". Expected <number><unit>, such as 30d.'.format(value))
+        return timedelta(seconds=int(match.group(1)) * DURATION_UNITS[match.group(2)])
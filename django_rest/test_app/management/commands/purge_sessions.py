@@ -0,0 +1,78 @@
+"""
+Command to delete expired sessions in batches.
+"""
+
+# System Imports.
+import time
+
+# Third-Party Imports.
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Internal Imports.
+from test_app.bulk import delete_in_batches
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes expired sessions in small batches, in expire_date order, pausing between batches. '
+        'Unlike "clearsessions", the database write lock is only held for one batch at a time.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of sessions to delete per batch.')
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.1,
+            help='Seconds to pause between batches, so other connections can write.',
+        )
+        parser.add_argument(
+            '--max-rate',
+            type=float,
+            default=None,
+            help='Max number of sessions to delete per second. Unlimited if not provided.',
+        )
+        parser.add_argument(
+            '--continuous',
+            action='store_true',
+            help='Keep running, purging newly expired sessions every "--interval" seconds. Stop with Ctrl+C.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Seconds to wait between purge runs, with "--continuous".',
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        The logic of the command.
+        """
+        if kwargs['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        try:
+            while True:
+                self.purge_expired(kwargs['batch_size'], kwargs['sleep'], kwargs['max_rate'])
+                if not kwargs['continuous']:
+                    break
+                time.sleep(kwargs['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
+
+    def purge_expired(self, batch_size, sleep, max_rate):
+        """Deletes all sessions that have expired as of now."""
+        now = timezone.now()
+        self.stdout.write('Deleting sessions expired before {0}.'.format(now.isoformat()))
+
+        # Session.expire_date is indexed, so each batch reads the oldest expired sessions from the index.
+        expired_sessions = Session.objects.filter(expire_date__lt=now).order_by('expire_date')
+        start_time = time.monotonic()
+        deleted_count = delete_in_batches(expired_sessions, batch_size, sleep, max_rate=max_rate, stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS('Done. Deleted {0} sessions in {1:.1f} seconds.'.format(
+            deleted_count,
+            time.monotonic() - start_time,
+        )))
@@ -0,0 +1,24 @@
+"""
+Command to rebuild the user search index.
+"""
+
+# Third-Party Imports.
+from django.core.management.base import BaseCommand
+
+# Internal Imports.
+from test_app.search import create_search_table, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the user search index from current user and profile data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of users to index per batch.')
+
+    def handle(self, *args, **kwargs):
+        """
+        The logic of the command.
+        """
+        create_search_table()
+        indexed_count = rebuild_index(batch_size=kwargs['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Done. Indexed {0} users.'.format(indexed_count)))
@@ -0,0 +1,45 @@
+"""
+Command to refresh stored table row counts.
+"""
+
+# Third-Party Imports.
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Internal Imports.
+from test_app.models import TableRowCount
+
+
+class Command(BaseCommand):
+    help = (
+        'Counts rows of the given models, and stores the counts for admin pagination estimates. '
+        'Meant to be scheduled, such as hourly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models',
+            nargs='*',
+            help='Models to count, as "app_label.ModelName". Defaults to models that already have a stored count.',
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        The logic of the command.
+        """
+        labels = kwargs['models'] or list(TableRowCount.objects.values_list('label', flat=True))
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                raise CommandError('Unknown model "{0}".'.format(label))
+
+            row_count = model._default_manager.count()
+            TableRowCount.objects.update_or_create(
+                label=model._meta.label_lower,
+                defaults={'row_count': row_count, 'date_modified': timezone.now()},
+            )
+            self.stdout.write('{0}: {1} rows'.format(model._meta.label, row_count))
+
+        self.stdout.write(self.style.SUCCESS('Done. Refreshed {0} row counts.'.format(len(labels))))
@@ -2,97 +2,457 @@
 Command to generate default project models.
 """
 
+# System Imports.
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from datetime import datetime, timedelta, timezone as dt_timezone
+
 # Third-Party Imports.
+import django
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
 from django.db.utils import IntegrityError
+from django.utils import timezone
+
+# Internal Imports.
+from test_app.bulk import bulk_insert_rows, deferred_indexes, restore_deferred_indexes
+from test_app.models import FavoriteFood, ModelVersion, UserProfile
+from test_app.search import insert_search_rows
+
+
+DEFAULT_PASSWORD = 'temppass2'
+
+# Seeded user accounts are created as "seed_user_<number>", starting at 1.
+SEED_USERNAME_FORMAT = 'seed_user_{0}'
+SEED_GROUP_FORMAT = 'seed_group_{0}'
+
+# Fixed start of seeded join dates, so output does not depend on when the command runs.
+SEED_START_DATE = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+SEED_DATE_RANGE_SECONDS = 3 * 365 * 24 * 60 * 60
+
+FIRST_NAMES = (
+    'James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'William', 'Elizabeth',
+    'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+    'Daniel', 'Nancy', 'Matthew', 'Lisa', 'Anthony', 'Betty', 'Mark', 'Margaret', 'Steven', 'Sandra',
+)
+LAST_NAMES = (
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson',
+)
+STREET_NAMES = (
+    'Main', 'Oak', 'Pine', 'Maple', 'Cedar', 'Elm', 'Washington', 'Lake', 'Hill', 'Park',
+    'Sunset', 'Lincoln', 'Jackson', 'Church', 'River', 'Highland', 'Meadow', 'Forest', 'Ridge', 'Spring',
+)
+STREET_SUFFIXES = ('St', 'Ave', 'Rd', 'Blvd', 'Ln', 'Dr', 'Ct', 'Way')
+CITY_NAMES = (
+    'Springfield', 'Franklin', 'Greenville', 'Bristol', 'Clinton', 'Fairview', 'Salem', 'Madison',
+    'Georgetown', 'Arlington', 'Ashland', 'Dover', 'Oxford', 'Jackson', 'Burlington', 'Manchester',
+    'Milton', 'Newport', 'Auburn', 'Dayton', 'Lexington', 'Milford', 'Riverside', 'Winchester',
+)
+FOOD_ADJECTIVES = ('Spicy', 'Sweet', 'Smoked', 'Grilled', 'Roasted', 'Fried', 'Baked', 'Fresh', 'Crispy', 'Tangy')
+FOOD_DISHES = (
+    'Tacos', 'Pizza', 'Ramen', 'Curry', 'Burger', 'Salad', 'Dumplings', 'Pasta', 'Sushi', 'Chili',
+    'Pancakes', 'Noodles', 'Barbecue', 'Sandwich', 'Soup', 'Pie', 'Burrito', 'Risotto', 'Falafel', 'Paella',
+)
 
 
 class Command(BaseCommand):
-    help = 'Creates default project models.'
+    help = 'Creates default project models. Optionally also generates deterministic fake data in bulk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=0, help='Number of fake users to generate.')
+        parser.add_argument('--groups', type=int, default=0, help='Number of fake groups to generate.')
+        parser.add_argument('--foods', type=int, default=0, help='Number of fake favorite foods to generate.')
+        parser.add_argument(
+            '--memberships-per-user',
+            type=int,
+            default=0,
+            help='Number of fake groups to add each fake user to.',
+        )
+        parser.add_argument(
+            '--foods-per-user',
+            type=int,
+            default=2,
+            help='Number of fake favorite foods to link to each fake user.',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed. The same seed generates the same data.')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Number of users to insert per batch.')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Number of processes that generate user batches. Inserts are always done by this process, as SQLite '
+                'has a single writer, so workers only overlap row generation with inserts. As generation is a small '
+                'part of the total time, this gives at most about 1.2x speedup, however many cores are available.'
+            ),
+        )
 
     def handle(self, *args, **kwargs):
         """
         The logic of the command.
         """
+        # Recreate any indexes that an interrupted seed left dropped.
+        restored_count = restore_deferred_indexes(using=router.db_for_write(get_user_model()))
+        if restored_count:
+            self.stdout.write('Recreated {0} indexes left dropped by an interrupted seed.'.format(restored_count))
+
         self.generate_default_users()
         self.generate_permissions()
 
+        if not (kwargs['users'] or kwargs['groups'] or kwargs['foods']):
+            return
+
+        if kwargs['memberships_per_user'] > kwargs['groups']:
+            raise CommandError('--memberships-per-user can not be more than --groups.')
+        if kwargs['users'] and kwargs['foods_per_user'] > kwargs['foods']:
+            kwargs['foods_per_user'] = kwargs['foods']
+
+        group_ids = self.generate_groups(kwargs['groups'], kwargs['seed'])
+        food_ids = self.generate_foods(kwargs['foods'], kwargs['seed'])
+        if kwargs['users']:
+            self.generate_users(
+                kwargs['users'],
+                group_ids,
+                food_ids,
+                kwargs['memberships_per_user'],
+                kwargs['foods_per_user'],
+                kwargs['seed'],
+                kwargs['batch_size'],
+                kwargs['workers'],
+            )
+
     def generate_default_users(self):
         """Generates default users to login with."""
-        default_password = 'temppass2'
+        default_password = DEFAULT_PASSWORD
 
         try:
-            super_user = get_user_model().objects.create(
-                username='test_superuser',
-                first_name='SuperUserFirst',
-                last_name='SuperUserLast',
-                is_superuser=True,
-                is_staff=True,
-                is_active=True,
-            )
-            super_user.set_password(default_password)
-            super_user.save()
+            with transaction.atomic():
+                super_user = get_user_model().objects.create(
+                    username='test_superuser',
+                    first_name='SuperUserFirst',
+                    last_name='SuperUserLast',
+                    is_superuser=True,
+                    is_staff=True,
+                    is_active=True,
+                )
+                super_user.set_password(default_password)
+                super_user.save()
         except IntegrityError:
             pass
 
         try:
-            admin_user = get_user_model().objects.create(
-                username='test_admin',
-                first_name='AdminUserFirst',
-                last_name='AdminUserLast',
-                is_superuser=False,
-                is_staff=True,
-                is_active=True,
-            )
-            admin_user.set_password(default_password)
-            admin_user.save()
+            with transaction.atomic():
+                admin_user = get_user_model().objects.create(
+                    username='test_admin',
+                    first_name='AdminUserFirst',
+                    last_name='AdminUserLast',
+                    is_superuser=False,
+                    is_staff=True,
+                    is_active=True,
+                )
+                admin_user.set_password(default_password)
+                admin_user.save()
         except IntegrityError:
             pass
 
         try:
-            inactive_user = get_user_model().objects.create(
-                username='test_inactive',
-                first_name='InactiveUserFirst',
-                last_name='InactiveUserLast',
-                is_superuser=False,
-                is_staff=False,
-                is_active=False,
-            )
-            inactive_user.set_password(default_password)
-            inactive_user.save()
+            with transaction.atomic():
+                inactive_user = get_user_model().objects.create(
+                    username='test_inactive',
+                    first_name='InactiveUserFirst',
+                    last_name='InactiveUserLast',
+                    is_superuser=False,
+                    is_staff=False,
+                    is_active=False,
+                )
+                inactive_user.set_password(default_password)
+                inactive_user.save()
         except IntegrityError:
             pass
 
         try:
-            standard_user = get_user_model().objects.create(
-                username='test_user',
-                first_name='UserFirst',
-                last_name='UserLast',
-                is_superuser=False,
-                is_staff=False,
-                is_active=True,
-            )
-            standard_user.set_password(default_password)
-            standard_user.save()
+            with transaction.atomic():
+                standard_user = get_user_model().objects.create(
+                    username='test_user',
+                    first_name='UserFirst',
+                    last_name='UserLast',
+                    is_superuser=False,
+                    is_staff=False,
+                    is_active=True,
+                )
+                standard_user.set_password(default_password)
+                standard_user.save()
         except IntegrityError:
             pass
 
     def generate_permissions(self):
         """Generates default general permission/groups."""
         try:
-            content_type = ContentType.objects.get_for_model(get_user_model())
-            test_permission = Permission.objects.create(
-                content_type=content_type,
-                codename='test_permission',
-                name='Test Permission',
-            )
+            with transaction.atomic():
+                content_type = ContentType.objects.get_for_model(get_user_model())
+                test_permission = Permission.objects.create(
+                    content_type=content_type,
+                    codename='test_permission',
+                    name='Test Permission',
+                )
         except IntegrityError:
             pass
 
         try:
-            test_group = Group.objects.create(name='test_group')
+            with transaction.atomic():
+                test_group = Group.objects.create(name='test_group')
         except IntegrityError:
             pass
+
+    def generate_groups(self, group_count, seed):
+        """Generates fake groups, each granted a few random permissions. Existing fake groups are reused.
+
+        :return: List of fake group ids, in group number order.
+        """
+        names = [SEED_GROUP_FORMAT.format(number) for number in range(1, group_count + 1)]
+        existing = set(Group.objects.filter(name__in=names).values_list('name', flat=True))
+
+        rng = random.Random('{0}:groups'.format(seed))
+        permission_ids = list(Permission.objects.order_by('pk').values_list('pk', flat=True))
+        with transaction.atomic():
+            Group.objects.bulk_create([Group(name=name) for name in names if name not in existing])
+            groups = dict(Group.objects.filter(name__in=names).values_list('name', 'pk'))
+
+            bulk_insert_rows(
+                Group.permissions.through,
+                ('group', 'permission'),
+                [
+                    (groups[name], permission_id)
+                    for name in names
+                    if name not in existing
+                    for permission_id in rng.sample(permission_ids, min(len(permission_ids), rng.randint(1, 5)))
+                ],
+            )
+            ModelVersion.objects.bump(Group, Permission)
+
+        self.stdout.write('Created {0} groups.'.format(len(names) - len(existing)))
+        return [groups[name] for name in names]
+
+    def generate_foods(self, food_count, seed):
+        """Generates fake favorite foods. Existing fake foods are reused.
+
+        :return: List of fake food ids, in food number order.
+        """
+        rng = random.Random('{0}:foods'.format(seed))
+        names = [
+            '{0} {1} #{2}'.format(rng.choice(FOOD_ADJECTIVES), rng.choice(FOOD_DISHES), number)
+            for number in range(1, food_count + 1)
+        ]
+        existing = dict(FavoriteFood.objects.filter(name__in=names).values_list('name', 'pk'))
+
+        with transaction.atomic():
+            FavoriteFood.objects.bulk_create([FavoriteFood(name=name) for name in names if name not in existing])
+            foods = dict(FavoriteFood.objects.filter(name__in=names).values_list('name', 'pk'))
+            ModelVersion.objects.bump(FavoriteFood)
+
+        self.stdout.write('Created {0} favorite foods.'.format(len(names) - len(existing)))
+        return [foods[name] for name in names]
+
+    def generate_users(
+        self, user_count, group_ids, food_ids, memberships_per_user, foods_per_user, seed, batch_size, workers,
+    ):
+        """Generates fake users, with profiles, group memberships and favorite foods, in batched inserts.
+
+        Generated data only depends on the seed and batch size, not on the number of workers.
+        """
+        user_model = get_user_model()
+        if user_model.objects.filter(username=SEED_USERNAME_FORMAT.format(1)).exists():
+            raise CommandError('Fake users already exist. Flush the database before seeding users again.')
+
+        connection = connections[router.db_for_write(user_model)]
+        options = {
+            # Hashing is deliberately slow, so every fake user shares one hash of the default password.
+            'password': make_password(DEFAULT_PASSWORD),
+            'date_created': UserProfile._meta.get_field('date_created').get_db_prep_value(timezone.now(), connection),
+            'states': sorted(code for code, name in UserProfile._meta.get_field('state').choices),
+            'group_ids': group_ids,
+            'food_ids': food_ids,
+            'memberships_per_user': memberships_per_user,
+            'foods_per_user': foods_per_user,
+        }
+        first_pk = (user_model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+
+        start_time = time.monotonic()
+
+        # Generated rows are distinct by construction, so unique indexes are deferred too.
+        # Usernames stay unique throughout, as that constraint is part of the user table itself.
+        with deferred_indexes(
+            user_model,
+            UserProfile,
+            user_model.groups.through,
+            FavoriteFood.user.through,
+            using=connection.alias,
+            unique=True,
+        ):
+            # Arguments of generate_user_rows() for each batch.
+            batches = [
+                (seed, batch_index, number, first_pk + number - 1, min(batch_size, user_count + 1 - number), options)
+                for batch_index, number in enumerate(range(1, user_count + 1, batch_size))
+            ]
+            created_count = 0
+            for rows in self.iter_generated_rows(batches, workers):
+                self.insert_user_rows(rows, connection)
+
+                created_count += len(rows['users'])
+                self.stdout.write('Created {0}/{1} users ({2:.0f} users/s)...'.format(
+                    created_count,
+                    user_count,
+                    created_count / max(time.monotonic() - start_time, 0.001),
+                ))
+
+            self.stdout.write('Rebuilding indexes...')
+
+        ModelVersion.objects.bump(user_model, UserProfile, Group, FavoriteFood)
+        elapsed = time.monotonic() - start_time
+        self.stdout.write(self.style.SUCCESS('Done. Created {0} users in {1:.2f} seconds ({2:.0f} users/s).'.format(
+            user_count,
+            elapsed,
+            user_count / max(elapsed, 0.001),
+        )))
+
+    def iter_generated_rows(self, batches, workers):
+        """Yields `generate_user_rows()` results for each batch of arguments, in batch order.
+
+        With multiple workers, batches are generated in a process pool while earlier batches are inserted.
+        Only a few batches are queued ahead of the insert, so memory use does not grow with the number of users.
+        Inserts and index updates stay in this process, so they bound the overall speed.
+        """
+        if workers <= 1:
+            for batch in batches:
+                yield generate_user_rows(*batch)
+            return
+
+        # Workers only generate rows. Set up Django in case they do not inherit this process's state.
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+            batches = iter(batches)
+            pending = deque(
+                executor.submit(generate_user_rows, *batch) for batch in islice(batches, workers * 2)
+            )
+            while pending:
+                rows = pending.popleft().result()
+                batch = next(batches, None)
+                if batch is not None:
+                    pending.append(executor.submit(generate_user_rows, *batch))
+                yield rows
+
+    def insert_user_rows(self, rows, connection):
+        """Inserts one batch of rows from `generate_user_rows()`, in a single transaction."""
+        user_model = get_user_model()
+        with transaction.atomic(using=connection.alias):
+            bulk_insert_rows(
+                user_model,
+                (
+                    'id', 'password', 'last_login', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+                    'is_staff', 'is_active', 'date_joined',
+                ),
+                rows['users'],
+                using=connection.alias,
+            )
+            bulk_insert_rows(
+                UserProfile,
+                ('user', 'address_1', 'address_2', 'city', 'state', 'zipcode', 'date_created', 'date_modified'),
+                rows['profiles'],
+                using=connection.alias,
+            )
+            bulk_insert_rows(user_model.groups.through, ('user', 'group'), rows['groups'], using=connection.alias)
+            bulk_insert_rows(FavoriteFood.user.through, ('user', 'favoritefood'), rows['foods'], using=connection.alias)
+            insert_search_rows(rows['search'], connection)
+
+
+def generate_user_rows(seed, batch_index, first_number, first_pk, count, options):
+    """Generates database-ready rows for one batch of fake users.
+
+    Each batch uses its own random generator, seeded by the batch index. So a batch always generates the same
+    rows for the same seed, regardless of which batches were generated before it.
+
+    Random values are drawn per column, for the whole batch at once, as per-value calls dominate generation time.
+
+    :return: Dict of {'users', 'profiles', 'groups', 'foods', 'search'} row lists.
+    """
+    rng = random.Random('{0}:users:{1}'.format(seed, batch_index))
+    numbers = range(first_number, first_number + count)
+    pks = range(first_pk, first_pk + count)
+
+    # Dates are written in the naive UTC format that the database adapter would otherwise produce per value.
+    start_date = SEED_START_DATE.replace(tzinfo=None)
+    joined_seconds = rng.choices(range(SEED_DATE_RANGE_SECONDS), k=count)
+    login_seconds = rng.choices(range(SEED_DATE_RANGE_SECONDS), k=count)
+    dates_joined = [str(start_date + timedelta(seconds=seconds)) for seconds in joined_seconds]
+    last_logins = [
+        str(start_date + timedelta(seconds=joined + login)) if login % 10 < 7 else None
+        for joined, login in zip(joined_seconds, login_seconds)
+    ]
+
+    usernames = [SEED_USERNAME_FORMAT.format(number) for number in numbers]
+    first_names = rng.choices(FIRST_NAMES, k=count)
+    last_names = rng.choices(LAST_NAMES, k=count)
+    emails = [
+        '{0}.{1}.{2}@example.com'.format(first_name, last_name, number).lower()
+        for first_name, last_name, number in zip(first_names, last_names, numbers)
+    ]
+    flags = rng.choices(range(100), k=count)
+    cities = rng.choices(CITY_NAMES, k=count)
+    states = rng.choices(options['states'], k=count)
+    zipcodes = ['{0:05d}'.format(zipcode) for zipcode in rng.choices(range(1001, 99951), k=count)]
+    addresses = [
+        '{0} {1} {2}'.format(house_number, street, suffix)
+        for house_number, street, suffix in zip(
+            rng.choices(range(1, 10000), k=count),
+            rng.choices(STREET_NAMES, k=count),
+            rng.choices(STREET_SUFFIXES, k=count),
+        )
+    ]
+    apartments = ['Apt {0}'.format(number) if number < 100 else '' for number in rng.choices(range(500), k=count)]
+
+    password = options['password']
+    date_created = options['date_created']
+    rows = {
+        'users': [
+            (pk, password, last_login, False, username, first_name, last_name, email, flag < 2, flag < 95, joined)
+            for pk, last_login, username, first_name, last_name, email, flag, joined in zip(
+                pks, last_logins, usernames, first_names, last_names, emails, flags, dates_joined,
+            )
+        ],
+        'profiles': [
+            (pk, address, apartment, city, state, zipcode, date_created, date_created)
+            for pk, address, apartment, city, state, zipcode in zip(
+                pks, addresses, apartments, cities, states, zipcodes,
+            )
+        ],
+        'search': list(zip(pks, usernames, first_names, last_names, emails, cities, states, zipcodes)),
+        'groups': spread_relation_rows(rng, pks, options['group_ids'], options['memberships_per_user']),
+        'foods': spread_relation_rows(rng, pks, options['food_ids'], options['foods_per_user']),
+    }
+    return rows
+
+
+def spread_relation_rows(rng, pks, related_ids, per_row):
+    """Returns (pk, related id) rows, linking each pk to `per_row` distinct related ids.
+
+    Rather than sampling per pk, each pk gets a random starting id, plus ids at an even stride after it.
+    """
+    if not per_row:
+        return []
+
+    stride = len(related_ids) // per_row
+    offsets = [index * stride for index in range(per_row)]
+    related_count = len(related_ids)
+    return [
+        (pk, related_ids[(start + offset) % related_count])
+        for pk, start in zip(pks, rng.choices(range(related_count), k=len(pks)))
+        for offset in offsets
+    ]
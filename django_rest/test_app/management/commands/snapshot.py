@@ -0,0 +1,171 @@
+"""
+Command to save and restore copies of the database.
+"""
+
+# System Imports.
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+# Third-Party Imports.
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.serializer import serializer_factory
+from django.db.migrations.state import ProjectState
+from django.db.migrations.writer import MigrationWriter
+
+
+# Number of database pages to copy per backup step, between progress updates.
+BACKUP_STEP_PAGES = 25600
+
+
+def get_schema_key():
+    """Returns a hash of the current models and migrations.
+
+    Snapshots are only restored when saved with the same key, as the copied tables would otherwise not match
+    the models. Migrations are rendered the same way as makemigrations writes them, minus the timestamp header,
+    so regenerated migrations of unchanged models keep the same key.
+    """
+    hasher = hashlib.sha256()
+
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    for key in sorted(loader.disk_migrations):
+        migration_string = MigrationWriter(loader.disk_migrations[key]).as_string()
+        hasher.update(re.sub(r'^# Generated by .*$', '', migration_string, flags=re.MULTILINE).encode('utf-8'))
+
+    project_state = ProjectState.from_apps(apps)
+    for key in sorted(project_state.models):
+        model_state = project_state.models[key]
+        hasher.update(repr(key).encode('utf-8'))
+        for name, field in sorted(dict(model_state.fields).items()):
+            hasher.update('{0}={1}'.format(name, serializer_factory(field).serialize()[0]).encode('utf-8'))
+        hasher.update(serializer_factory(model_state.options).serialize()[0].encode('utf-8'))
+
+    return hasher.hexdigest()[:16]
+
+
+class Command(BaseCommand):
+    help = (
+        'Saves or restores a named copy of the database, using the SQLite online backup API. '
+        'Snapshots are keyed by the current models and migrations, so stale snapshots are never restored.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=('save', 'restore', 'list'), help='Action to take.')
+        parser.add_argument('name', nargs='?', help='Snapshot name. Required for save and restore.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to save or restore.')
+
+    def handle(self, *args, **kwargs):
+        """
+        The logic of the command.
+        """
+        connection = connections[kwargs['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Snapshots are only supported on SQLite.')
+
+        snapshot_dir = Path(settings.DB_SNAPSHOT_DIR)
+        schema_key = get_schema_key()
+        if kwargs['action'] == 'list':
+            self.list_snapshots(snapshot_dir, schema_key)
+            return
+
+        name = kwargs['name']
+        if not name or not re.match(r'^[\w-]+$', name):
+            raise CommandError('Provide a snapshot name, of only letters, numbers, underscores and dashes.')
+
+        if kwargs['action'] == 'save':
+            self.save_snapshot(connection, snapshot_dir, name, schema_key)
+        else:
+            self.restore_snapshot(connection, snapshot_dir, name, schema_key)
+
+    def save_snapshot(self, connection, snapshot_dir, name, schema_key):
+        """Copies database to a snapshot file, replacing any previous snapshot of the same name."""
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = snapshot_dir.joinpath('{0}-{1}.sqlite3'.format(name, schema_key))
+        temp_path = path.with_suffix('.tmp')
+
+        start_time = time.monotonic()
+        connection.ensure_connection()
+        destination = sqlite3.connect(str(temp_path))
+        saved = False
+        try:
+            connection.connection.backup(destination, pages=BACKUP_STEP_PAGES, progress=self.show_progress)
+            saved = True
+        finally:
+            destination.close()
+            if not saved:
+                temp_path.unlink(missing_ok=True)
+
+        # Only replace snapshots once fully written, so an interrupted save never leaves a partial snapshot.
+        os.replace(str(temp_path), str(path))
+        for stale_path in self.get_snapshot_paths(snapshot_dir, name):
+            if stale_path != path:
+                stale_path.unlink()
+
+        self.stdout.write(self.style.SUCCESS('Done. Saved snapshot "{0}" ({1:.1f} MB) in {2:.2f} seconds.'.format(
+            name,
+            path.stat().st_size / 1024 / 1024,
+            time.monotonic() - start_time,
+        )))
+
+    def restore_snapshot(self, connection, snapshot_dir, name, schema_key):
+        """Replaces database contents with a snapshot, if one was saved for the current models and migrations."""
+        path = snapshot_dir.joinpath('{0}-{1}.sqlite3'.format(name, schema_key))
+        if not path.exists():
+            if self.get_snapshot_paths(snapshot_dir, name):
+                raise CommandError(
+                    'Snapshot "{0}" is stale, as models or migrations have changed since it was saved. '
+                    'Seed the database and save it again.'.format(name),
+                )
+            raise CommandError('Snapshot "{0}" does not exist.'.format(name))
+
+        if connection.in_atomic_block:
+            raise CommandError('Snapshots can not be restored inside a transaction.')
+
+        start_time = time.monotonic()
+        connection.ensure_connection()
+        source = sqlite3.connect(str(path))
+        try:
+            source.backup(connection.connection, pages=BACKUP_STEP_PAGES, progress=self.show_progress)
+        finally:
+            source.close()
+
+        # Cached content type ids may not match the restored rows.
+        ContentType.objects.clear_cache()
+
+        self.stdout.write(self.style.SUCCESS('Done. Restored snapshot "{0}" in {1:.2f} seconds.'.format(
+            name,
+            time.monotonic() - start_time,
+        )))
+
+    def list_snapshots(self, snapshot_dir, schema_key):
+        """Shows all saved snapshots, and whether each is current or stale."""
+        paths = sorted(snapshot_dir.glob('*-*.sqlite3')) if snapshot_dir.exists() else []
+        if not paths:
+            self.stdout.write('No snapshots saved.')
+
+        for path in paths:
+            name, key = path.stem.rsplit('-', 1)
+            self.stdout.write('{0:<30} {1:>10.1f} MB  {2}'.format(
+                name,
+                path.stat().st_size / 1024 / 1024,
+                'current' if key == schema_key else 'stale',
+            ))
+
+    def get_snapshot_paths(self, snapshot_dir, name):
+        """Returns paths of all saved snapshots with the given name, for any schema key."""
+        if not snapshot_dir.exists():
+            return []
+        return [path for path in snapshot_dir.glob('{0}-*.sqlite3'.format(name)) if path.stem.rsplit('-', 1)[0] == name]
+
+    def show_progress(self, status, remaining, total):
+        """Backup progress callback. Only shown for databases that take multiple steps to copy."""
+        if total > BACKUP_STEP_PAGES:
+            self.stdout.write('Copied {0}/{1} pages...'.format(total - remaining, total))
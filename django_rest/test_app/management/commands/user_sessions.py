@@ -0,0 +1,105 @@
+"""
+Command to list or revoke the sessions of a user.
+"""
+
+# Third-Party Imports.
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Internal Imports.
+from test_app.models import UserSession
+
+
+class Command(BaseCommand):
+    help = 'Lists or revokes the login sessions of a user, using the tracked user sessions table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', nargs='?', help='User to list sessions of.')
+        parser.add_argument('--revoke', action='store_true', help='Log user out of all sessions.')
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Track existing sessions that were created before session tracking, by decoding each once.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of sessions per backfill batch.')
+
+    def handle(self, *args, **kwargs):
+        """
+        The logic of the command.
+        """
+        if kwargs['backfill']:
+            self.backfill(kwargs['batch_size'])
+            if not kwargs['username']:
+                return
+
+        if not kwargs['username']:
+            raise CommandError('A username is required, unless running with --backfill.')
+
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get_by_natural_key(kwargs['username'])
+        except user_model.DoesNotExist:
+            raise CommandError('User "{0}" does not exist.'.format(kwargs['username']))
+
+        sessions = Session.objects.filter(user_session__user=user)
+        if kwargs['revoke']:
+            deleted_count = sessions.delete()[1].get(Session._meta.label, 0)
+            self.stdout.write(self.style.SUCCESS('Revoked {0} sessions for "{1}".'.format(
+                deleted_count,
+                user.get_username(),
+            )))
+            return
+
+        now = timezone.now()
+        session_count = 0
+        for session_key, expire_date in sessions.order_by('-expire_date').values_list('session_key', 'expire_date'):
+            self.stdout.write('{0}  expires {1}{2}'.format(
+                session_key,
+                expire_date.isoformat(),
+                ' (expired)' if expire_date < now else '',
+            ))
+            session_count += 1
+
+        self.stdout.write('{0} sessions for "{1}".'.format(session_count, user.get_username()))
+
+    def backfill(self, batch_size):
+        """Creates tracking rows for untracked sessions with a logged in user, in session key order."""
+        untracked_sessions = Session.objects.filter(user_session__isnull=True).order_by('session_key')
+        pk_field = get_user_model()._meta.pk
+
+        checked_count = 0
+        tracked_count = 0
+        last_key = ''
+        while True:
+            sessions = list(untracked_sessions.filter(session_key__gt=last_key)[:batch_size])
+            if not sessions:
+                break
+
+            session_users = {}
+            for session in sessions:
+                user_id = session.get_decoded().get('_auth_user_id')
+                if user_id is not None:
+                    try:
+                        session_users[session.session_key] = pk_field.to_python(user_id)
+                    except ValidationError:
+                        pass
+
+            # Skip sessions of since deleted users.
+            existing_ids = set(get_user_model().objects.filter(
+                pk__in=set(session_users.values()),
+            ).values_list('pk', flat=True))
+            user_sessions = UserSession.objects.bulk_create([
+                UserSession(session_id=session_key, user_id=user_id)
+                for session_key, user_id in session_users.items()
+                if user_id in existing_ids
+            ])
+
+            checked_count += len(sessions)
+            tracked_count += len(user_sessions)
+            last_key = sessions[-1].session_key
+            self.stdout.write('Checked {0} sessions...'.format(checked_count))
+
+        self.stdout.write(self.style.SUCCESS('Done. Tracked {0} sessions.'.format(tracked_count)))
@@ -0,0 +1,202 @@
+"""
+Mixins for Django REST test project viewsets.
+"""
+
+# System Imports.
+import hashlib
+
+# Third-Party Imports.
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+# Internal Imports.
+from test_app.models import ModelVersion
+from test_app.renderers import MessagePackParser, MessagePackRenderer, msgpack
+
+
+class ModelVersionMixin:
+    """Provides per-request lookup of tracked model change versions, for cache validation.
+
+    All versions needed for a request are fetched together in a single query, then reused.
+    """
+
+    # Models that the viewset's response data is built from.
+    versioned_models = ()
+
+    def get_versioned_models(self):
+        """Returns all models whose versions are needed for the current request."""
+        return self.versioned_models
+
+    def get_model_versions(self):
+        """Returns dict of {model_class: (version, date_modified)} for the current request."""
+        if not hasattr(self, '_model_versions'):
+            self._model_versions = ModelVersion.objects.lookup(*self.get_versioned_models())
+        return self._model_versions
+
+    def get_data_version(self, model_classes=None):
+        """Returns a string that changes whenever any of the provided models change.
+
+        Includes change datetimes along with version counters, so that values are not reused
+        if the version table is ever reset or rolled back.
+
+        :param model_classes: Models to include. Defaults to `versioned_models`.
+        """
+        model_versions = self.get_model_versions()
+        return ','.join(
+            '{0}@{1}'.format(version, date_modified.timestamp() if date_modified else 0)
+            for version, date_modified in (
+                model_versions[model_class]
+                for model_class in (model_classes or self.versioned_models)
+            )
+        )
+
+
+class ConditionalGetMixin(ModelVersionMixin):
+    """Adds ETag and Last-Modified conditional GET handling to list and detail endpoints.
+
+    Validators are built from the tracked change versions of `versioned_models`, rather than from the
+    rendered response body. So an unchanged request returns a 304 without touching the queryset or serializer.
+    """
+
+    def get_conditional_state(self, request):
+        """Returns (etag, last_modified timestamp) for the current request."""
+        # Response body also varies by url (query params, pagination), renderer, and user.
+        etag_source = '{0}|{1}|{2}|{3}'.format(
+            self.get_data_version(),
+            request.get_full_path(),
+            getattr(request, 'accepted_media_type', ''),
+            request.user.pk,
+        )
+        etag = '"{0}"'.format(hashlib.md5(etag_source.encode('utf-8')).hexdigest())
+
+        model_versions = self.get_model_versions()
+        modified_dates = [
+            model_versions[model_class][1]
+            for model_class in self.versioned_models
+            if model_versions[model_class][1] is not None
+        ]
+        last_modified = int(max(modified_dates).timestamp()) if modified_dates else None
+
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Returns a 304 if client already has current data. Otherwise calls handler and sets validators."""
+        etag, last_modified = self.get_conditional_state(request)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if 200 <= response.status_code < 400:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+
+class CachedListMixin(ModelVersionMixin):
+    """Caches list endpoint response data, keyed by tracked change versions of `versioned_models`.
+
+    As any change to a tracked model produces a new key, stale entries are never served. Old entries
+    are simply left to expire.
+
+    Keys also include the query params (filters, pagination) and the requesting user's permission scope,
+    so users with different permissions never share an entry.
+    """
+
+    # Cache settings.
+    cache_alias = 'default'
+    cache_timeout = 60 * 15
+
+    # Models that user permissions are derived from.
+    # Changing a user's groups or permissions also bumps the Group/Permission version, so the User version is not
+    # needed. Leaving it out means unrelated user saves (such as last_login updates) do not invalidate every list.
+    permission_scope_models = (Group, Permission)
+
+    def get_versioned_models(self):
+        """Returns all models whose versions are needed for the current request."""
+        return tuple(set(super().get_versioned_models()) | set(self.permission_scope_models))
+
+    def get_permission_scope(self, request):
+        """Returns a string identifying the set of permissions that the requesting user has."""
+        user = request.user
+        if not user.is_authenticated:
+            return 'anonymous'
+        if user.is_superuser:
+            return 'superuser'
+
+        # Permissions only change when a scope model changes, so cache per user and versions.
+        cache_key = 'rest-permission-scope:{0}:{1}:{2}'.format(
+            user.pk,
+            int(user.is_active),
+            hashlib.md5(self.get_data_version(self.permission_scope_models).encode('utf-8')).hexdigest(),
+        )
+        cache = caches[self.cache_alias]
+        scope = cache.get(cache_key)
+        if scope is None:
+            scope = hashlib.md5(','.join(sorted(user.get_all_permissions())).encode('utf-8')).hexdigest()
+            cache.set(cache_key, scope, self.cache_timeout)
+
+        return scope
+
+    def get_list_cache_key(self, request):
+        """Returns cache key for the current list request."""
+        query_params = sorted(
+            (key, sorted(values))
+            for key, values in request.query_params.lists()
+        )
+        key_source = '{0}|{1}|{2}'.format(
+            self.get_data_version(),
+            query_params,
+            self.get_permission_scope(request),
+        )
+
+        return 'rest-list:{0}.{1}:{2}'.format(
+            self.__class__.__module__,
+            self.__class__.__name__,
+            hashlib.md5(key_source.encode('utf-8')).hexdigest(),
+        )
+
+    def list(self, request, *args, **kwargs):
+        cache = caches[self.cache_alias]
+        cache_key = self.get_list_cache_key(request)
+
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(cache_key, response.data, self.cache_timeout)
+
+        return response
+
+
+class MessagePackMixin:
+    """Adds MessagePack renderer and parser to a viewset, if the msgpack package is installed.
+
+    These come after the default classes, so clients that do not ask for MessagePack
+    by Accept/Content-Type headers still get JSON.
+    """
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if msgpack is not None:
+            renderers.append(MessagePackRenderer())
+        return renderers
+
+    def get_parsers(self):
+        parsers = super().get_parsers()
+        if msgpack is not None:
+            parsers.append(MessagePackParser())
+        return parsers
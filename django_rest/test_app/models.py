@@ -2,28 +2,112 @@
 Models for Django REST test project app.
 """
 
+# System Imports.
+import threading
+from contextlib import contextmanager
+
 # Third-Party Imports.
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.conf import settings
+from django.contrib.auth.models import AbstractUser, UserManager as AuthUserManager
+from django.contrib.sessions.models import Session
+from django.db import IntegrityError, models, transaction
+from django.db.models.fields.related_descriptors import ReverseOneToOneDescriptor
+from django.utils import timezone
 from localflavor.us.models import USStateField, USZipCodeField
 
+# Internal Imports.
+from test_app.search import index_users
+
 
 MAX_LENGTH = 255
 
+# Tracks pending ModelVersion bumps, while inside a `ModelVersion.objects.batched()` block.
+_model_version_state = threading.local()
+
 
 class BaseAbstractModel(models.Model):
     """Expanded version of the default Django model."""
 
     # Self-setting/Non-user-editable fields.
-    date_created = models.DateTimeField(auto_now_add=True)
+    # Indexed to support batched retention purges (see purge_old command).
+    date_created = models.DateTimeField(auto_now_add=True, db_index=True)
     date_modified = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        abstract = True
+
+
+class UserManager(AuthUserManager):
+    """Manager for custom user model."""
+
+    def bulk_create_with_profiles(self, users, batch_size=None):
+        """Inserts provided users, plus their corresponding UserProfile models, in batched statements.
+
+        Standard bulk_create() skips User.save(), so profiles have to be generated here instead.
+
+        :param users: Iterable of unsaved User instances.
+        :param batch_size: Max number of rows per INSERT statement. Defaults to the largest the database allows.
+        :return: List of saved User instances.
+        """
+        users = list(users)
+
+        with transaction.atomic(using=self.db):
+            users = self.bulk_create(users, batch_size=batch_size)
+            self._set_missing_pks(users, batch_size=batch_size)
+            profiles = UserProfile.objects.using(self.db).bulk_create(
+                [UserProfile(user=user) for user in users],
+                batch_size=batch_size,
+            )
+
+            # If profile primary keys were not returned, drop cached profiles so they are loaded on access.
+            for user, profile in zip(users, profiles):
+                if profile.pk is None:
+                    self.model.profile.related.delete_cached_value(user)
+
+            # Bulk inserts skip model signals, so update change version and search index directly.
+            ModelVersion.objects.db_manager(self.db).bump(self.model, UserProfile)
+            index_users(user.pk for user in users)
+
+        return users
+
+    def _set_missing_pks(self, users, batch_size=None):
+        """Sets primary keys on bulk inserted users, for databases that do not return them from inserts.
+
+        Such as SQLite on Django versions prior to 4.0. Looked up by username, which is unique.
+        """
+        missing = [user for user in users if user.pk is None]
+        if not missing:
+            return
+
+        batch_size = batch_size or 500
+        username_field = self.model.USERNAME_FIELD
+        for index in range(0, len(missing), batch_size):
+            batch = missing[index:index + batch_size]
+            pks = dict(self.filter(**{
+                '{0}__in'.format(username_field): [user.get_username() for user in batch],
+            }).values_list(username_field, 'pk'))
+            for user in batch:
+                user.pk = pks[user.get_username()]
+                user._state.adding = False
+                user._state.db = self.db
+
 
 class User(AbstractUser):
     """Custom user model definition.
     Defined as per the Django docs. Not yet directly used.
     """
 
+    objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Support REST API user list filtering, along with the default date_joined ordering.
+            models.Index(fields=['is_active', 'date_joined'], name='user_active_joined_idx'),
+            models.Index(fields=['is_staff', 'date_joined'], name='user_staff_joined_idx'),
+            models.Index(fields=['date_joined'], name='user_date_joined_idx'),
+            models.Index(fields=['last_login'], name='user_last_login_idx'),
+        ]
+
     def clean(self, *args, **kwargs):
         """
         Custom cleaning implementation. Includes validation, setting fields, etc.
@@ -42,15 +126,40 @@ class User(AbstractUser):
         super().save(*args, **kwargs)
 
         # If new model, generate corresponding UserProfile object.
-        if creating:
+        # In lazy mode, a profile row is instead only written once the profile is first saved.
+        if creating and not getattr(settings, 'LAZY_USER_PROFILES', False):
             UserProfile.objects.create(user=self)
 
 
+class LazyReverseOneToOneDescriptor(ReverseOneToOneDescriptor):
+    """Reverse one-to-one accessor that returns an unsaved default instance, if no related row exists.
+
+    Only applies when the LAZY_USER_PROFILES setting is enabled. The default instance is cached on the
+    accessing model, and is written to the database when first saved.
+    """
+
+    def __get__(self, instance, cls=None):
+        try:
+            return super().__get__(instance, cls)
+        except self.RelatedObjectDoesNotExist:
+            if instance.pk is None or not getattr(settings, 'LAZY_USER_PROFILES', False):
+                raise
+
+            # Setting the forward relation also caches the new instance on the accessing model.
+            return self.related.related_model(**{self.related.field.name: instance})
+
+
+class LazyOneToOneField(models.OneToOneField):
+    """One-to-one field with a reverse accessor that supports lazily created rows."""
+
+    related_accessor_class = LazyReverseOneToOneDescriptor
+
+
 class UserProfile(BaseAbstractModel):
     """Basic model to act as a test fk to user model."""
 
     # Relationship Keys.
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
+    user = LazyOneToOneField(User, on_delete=models.CASCADE, related_name='profile')
 
     # Model Fields.
     address_1 = models.CharField(max_length=MAX_LENGTH, blank=True)
@@ -59,6 +168,13 @@ class UserProfile(BaseAbstractModel):
     state = USStateField()
     zipcode = USZipCodeField()
 
+    class Meta:
+        indexes = [
+            # Support REST API user list filtering.
+            models.Index(fields=['state'], name='userprofile_state_idx'),
+            models.Index(fields=['zipcode'], name='userprofile_zipcode_idx'),
+        ]
+
 
 class FavoriteFood(BaseAbstractModel):
     """Basic model to act as a test m2m relation to user model."""
@@ -75,3 +191,121 @@ class ApiRequestJson(BaseAbstractModel):
 
     # Model fields.
     json_value = models.JSONField(default=dict)
+
+
+class UserSession(BaseAbstractModel):
+    """Tracks which database sessions belong to which user.
+
+    Kept up to date by the login/logout signals in `test_app.signals` and the `test_app.sessions` session engine,
+    and removed along with its session.
+    Allows finding the sessions of one user with an indexed lookup, rather than decoding every session.
+    """
+
+    # Relationship Keys.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='user_sessions')
+    session = models.OneToOneField(Session, on_delete=models.CASCADE, related_name='user_session')
+
+    def __str__(self):
+        return '{0} ({1})'.format(self.user_id, self.session_id)
+
+
+class ModelVersionManager(models.Manager):
+    """Manager for looking up and incrementing per-model change versions."""
+
+    @contextmanager
+    def batched(self):
+        """Merges all bumps made inside the block into a single bump per model, run when the block exits.
+
+        Useful for operations that fire model signals once per row, such as queryset deletes.
+        Should be used inside a transaction, as bumps are skipped if the block raises.
+        """
+        if getattr(_model_version_state, 'pending', None) is not None:
+            # Already batching. Let outermost block handle bumps.
+            yield
+            return
+
+        _model_version_state.pending = set()
+        try:
+            yield
+        finally:
+            pending = _model_version_state.pending
+            _model_version_state.pending = None
+        self.bump(*pending)
+
+    def bump(self, *model_classes):
+        """Increments the change version of each provided model class.
+
+        Runs a single UPDATE in the common case, where all version rows already exist.
+        """
+        pending = getattr(_model_version_state, 'pending', None)
+        if pending is not None:
+            pending.update(model_classes)
+            return
+
+        labels = {model_class._meta.label_lower for model_class in model_classes}
+        if not labels:
+            return
+
+        now = timezone.now()
+        updated = self.filter(label__in=labels).update(version=models.F('version') + 1, date_modified=now)
+        if updated == len(labels):
+            return
+
+        # One or more models have never been versioned. Create their rows.
+        missing_labels = labels - set(self.filter(label__in=labels).values_list('label', flat=True))
+        for label in missing_labels:
+            try:
+                with transaction.atomic():
+                    self.create(label=label, version=1, date_modified=now)
+            except IntegrityError:
+                # Row was created by a concurrent request. Increment it instead.
+                self.filter(label=label).update(version=models.F('version') + 1, date_modified=now)
+
+    def lookup(self, *model_classes):
+        """Returns the current versions for provided model classes, using a single query.
+
+        :return: Dict of {model_class: (version, date_modified)}. Models that have never changed
+            are returned as (0, None).
+        """
+        labels = {model_class._meta.label_lower: model_class for model_class in model_classes}
+        versions = {model_class: (0, None) for model_class in model_classes}
+        for label, version, date_modified in self.filter(label__in=labels).values_list(
+            'label', 'version', 'date_modified',
+        ):
+            versions[labels[label]] = (version, date_modified)
+
+        return versions
+
+
+class ModelVersion(models.Model):
+    """Tracks a cheap change counter per model, for cache validation.
+
+    Kept up to date by the model signals in `test_app.signals`.
+    Any code that writes in bulk (and thus skips signals) should call `ModelVersion.objects.bump()` directly.
+    """
+
+    # Model fields.
+    label = models.CharField(max_length=MAX_LENGTH, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    date_modified = models.DateTimeField(default=timezone.now)
+
+    objects = ModelVersionManager()
+
+    def __str__(self):
+        return '{0} (v{1})'.format(self.label, self.version)
+
+
+class TableRowCount(models.Model):
+    """Stores a periodically refreshed row count per model, for cheap count estimates.
+
+    Kept up to date by the `refresh_row_counts` command, which is meant to be scheduled.
+    Used by `test_app.paginators.EstimatedCountPaginator`.
+    """
+
+    # Model fields.
+    label = models.CharField(max_length=MAX_LENGTH, unique=True)
+    row_count = models.PositiveBigIntegerField(default=0)
+    date_modified = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return '{0} ({1} rows)'.format(self.label, self.row_count)
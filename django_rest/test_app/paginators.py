@@ -0,0 +1,96 @@
+"""
+Paginators for Django REST test project app.
+"""
+
+# Third-Party Imports.
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+# Internal Imports.
+from test_app.models import TableRowCount
+
+
+def get_estimated_row_count(model, using='default'):
+    """Returns an estimated number of rows for a model table, without counting rows.
+
+    Uses the `TableRowCount` table if the model has an entry, otherwise SQLite's ANALYZE statistics.
+    Returns None if neither is available.
+    """
+    row_count = TableRowCount.objects.using(using).filter(
+        label=model._meta.label_lower,
+    ).values_list('row_count', flat=True).first()
+    if row_count is not None:
+        return row_count
+
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return None
+
+    # Each sqlite_stat1 row starts with the number of table rows, as of the last ANALYZE.
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [model._meta.db_table])
+            stats = [stat for stat, in cursor.fetchall()]
+    except DatabaseError:
+        # ANALYZE has never been run.
+        return None
+
+    row_counts = [int(stat.split()[0]) for stat in stats if stat and stat.split()[0].isdigit()]
+    return max(row_counts) if row_counts else None
+
+
+class CappedCountPaginator(Paginator):
+    """Paginator that stops counting rows once a cap is reached.
+
+    Counts at most `count_cap` + 1 rows, with a limited subquery, so counting cost does not grow with table size.
+    If there are more rows than the cap, `count` is the cap and `count_capped` is True.
+    """
+
+    # Max number of rows to count.
+    count_cap = 10000
+
+    @cached_property
+    def limited_count(self):
+        """Number of rows, counting no further than one past the cap."""
+        return self.object_list.order_by()[:self.count_cap + 1].count()
+
+    @cached_property
+    def count(self):
+        return min(self.limited_count, self.count_cap)
+
+    @property
+    def count_capped(self):
+        """True if there are more rows than were counted."""
+        return self.limited_count > self.count
+
+
+class EstimatedCountPaginator(CappedCountPaginator):
+    """Paginator that estimates the number of rows of large tables, instead of counting them.
+
+    Unfiltered tables with an estimate of at least `count_cap` rows use the estimate, and set `count_estimated`.
+    Filtered results fall back to a capped count. Set `exact_count` to always count every row.
+    """
+
+    # If True, rows are always counted exactly.
+    exact_count = False
+
+    # Set if count is an estimate.
+    count_estimated = False
+
+    @cached_property
+    def count(self):
+        if self.exact_count:
+            return self.object_list.count()
+
+        if not self.object_list.query.where:
+            estimate = get_estimated_row_count(self.object_list.model, self.object_list.db)
+            if estimate is not None and estimate >= self.count_cap:
+                self.count_estimated = True
+                return estimate
+
+        return super().count
+
+    @property
+    def count_capped(self):
+        return not self.exact_count and not self.count_estimated and super().count_capped
@@ -0,0 +1,45 @@
+"""
+Renderers and parsers for Django REST test project app.
+"""
+
+# Third-Party Imports.
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+# MessagePack support is optional. Only enabled if the package is installed.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renders response data as MessagePack.
+
+    Types that MessagePack has no representation for (datetimes, decimals, uuids, etc)
+    are converted the same way as in JSON responses.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=DjangoJSONEncoder().default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Parses MessagePack request data."""
+
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as err:
+            raise ParseError('MessagePack parse error - {0}'.format(err))
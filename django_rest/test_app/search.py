@@ -0,0 +1,214 @@
+"""
+User directory full-text search for Django REST test project app.
+
+Backed by an SQLite FTS5 table, with one row per user (rowid = user pk).
+On other databases, searches fall back to unranked case-insensitive matching of the same columns.
+"""
+
+# System Imports.
+import re
+
+# Third-Party Imports.
+from django.contrib.auth import get_user_model
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+SEARCH_TABLE = 'test_app_user_search'
+
+# Indexed user fields, then indexed profile fields, in table column order.
+SEARCH_USER_FIELDS = ('username', 'first_name', 'last_name', 'email')
+SEARCH_PROFILE_FIELDS = ('city', 'state', 'zipcode')
+
+# Relative bm25 weight of each column, in table column order. Higher weights rank higher.
+SEARCH_COLUMN_WEIGHTS = (10.0, 5.0, 5.0, 3.0, 1.0, 1.0, 1.0)
+
+
+def get_search_connection():
+    """Returns database connection that user data is written to."""
+    return connections[router.db_for_write(get_user_model())]
+
+
+def create_search_table(connection=None):
+    """Creates search table, if it does not exist. Only supported on SQLite."""
+    connection = connection or get_search_connection()
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS {0} USING fts5({1}, prefix=\'2 3 4\')'.format(
+                SEARCH_TABLE,
+                ', '.join(SEARCH_USER_FIELDS + SEARCH_PROFILE_FIELDS),
+            ),
+        )
+
+        # Rank "ORDER BY rank" results using weighted columns.
+        cursor.execute(
+            'INSERT INTO {0}({0}, rank) VALUES (\'rank\', %s)'.format(SEARCH_TABLE),
+            ['bm25({0})'.format(', '.join(str(weight) for weight in SEARCH_COLUMN_WEIGHTS))],
+        )
+
+
+def index_users(user_ids):
+    """Adds or replaces search rows for provided user ids, with batched queries.
+
+    Users that no longer exist have their rows removed.
+    """
+    user_ids = list(user_ids)
+    user_model = get_user_model()
+    connection = get_search_connection()
+    if connection.vendor != 'sqlite':
+        return
+
+    # Stay within SQLite's limit of 999 params per statement.
+    batch_size = 100
+    for index in range(0, len(user_ids), batch_size):
+        batch_ids = user_ids[index:index + batch_size]
+        rows = user_model.objects.filter(pk__in=batch_ids).values_list(
+            'pk',
+            *SEARCH_USER_FIELDS,
+            *['profile__{0}'.format(field) for field in SEARCH_PROFILE_FIELDS],
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM {0} WHERE rowid IN ({1})'.format(SEARCH_TABLE, ', '.join(['%s'] * len(batch_ids))),
+                batch_ids,
+            )
+
+        insert_search_rows([[value if value is not None else '' for value in row] for row in rows], connection)
+
+
+def insert_search_rows(rows, connection=None):
+    """Inserts search rows for users that are not indexed yet.
+
+    :param rows: Iterable of (user pk, *SEARCH_USER_FIELDS, *SEARCH_PROFILE_FIELDS) value tuples.
+    :param connection: Database connection. Defaults to the connection that user data is written to.
+    """
+    rows = list(rows)
+    connection = connection or get_search_connection()
+    if not rows or connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO {0}(rowid, {1}) VALUES (%s, {2})'.format(
+                SEARCH_TABLE,
+                ', '.join(SEARCH_USER_FIELDS + SEARCH_PROFILE_FIELDS),
+                ', '.join(['%s'] * (len(SEARCH_USER_FIELDS) + len(SEARCH_PROFILE_FIELDS))),
+            ),
+            rows,
+        )
+
+
+def remove_users(user_ids):
+    """Removes search rows for provided user ids."""
+    user_ids = list(user_ids)
+    connection = get_search_connection()
+    if not user_ids or connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'DELETE FROM {0} WHERE rowid IN ({1})'.format(SEARCH_TABLE, ', '.join(['%s'] * len(user_ids))),
+            user_ids,
+        )
+
+
+def rebuild_index(batch_size=1000):
+    """Replaces all search rows with current user data. Returns number of users indexed."""
+    connection = get_search_connection()
+    if connection.vendor != 'sqlite':
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM {0}'.format(SEARCH_TABLE))
+
+    indexed_count = 0
+    last_pk = 0
+    users = get_user_model().objects.order_by('pk')
+    while True:
+        user_ids = list(users.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+        if not user_ids:
+            return indexed_count
+
+        index_users(user_ids)
+        indexed_count += len(user_ids)
+        last_pk = user_ids[-1]
+
+
+def build_match_query(search_text):
+    """Converts user-provided search text into an FTS5 match expression.
+
+    Each word is matched as a prefix, and all words must match. Returns None if there are no words to search.
+    """
+    words = re.findall(r'\w+', search_text)
+    if not words:
+        return None
+
+    # Quote words, so they are never read as FTS5 operators.
+    return ' '.join('"{0}"*'.format(word) for word in words)
+
+
+def build_fallback_filter(search_text):
+    """Converts user-provided search text into a filter, for databases without the search table.
+
+    Each word must be contained in at least one indexed column. Returns None if there are no words to search.
+    """
+    words = re.findall(r'\w+', search_text)
+    if not words:
+        return None
+
+    lookups = list(SEARCH_USER_FIELDS) + ['profile__{0}'.format(field) for field in SEARCH_PROFILE_FIELDS]
+    word_filters = Q()
+    for word in words:
+        word_filter = Q()
+        for lookup in lookups:
+            word_filter |= Q(**{'{0}__icontains'.format(lookup): word})
+        word_filters &= word_filter
+
+    return word_filters
+
+
+def search_user_ids(search_text, limit=20):
+    """Returns list of matching user ids, best match first.
+
+    Without the search table, matches are not ranked, and are instead ordered by username.
+    """
+    connection = get_search_connection()
+    if connection.vendor != 'sqlite':
+        fallback_filter = build_fallback_filter(search_text)
+        if fallback_filter is None:
+            return []
+        return list(
+            get_user_model().objects.filter(fallback_filter).order_by('username').values_list('pk', flat=True)[:limit],
+        )
+
+    match_query = build_match_query(search_text)
+    if match_query is None:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT rowid FROM {0} WHERE {0} MATCH %s ORDER BY rank LIMIT %s'.format(SEARCH_TABLE),
+            [match_query, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def filter_users(queryset, search_text):
+    """Filters a user queryset to users matching the search text, as a subquery. Does not change ordering."""
+    if get_search_connection().vendor != 'sqlite':
+        fallback_filter = build_fallback_filter(search_text)
+        return queryset.none() if fallback_filter is None else queryset.filter(fallback_filter)
+
+    match_query = build_match_query(search_text)
+    if match_query is None:
+        return queryset.none()
+
+    return queryset.filter(pk__in=RawSQL(
+        'SELECT rowid FROM {0} WHERE {0} MATCH %s'.format(SEARCH_TABLE),
+        [match_query],
+    ))
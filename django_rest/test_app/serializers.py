@@ -3,21 +3,358 @@ Views for Django REST test project serializers.
 """
 
 # System Imports.
+from collections import defaultdict
 
 # Third-Party Imports.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import F
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.validators import UniqueValidator
 
 # Internal Imports.
+from test_app.models import FavoriteFood, ModelVersion
+from test_app.search import index_users
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """Many-to-many field that resolves all provided primary keys with one query, instead of one per key.
+
+    Every invalid or missing key is reported together, in the order provided.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_model_field = queryset.model._meta.pk
+
+        # Convert every item first, so all valid pks are resolved with a single query.
+        pks = []
+        for item in data:
+            if child.pk_field is not None:
+                item = child.pk_field.to_internal_value(item)
+            try:
+                if isinstance(item, bool):
+                    raise DjangoValidationError('Boolean is not a valid pk.')
+                pks.append((pk_model_field.to_python(item), item))
+            except DjangoValidationError:
+                pks.append((None, item))
+
+        valid_pks = {pk for pk, item in pks if pk is not None}
+        related_objects = queryset.in_bulk(valid_pks) if valid_pks else {}
+
+        # Report errors in input order.
+        errors = []
+        for pk, item in pks:
+            if pk is None:
+                errors.append(child.error_messages['incorrect_type'].format(data_type=type(item).__name__))
+            elif pk not in related_objects:
+                errors.append(child.error_messages['does_not_exist'].format(pk_value=pk))
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return [related_objects[pk] for pk, item in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key related field that uses BulkManyRelatedField when used with `many=True`."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+class UserProfileField(serializers.Field):
+    """Read-only representation of a user's UserProfile.
+
+    Views should annotate users with `annotations()`, so values are read from the user rows directly.
+    This avoids both building profile instances and per-row nested serializer overhead.
+    """
+
+    # Profile fields to include, in output order.
+    profile_fields = ('address_1', 'address_2', 'city', 'state', 'zipcode')
+
+    # Prefix of the user attributes that annotated profile values are stored in.
+    annotation_prefix = '_profile_'
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    @classmethod
+    def annotations(cls):
+        """Returns queryset annotations that load each user's profile values."""
+        return {
+            '{0}{1}'.format(cls.annotation_prefix, field): F('profile__{0}'.format(field))
+            for field in cls.profile_fields
+        }
+
+    def get_attribute(self, instance):
+        values = [getattr(instance, self.annotation_prefix + field, self) for field in self.profile_fields]
+        if values[0] is self:
+            # Not annotated. Users may not have a profile row.
+            profile = getattr(instance, self.source, None)
+            if profile is None:
+                return None
+            values = [getattr(profile, field) for field in self.profile_fields]
+        elif values[0] is None:
+            # Profile fields are not nullable, so annotated values are only None if there is no profile row.
+            return None
+
+        return dict(zip(self.profile_fields, values))
+
+    def to_representation(self, value):
+        return value
+
+
+class FavoriteFoodsField(serializers.Field):
+    """Read-only representation of a user's FavoriteFood relations, as a list of {id, name} dicts.
+
+    Views should call `preload()` with all users being serialized. Values are then read from the relation's
+    through table with one query, which avoids the model instance overhead of prefetch_related().
+    """
+
+    # User instance attribute that loaded values are stored in.
+    cache_attr = '_favorite_foods_data'
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    @classmethod
+    def preload(cls, users):
+        """Loads values for all provided users, with one query."""
+        through = FavoriteFood.user.through
+        values = defaultdict(list)
+        for user_id, food_id, food_name in through.objects.filter(
+            user_id__in=[user.pk for user in users],
+        ).order_by('favoritefood__name', 'favoritefood_id').values_list(
+            'user_id', 'favoritefood_id', 'favoritefood__name',
+        ):
+            values[user_id].append({'id': food_id, 'name': food_name})
+
+        for user in users:
+            setattr(user, cls.cache_attr, values[user.pk])
+
+    def to_representation(self, value):
+        if not hasattr(value, self.cache_attr):
+            self.preload([value])
+        return getattr(value, self.cache_attr)
+
+
+class UserListSerializer(serializers.ListSerializer):
+    """Serializer for bulk User reads and writes.
+
+    Reads and writes all items with batched queries, instead of queries per item.
+    Validation errors are reported per item, in the same order as the provided data.
+    """
+
+    # Many-to-many fields that are written to their through tables directly.
+    m2m_fields = ('groups', 'user_permissions')
+
+    # Fields that must be unique between items, which per-item validation cannot catch.
+    unique_fields = ('id', 'username')
+
+    # Max number of values to check per uniqueness query.
+    lookup_batch_size = 500
+
+    def to_internal_value(self, data):
+        """Validates all items, collecting errors per item."""
+        self.seen_values = {field: set() for field in self.unique_fields}
+
+        # Check username uniqueness against the database in batched queries, instead of one query per item.
+        username_field = self.child.fields['username']
+        username_field.validators = [
+            validator for validator in username_field.validators
+            if not isinstance(validator, UniqueValidator)
+        ]
+        usernames = [item.get('username') for item in data if isinstance(item, dict)] if isinstance(data, list) else []
+        self.existing_usernames = self.get_existing_usernames(
+            [username for username in usernames if isinstance(username, str)],
+        )
+
+        return super().to_internal_value(data)
+
+    def get_existing_usernames(self, usernames):
+        """Returns dict of {username: pk} for provided usernames that already exist in the database."""
+        user_model = self.child.Meta.model
+        existing_usernames = {}
+        for index in range(0, len(usernames), self.lookup_batch_size):
+            existing_usernames.update(
+                user_model.objects.filter(
+                    username__in=usernames[index:index + self.lookup_batch_size],
+                ).values_list('username', 'pk'),
+            )
+        return existing_usernames
+
+    def run_child_validation(self, data):
+        """Validates a single item. On update, validates against the instance matching the item's id."""
+        if not isinstance(data, dict):
+            return super().run_child_validation(data)
+
+        errors = {}
+        validated_data = None
+        instance = None
+        try:
+            if self.instance is not None:
+                if not hasattr(self, 'instance_map'):
+                    self.instance_map = {instance.pk: instance for instance in self.instance}
+
+                pk = data.get('id')
+                if not isinstance(pk, int) or pk not in self.instance_map:
+                    raise serializers.ValidationError({'id': ['Must be the id of an existing user.']})
+
+                instance = self.instance_map[pk]
+                self.child.instance = instance
+                self.child.initial_data = data
+                validated_data = super().run_child_validation(data)
+                validated_data['id'] = pk
+            else:
+                validated_data = super().run_child_validation(data)
+        except serializers.ValidationError as err:
+            errors = dict(err.detail)
+
+        # Check for values that already exist in the database.
+        username = data.get('username')
+        if isinstance(username, str) and username in self.existing_usernames:
+            if instance is None or self.existing_usernames[username] != instance.pk:
+                errors.setdefault('username', []).append('A user with that username already exists.')
+
+        # Check for duplicate values between items.
+        for field in self.unique_fields:
+            value = data.get(field)
+            if value is None or not isinstance(value, (int, str)):
+                continue
+            if value in self.seen_values[field]:
+                errors.setdefault(field, []).append('Duplicate {0} in request.'.format(field))
+            self.seen_values[field].add(value)
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return validated_data
+
+    def create(self, validated_data):
+        """Creates all users (and their profiles) with batched inserts, in one transaction."""
+        user_model = self.child.Meta.model
+
+        users = []
+        relations = []
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            relations.append({field: attrs.pop(field) for field in self.m2m_fields if field in attrs})
+            users.append(user_model(**attrs))
+
+        with transaction.atomic():
+            users = user_model.objects.bulk_create_with_profiles(users)
+            self.set_relations(users, relations)
+
+        return users
+
+    def update(self, instances, validated_data):
+        """Applies partial updates to all users with batched updates, in one transaction."""
+        user_model = self.child.Meta.model
+        instance_map = {instance.pk: instance for instance in instances}
+
+        users = []
+        relations = []
+        update_fields = set()
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            user = instance_map[attrs.pop('id')]
+            relations.append({field: attrs.pop(field) for field in self.m2m_fields if field in attrs})
+            for field, value in attrs.items():
+                setattr(user, field, value)
+                update_fields.add(field)
+            users.append(user)
+
+        with transaction.atomic():
+            if update_fields:
+                user_model.objects.bulk_update(users, sorted(update_fields))
+            self.set_relations(users, relations, replace=True)
+
+            # Bulk updates skip model signals, so update change version and search index directly.
+            ModelVersion.objects.bump(user_model)
+            index_users(user.pk for user in users)
+
+        return users
+
+    def set_relations(self, users, relations, replace=False):
+        """Writes many-to-many values for each user, with one bulk insert per relation.
+
+        :param users: List of saved users.
+        :param relations: List of {field_name: related_objects} dicts, in the same order as users.
+        :param replace: Bool indicating if existing relations should be cleared first, for provided fields.
+        """
+        user_model = self.child.Meta.model
+
+        for field_name in self.m2m_fields:
+            field = user_model._meta.get_field(field_name)
+            through = field.remote_field.through
+            user_column = '{0}_id'.format(field.m2m_field_name())
+            related_column = '{0}_id'.format(field.m2m_reverse_field_name())
+
+            provided = [
+                (user, relation[field_name])
+                for user, relation in zip(users, relations)
+                if field_name in relation
+            ]
+            if not provided:
+                continue
+
+            if replace:
+                through.objects.filter(**{
+                    '{0}__in'.format(user_column): [user.pk for user, __ in provided],
+                }).delete()
+
+            through.objects.bulk_create([
+                through(**{user_column: user.pk, related_column: related_pk})
+                for user, related_objects in provided
+                for related_pk in {related_object.pk for related_object in related_objects}
+            ])
+
+            # Through table writes skip model signals, so update change versions directly.
+            ModelVersion.objects.bump(user_model, field.related_model)
 
 
 class UserSerializer(serializers.ModelSerializer):
-    """Serializer for User model."""
+    """Serializer for User model.
+
+    Related models in `expandable_fields` are only included when named in the "expand" serializer context.
+    """
+
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
+    # Read-only related data that can be optionally included, by name.
+    expandable_fields = {
+        'profile': UserProfileField,
+        'favorite_foods': FavoriteFoodsField,
+    }
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field_name in self.context.get('expand', ()):
+            fields[field_name] = self.expandable_fields[field_name]()
+        return fields
 
     class Meta:
         model = get_user_model()
         fields = [
+            'id',
             'username',
             'email',
             'first_name',
@@ -31,16 +368,19 @@ class UserSerializer(serializers.ModelSerializer):
             'last_login',
             'date_joined',
         ]
+        list_serializer_class = UserListSerializer
 
 
 class GroupSerializer(serializers.ModelSerializer):
     """Serializer for Django PermissionGroup model."""
 
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
     # Model Fields.
     id = serializers.IntegerField(read_only=True)
     name = serializers.CharField(max_length=255)
 
     class Meta:
         model = Group
-        fields = ['name', 'permissions']
+        fields = ['id', 'name', 'permissions']
 
@@ -0,0 +1,32 @@
+"""
+Session engine for Django REST test project app.
+
+Set as SESSION_ENGINE, to keep user session tracking (see `UserSession`) up to date when session keys change.
+"""
+
+# Third-Party Imports.
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore as DatabaseSessionStore
+
+# Internal Imports.
+from test_app.models import UserSession
+
+
+class SessionStore(DatabaseSessionStore):
+    """Database session store that tracks the user of each newly created session key.
+
+    Logins are tracked by the `user_logged_in` signal. But a logged in session also gets a new key without a login,
+    such as when `update_session_auth_hash()` cycles the key after a password change. The old session row is
+    deleted then, which removes its tracking row along with it, so the new key is tracked here.
+    """
+
+    def save(self, must_create=False):
+        super().save(must_create=must_create)
+
+        # Only new keys need tracking. Existing keys were tracked when they were created, or on login.
+        if not must_create:
+            return
+
+        user_id = self._get_session().get(SESSION_KEY)
+        if user_id is not None:
+            UserSession.objects.update_or_create(session_id=self.session_key, defaults={'user_id': user_id})
@@ -0,0 +1,191 @@
+"""
+Signals for Django REST test project app.
+"""
+
+# Third-Party Imports.
+from django.apps import apps
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.contrib.sessions.backends.db import SessionStore as DatabaseSessionStore
+from django.db import connections, models
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+
+# Internal Imports.
+from test_app.bulk import restore_deferred_indexes
+from test_app.models import FavoriteFood, ModelVersion, UserProfile, UserSession
+from test_app.search import SEARCH_USER_FIELDS, create_search_table, index_users, remove_users
+
+
+# Indexes for tables whose models are not declared in this app, as (model, index) pairs.
+SUPPLEMENTAL_INDEXES = (
+    # Support DjangoLogAdmin ordering and date hierarchy, and the per-user "recent actions" admin list.
+    (LogEntry, models.Index(fields=['action_time', 'id'], name='admin_log_action_time_id_idx')),
+    (LogEntry, models.Index(fields=['user', 'action_time'], name='admin_log_user_time_idx')),
+    # Support paging through group members, in user order.
+    (get_user_model().groups.through, models.Index(fields=['group', 'user'], name='user_groups_group_user_idx')),
+)
+
+# Models that have their change version tracked, for conditional/cached API responses.
+VERSIONED_MODELS = (get_user_model(), Group, Permission, UserProfile, FavoriteFood)
+
+# Many-to-many relations between the above models.
+VERSIONED_RELATIONS = (
+    get_user_model().groups.through,
+    get_user_model().user_permissions.through,
+    Group.permissions.through,
+    FavoriteFood.user.through,
+)
+
+
+# region Model Versioning
+
+def bump_model_version(sender, **kwargs):
+    """Increments change version of a model, on save or delete."""
+    ModelVersion.objects.bump(sender)
+
+
+def bump_relation_version(sender, instance, action, model, **kwargs):
+    """Increments change version of both sides of a many-to-many relation, on relation change."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        ModelVersion.objects.bump(instance.__class__, model)
+
+
+for versioned_model in VERSIONED_MODELS:
+    post_save.connect(
+        bump_model_version,
+        sender=versioned_model,
+        dispatch_uid='bump_model_version_save_{0}'.format(versioned_model._meta.label_lower),
+    )
+    post_delete.connect(
+        bump_model_version,
+        sender=versioned_model,
+        dispatch_uid='bump_model_version_delete_{0}'.format(versioned_model._meta.label_lower),
+    )
+
+for versioned_relation in VERSIONED_RELATIONS:
+    m2m_changed.connect(
+        bump_relation_version,
+        sender=versioned_relation,
+        dispatch_uid='bump_relation_version_{0}'.format(versioned_relation._meta.label_lower),
+    )
+
+# endregion Model Versioning
+
+
+# region User Search Index
+
+def create_user_search_table(sender, using, **kwargs):
+    """Creates user search table after migrations, if not yet present."""
+    create_search_table(connections[using])
+
+
+def index_user(sender, instance, update_fields=None, **kwargs):
+    """Updates search row of a user, on save."""
+    # Skip saves that do not touch indexed fields, such as last_login updates on login.
+    if update_fields is not None and not set(update_fields) & set(SEARCH_USER_FIELDS):
+        return
+    index_users([instance.pk])
+
+
+def unindex_user(sender, instance, **kwargs):
+    """Removes search row of a user, on delete."""
+    remove_users([instance.pk])
+
+
+def index_profile_user(sender, instance, **kwargs):
+    """Updates search row of a profile's user, on profile save or delete."""
+    index_users([instance.user_id])
+
+
+post_migrate.connect(
+    create_user_search_table,
+    sender=apps.get_app_config('test_app'),
+    dispatch_uid='create_user_search_table',
+)
+post_save.connect(index_user, sender=get_user_model(), dispatch_uid='index_user_save')
+post_delete.connect(unindex_user, sender=get_user_model(), dispatch_uid='index_user_delete')
+post_save.connect(index_profile_user, sender=UserProfile, dispatch_uid='index_profile_user_save')
+post_delete.connect(index_profile_user, sender=UserProfile, dispatch_uid='index_profile_user_delete')
+
+# endregion User Search Index
+
+
+# region User Session Tracking
+
+def track_user_session(sender, request, user, **kwargs):
+    """Records session of a user, on login."""
+    session = getattr(request, 'session', None)
+    if session is None or session.session_key is None:
+        return
+
+    # Only sessions stored in the database can be tracked.
+    if not isinstance(session, DatabaseSessionStore):
+        return
+
+    UserSession.objects.update_or_create(session_id=session.session_key, defaults={'user': user})
+
+
+def untrack_user_session(sender, request, user, **kwargs):
+    """Removes session record of a user, on logout."""
+    session = getattr(request, 'session', None)
+    if session is None or session.session_key is None:
+        return
+
+    UserSession.objects.filter(session_id=session.session_key).delete()
+
+
+user_logged_in.connect(track_user_session, dispatch_uid='track_user_session')
+user_logged_out.connect(untrack_user_session, dispatch_uid='untrack_user_session')
+
+# endregion User Session Tracking
+
+
+# region Supplemental Indexes
+
+def create_supplemental_indexes(sender, using, **kwargs):
+    """Creates indexes on Django and auto-created many-to-many tables after migrations, if not yet present.
+
+    These models are not declared in this app, so the indexes can not be declared on the models themselves.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        table_names = set(connection.introspection.table_names(cursor))
+        constraints = {
+            model._meta.db_table: connection.introspection.get_constraints(cursor, model._meta.db_table)
+            for model, index in SUPPLEMENTAL_INDEXES
+            if model._meta.db_table in table_names
+        }
+
+    missing_indexes = [
+        (model, index) for model, index in SUPPLEMENTAL_INDEXES
+        if model._meta.db_table in constraints and index.name not in constraints[model._meta.db_table]
+    ]
+    if not missing_indexes:
+        return
+
+    with connection.schema_editor() as schema_editor:
+        for model, index in missing_indexes:
+            schema_editor.add_index(model, index)
+
+
+post_migrate.connect(
+    create_supplemental_indexes,
+    sender=apps.get_app_config('test_app'),
+    dispatch_uid='create_supplemental_indexes',
+)
+
+
+def restore_interrupted_indexes(sender, using, **kwargs):
+    """Recreates indexes left dropped by an interrupted bulk load, after migrations."""
+    restore_deferred_indexes(using=using)
+
+
+post_migrate.connect(
+    restore_interrupted_indexes,
+    sender=apps.get_app_config('test_app'),
+    dispatch_uid='restore_interrupted_indexes',
+)
+
+# endregion Supplemental Indexes
@@ -0,0 +1,571 @@
+"""
+Admin view tests for Django REST test project app.
+
+Uses base/built-in Django logic to execute.
+"""
+
+# System Imports.
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.contrib.admin.models import ADDITION, CHANGE, LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Internal Imports.
+from test_app.models import TableRowCount, UserSession
+from test_app.paginators import get_estimated_row_count
+
+
+class AdminViewTestCase(TestCase):
+    """Tests for app admin views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up testing data."""
+        # Call parent logic.
+        super().setUpTestData()
+
+        # Generate user models.
+        cls.test_super_user = get_user_model().objects.create(
+            username='test_superuser',
+            first_name='SuperUserFirst',
+            last_name='SuperUserLast',
+            is_superuser=True,
+            is_staff=True,
+            is_active=True,
+        )
+        cls.test_standard_user = get_user_model().objects.create(
+            username='test_user',
+            first_name='UserFirst',
+            last_name='UserLast',
+            is_superuser=False,
+            is_staff=False,
+            is_active=True,
+        )
+
+    def setUp(self):
+        # Call parent logic.
+        super().setUp()
+
+        self.client.force_login(self.test_super_user)
+
+    def test__user_admin_search(self):
+        """Verifies that user admin search uses the user search index."""
+        with self.subTest('Check search by prefix'):
+            response = self.client.get('/admin/test_app/user/', {'q': 'userf'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context['cl'].result_list), [self.test_standard_user])
+
+        with self.subTest('Check search with multiple words'):
+            response = self.client.get('/admin/test_app/user/', {'q': 'superuserfirst superuserlast'})
+            self.assertEqual(list(response.context['cl'].result_list), [self.test_super_user])
+
+        with self.subTest('Check search without matches'):
+            response = self.client.get('/admin/test_app/user/', {'q': 'nomatch'})
+            self.assertEqual(list(response.context['cl'].result_list), [])
+
+    def create_sessions(self, start, stop):
+        """Creates logged in user sessions, for new users with provided index range."""
+        for index in range(start, stop):
+            user = get_user_model().objects.create(username='session_user_{0}'.format(index))
+            session = SessionStore()
+            session['_auth_user_id'] = str(user.pk)
+            session.create()
+
+    def test__session_admin_changelist(self):
+        """Verifies that session changelist shows session users, with a constant number of queries per page."""
+        # Non-login session.
+        session = SessionStore()
+        session['value'] = 'anonymous'
+        session.create()
+
+        with self.subTest('Check session users are displayed'):
+            self.create_sessions(0, 5)
+            response = self.client.get('/admin/sessions/session/')
+
+            self.assertEqual(response.status_code, 200)
+            session_users = [
+                str(response.context['cl'].model_admin.get_session_user(session))
+                for session in response.context['cl'].result_list
+            ]
+            self.assertIn('session_user_0', session_users)
+            self.assertIn('session_user_4', session_users)
+            self.assertIn('Anonymous', session_users)
+
+        with self.subTest('Check query count does not grow with page size'):
+            with CaptureQueriesContext(connection) as small_page_queries:
+                self.client.get('/admin/sessions/session/')
+
+            self.create_sessions(5, 50)
+            with CaptureQueriesContext(connection) as large_page_queries:
+                response = self.client.get('/admin/sessions/session/')
+
+            # Includes the session for the logged in admin user.
+            self.assertEqual(len(response.context['cl'].result_list), 52)
+            self.assertEqual(len(small_page_queries), len(large_page_queries))
+
+    def test__user_admin_sessions(self):
+        """Verifies that user admin lists and revokes tracked user sessions."""
+        user_client = Client()
+        user_client.force_login(self.test_standard_user)
+        session_key = user_client.session.session_key
+
+        with self.subTest('Check sessions are listed on user detail view'):
+            response = self.client.get('/admin/test_app/user/{0}/change/'.format(self.test_standard_user.pk))
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, session_key)
+
+        with self.subTest('Check revoke sessions action'):
+            response = self.client.post('/admin/test_app/user/', {
+                'action': 'revoke_sessions',
+                '_selected_action': [self.test_standard_user.pk],
+            }, follow=True)
+
+            self.assertContains(response, 'Revoked 1 sessions.')
+            self.assertFalse(UserSession.objects.filter(user=self.test_standard_user).exists())
+            self.assertTrue(UserSession.objects.filter(user=self.test_super_user).exists())
+            self.assertEqual(user_client.get('/rest/users/').status_code, 403)
+
+    def test__log_admin_changelist(self):
+        """Verifies that log changelist pages by keyset, with a date hierarchy built from indexed lookups."""
+        start_time = timezone.make_aware(datetime(2023, 11, 1, 12))
+        LogEntry.objects.bulk_create([
+            LogEntry(
+                user=self.test_super_user,
+                action_time=start_time + timedelta(days=index),
+                object_repr='Entry {0}'.format(index),
+                action_flag=ADDITION,
+            )
+            for index in range(150)
+        ])
+
+        with self.subTest('Check first page'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/admin/admin/logentry/')
+
+            self.assertEqual(response.status_code, 200)
+            result_list = response.context['cl'].result_list
+            self.assertEqual(len(result_list), 100)
+            self.assertEqual(result_list[0].object_repr, 'Entry 149')
+            self.assertIsNotNone(response.context['cl'].keyset_next_link)
+
+            # Dates are not listed with a DISTINCT scan.
+            self.assertFalse([query for query in queries if 'DISTINCT' in query['sql']])
+
+            # Years are listed from first to last entry.
+            self.assertContains(response, '?action_time__year=2023')
+            self.assertContains(response, '?action_time__year=2024')
+
+        with self.subTest('Check next page'):
+            response = self.client.get('/admin/admin/logentry/' + response.context['cl'].keyset_next_link)
+
+            result_list = response.context['cl'].result_list
+            self.assertEqual(len(result_list), 50)
+            self.assertEqual(result_list[0].object_repr, 'Entry 49')
+            self.assertIsNone(response.context['cl'].keyset_next_link)
+
+        with self.subTest('Check date hierarchy drill-down'):
+            response = self.client.get('/admin/admin/logentry/', {'action_time__year': 2023})
+
+            self.assertEqual(len(response.context['cl'].result_list), 61)
+            self.assertContains(response, 'action_time__month=11')
+            self.assertContains(response, 'action_time__month=12')
+            self.assertNotContains(response, 'action_time__month=10')
+
+        with self.subTest('Check count is capped'):
+            with patch('test_app.paginators.CappedCountPaginator.count_cap', 120):
+                response = self.client.get('/admin/admin/logentry/')
+
+            self.assertEqual(response.context['cl'].result_count, 120)
+            self.assertTrue(response.context['cl'].paginator.count_capped)
+
+        with self.subTest('Check periods without entries are skipped'):
+            LogEntry.objects.create(
+                user=self.test_super_user,
+                action_time=timezone.make_aware(datetime(2030, 6, 1, 12)),
+                object_repr='Later entry',
+                action_flag=ADDITION,
+            )
+
+            response = self.client.get('/admin/admin/logentry/')
+
+            self.assertContains(response, '?action_time__year=2024')
+            self.assertContains(response, '?action_time__year=2030')
+            for year in range(2025, 2030):
+                self.assertNotContains(response, '?action_time__year={0}'.format(year))
+
+    def test__estimated_count_pagination(self):
+        """Verifies that changelists estimate counts of large tables, with exact counts on request."""
+        TableRowCount.objects.create(label='test_app.user', row_count=5000000)
+
+        with self.subTest('Check estimated count'):
+            response = self.client.get('/admin/test_app/user/')
+
+            self.assertEqual(response.context['cl'].result_count, 5000000)
+            self.assertContains(response, 'about 5000000 users')
+            self.assertContains(response, '?exact_count=1')
+
+        with self.subTest('Check exact count on request'):
+            response = self.client.get('/admin/test_app/user/', {'exact_count': 1})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context['cl'].result_count, 2)
+            self.assertNotContains(response, 'about 2')
+            self.assertIsNone(response.context['cl'].exact_count_link)
+
+        with self.subTest('Check filtered count is capped, not estimated'):
+            with patch('test_app.paginators.CappedCountPaginator.count_cap', 1):
+                response = self.client.get('/admin/test_app/user/', {'is_active__exact': 1})
+
+            self.assertEqual(response.context['cl'].result_count, 1)
+            self.assertContains(response, '1+ user')
+            self.assertContains(response, 'exact_count=1')
+
+        with self.subTest('Check small tables are counted'):
+            TableRowCount.objects.filter(label='test_app.user').update(row_count=50)
+            response = self.client.get('/admin/test_app/user/')
+
+            self.assertEqual(response.context['cl'].result_count, 2)
+            self.assertIsNone(response.context['cl'].exact_count_link)
+
+        with self.subTest('Check estimate from SQLite statistics'):
+            TableRowCount.objects.all().delete()
+            self.assertIsNone(get_estimated_row_count(Permission))
+
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            self.assertEqual(get_estimated_row_count(Permission), Permission.objects.count())
+
+    def test__group_admin_members(self):
+        """Verifies that group members are paged, added and removed on a separate members page."""
+        group = Group.objects.create(name='large_group')
+        users = get_user_model().objects.bulk_create_with_profiles([
+            get_user_model()(username='member_{0:03d}'.format(index)) for index in range(150)
+        ])
+        group.user_set.add(*users)
+        members_url = '/admin/auth/group/{0}/members/'.format(group.pk)
+
+        with self.subTest('Check change page links to members, instead of listing them'):
+            response = self.client.get('/admin/auth/group/{0}/change/'.format(group.pk))
+
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'Manage 150 members')
+            self.assertNotContains(response, 'member_000')
+
+        with self.subTest('Check members link count is capped'):
+            with patch('test_app.admin.DjangoGroupAdmin.members_count_cap', 100):
+                response = self.client.get('/admin/auth/group/{0}/change/'.format(group.pk))
+
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'Manage 100+ members')
+
+        with self.subTest('Check members are paged'):
+            with CaptureQueriesContext(connection) as first_page_queries:
+                response = self.client.get(members_url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['members']), 100)
+            self.assertEqual(response.context['members'][0].username, 'member_000')
+            self.assertContains(response, 'member_099')
+            self.assertNotContains(response, 'member_100')
+
+            with CaptureQueriesContext(connection) as next_page_queries:
+                response = self.client.get(members_url + response.context['next_link'])
+
+            self.assertEqual(len(response.context['members']), 50)
+            self.assertEqual(response.context['members'][0].username, 'member_100')
+            self.assertIsNone(response.context['next_link'])
+            self.assertEqual(len(first_page_queries), len(next_page_queries))
+
+        with self.subTest('Check member autocomplete search'):
+            response = self.client.get('/admin/autocomplete/', {
+                'app_label': 'test_app',
+                'model_name': 'user_groups',
+                'field_name': 'user',
+                'term': 'test_us',
+            })
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [result['id'] for result in response.json()['results']],
+                [str(self.test_standard_user.pk)],
+            )
+
+        with self.subTest('Check adding members'):
+            response = self.client.post(members_url, {
+                '_add': '1',
+                'users': [self.test_standard_user.pk, self.test_super_user.pk],
+            }, follow=True)
+
+            self.assertContains(response, 'Added 2 members.')
+            self.assertEqual(group.user_set.count(), 152)
+
+        with self.subTest('Check removing members'):
+            response = self.client.post(members_url, {
+                '_remove': '1',
+                'remove': [users[0].pk, users[1].pk, self.test_standard_user.pk],
+            }, follow=True)
+
+            self.assertContains(response, 'Removed 3 members.')
+            self.assertEqual(group.user_set.count(), 149)
+            self.assertFalse(group.user_set.filter(pk=users[0].pk).exists())
+
+    def test__autocomplete_widgets(self):
+        """Verifies that user and group change pages only render selected permissions and groups."""
+        permissions = list(Permission.objects.order_by('pk'))
+        group = Group.objects.create(name='autocomplete_group')
+        user_url = '/admin/test_app/user/{0}/change/'.format(self.test_standard_user.pk)
+
+        with self.subTest('Check only selected values are rendered'):
+            self.test_standard_user.user_permissions.add(*permissions[:5])
+            self.test_standard_user.groups.add(group)
+            group.permissions.add(*permissions[:3])
+
+            with CaptureQueriesContext(connection) as few_selected_queries:
+                response = self.client.get(user_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content.decode().count('<option value='), 6)
+
+            response = self.client.get('/admin/auth/group/{0}/change/'.format(group.pk))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content.decode().count('<option value='), 3)
+
+        with self.subTest('Check query count does not grow with selected values'):
+            self.test_standard_user.user_permissions.add(*permissions[5:40])
+
+            with CaptureQueriesContext(connection) as many_selected_queries:
+                response = self.client.get(user_url)
+            self.assertEqual(response.content.decode().count('<option value='), 41)
+            self.assertEqual(len(few_selected_queries), len(many_selected_queries))
+
+        with self.subTest('Check permission autocomplete search'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/admin/autocomplete/', {
+                    'app_label': 'test_app',
+                    'model_name': 'user',
+                    'field_name': 'user_permissions',
+                    'term': 'delete_user',
+                })
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(
+                str(Permission.objects.get(codename='delete_user', content_type__app_label='test_app')),
+                [result['text'] for result in response.json()['results']],
+            )
+            self.assertLess(len(queries), 10)
+
+        with self.subTest('Check permission autocomplete search matches within values'):
+            response = self.client.get('/admin/autocomplete/', {
+                'app_label': 'test_app',
+                'model_name': 'user',
+                'field_name': 'user_permissions',
+                'term': 'add user',
+            })
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(
+                str(Permission.objects.get(codename='add_user', content_type__app_label='test_app')),
+                [result['text'] for result in response.json()['results']],
+            )
+
+        with self.subTest('Check group autocomplete search'):
+            response = self.client.get('/admin/autocomplete/', {
+                'app_label': 'test_app',
+                'model_name': 'user',
+                'field_name': 'groups',
+                'term': 'autocomplete',
+            })
+
+            self.assertEqual([result['text'] for result in response.json()['results']], ['autocomplete_group'])
+
+    def test__user_admin_bulk_actions(self):
+        """Verifies that bulk user actions update all selected users, with one log entry per changed user."""
+        users = get_user_model().objects.bulk_create_with_profiles([
+            get_user_model()(username='bulk_{0:02d}'.format(index)) for index in range(40)
+        ])
+        group = Group.objects.create(name='bulk_group')
+        group.user_set.add(users[0])
+        permission = Permission.objects.get(codename='view_user', content_type__app_label='test_app')
+
+        def run_action(action, select_across=True, **data):
+            """Runs action on all "bulk_" users, as with "select all" on a search results changelist."""
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/admin/test_app/user/?q=bulk', {
+                    'action': action,
+                    'select_across': '1' if select_across else '0',
+                    '_selected_action': [users[0].pk],
+                    'index': '0',
+                    **data,
+                }, follow=True)
+            self.assertEqual(response.status_code, 200)
+            return response, queries
+
+        with self.subTest('Check deactivate'):
+            LogEntry.objects.all().delete()
+            response, queries = run_action('deactivate_users')
+
+            self.assertContains(response, 'Deactivated 40 users in ')
+            self.assertFalse(get_user_model().objects.filter(username__startswith='bulk_', is_active=True).exists())
+            self.assertTrue(get_user_model().objects.get(pk=self.test_standard_user.pk).is_active)
+            self.assertEqual(LogEntry.objects.filter(action_flag=CHANGE, change_message='Deactivated.').count(), 40)
+            self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "test_app_user" SET "password"')])
+
+        with self.subTest('Check activate only changes inactive users'):
+            get_user_model().objects.filter(pk__in=[user.pk for user in users[:10]]).update(is_active=True)
+            response, queries = run_action('activate_users')
+
+            self.assertContains(response, 'Activated 30 users in ')
+            self.assertEqual(LogEntry.objects.filter(change_message='Activated.').count(), 30)
+
+        with self.subTest('Check add to group'):
+            response, queries = run_action('add_to_group', group=group.pk)
+
+            self.assertContains(response, 'Added 39 users to group &quot;bulk_group&quot; in ')
+            self.assertEqual(group.user_set.count(), 40)
+            self.assertEqual(LogEntry.objects.filter(change_message='Added to group "bulk_group".').count(), 39)
+
+        with self.subTest('Check remove from group'):
+            group.user_set.add(self.test_standard_user)
+            response, queries = run_action('remove_from_group', group=group.pk)
+
+            self.assertContains(response, 'Removed 40 users from group &quot;bulk_group&quot; in ')
+            self.assertEqual(list(group.user_set.all()), [self.test_standard_user])
+
+        with self.subTest('Check grant permission'):
+            response, queries = run_action('grant_permission', select_across=False, permission=permission.pk)
+
+            self.assertContains(response, 'Granted 1 users permission')
+            self.assertEqual(list(permission.user_set.all()), [users[0]])
+
+        with self.subTest('Check missing action form value'):
+            response, queries = run_action('add_to_group')
+
+            self.assertContains(response, 'Select a group to apply the action with.')
+
+    def test__user_admin_action_permissions(self):
+        """Verifies that bulk user actions are only shown to and run for staff users with change permissions."""
+        staff_user = get_user_model().objects.create(username='test_staff', is_staff=True, is_active=True)
+        view_permission = Permission.objects.get(codename='view_user', content_type__app_label='test_app')
+        change_permission = Permission.objects.get(codename='change_user', content_type__app_label='test_app')
+        staff_user.user_permissions.add(view_permission)
+        group = Group.objects.create(name='action_group')
+        self.client.force_login(staff_user)
+
+        def get_action_names():
+            response = self.client.get('/admin/test_app/user/')
+            self.assertEqual(response.status_code, 200)
+
+            # Changelists without any available actions have no action form.
+            action_form = response.context['action_form']
+            if action_form is None:
+                return set()
+            return {name for name, label in action_form.fields['action'].choices if name}
+
+        def run_action(action, **data):
+            return self.client.post('/admin/test_app/user/', {
+                'action': action,
+                'select_across': '1',
+                '_selected_action': [staff_user.pk],
+                'index': '0',
+                **data,
+            }, follow=True)
+
+        with self.subTest('Check view only staff can not see or run actions'):
+            self.assertEqual(get_action_names(), set())
+
+            user_client = Client()
+            user_client.force_login(self.test_standard_user)
+
+            run_action('grant_permission', permission=change_permission.pk)
+            run_action('deactivate_users')
+            run_action('add_to_group', group=group.pk)
+            run_action('revoke_sessions')
+
+            self.assertTrue(UserSession.objects.filter(user=self.test_standard_user).exists())
+
+            self.assertFalse(staff_user.user_permissions.filter(pk=change_permission.pk).exists())
+            self.assertFalse(get_user_model().objects.filter(is_active=False).exists())
+            self.assertFalse(group.user_set.exists())
+
+        with self.subTest('Check group and permission actions require change permission on those models'):
+            staff_user.user_permissions.add(change_permission)
+
+            action_names = get_action_names()
+            self.assertTrue({'activate_users', 'deactivate_users', 'revoke_sessions'} <= action_names)
+            self.assertFalse(action_names & {'add_to_group', 'remove_from_group', 'grant_permission'})
+
+            run_action('grant_permission', permission=change_permission.pk)
+            run_action('add_to_group', group=group.pk)
+
+            self.assertEqual(list(change_permission.user_set.all()), [staff_user])
+            self.assertFalse(group.user_set.exists())
+
+        with self.subTest('Check group actions with group change permission'):
+            staff_user.user_permissions.add(Permission.objects.get(codename='change_group'))
+
+            action_names = get_action_names()
+            self.assertTrue({'add_to_group', 'remove_from_group'} <= action_names)
+            self.assertNotIn('grant_permission', action_names)
+
+            run_action('add_to_group', group=group.pk)
+            self.assertEqual(group.user_set.count(), get_user_model().objects.count())
+
+    def test__permission_admin_queries(self):
+        """Verifies that permission admin pages run a constant number of queries, with many permissions and users."""
+        content_type = ContentType.objects.get_for_model(get_user_model())
+        permission = Permission.objects.create(name='Can test queries', codename='test_queries', content_type=content_type)
+        permission_url = '/admin/auth/permission/{0}/change/'.format(permission.pk)
+        groups = Group.objects.bulk_create([Group(name='permission_group_{0}'.format(index)) for index in range(20)])
+
+        def get_page(url):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            return response, len(queries)
+
+        # Pages with few permissions and users. Content type caches are filled by the first request.
+        permission.user_set.add(self.test_standard_user)
+        permission.group_set.add(groups[0])
+        get_page(permission_url)
+        response, few_changelist_queries = get_page('/admin/auth/permission/')
+        response, few_change_queries = get_page(permission_url)
+
+        # Pages with many permissions and users.
+        Permission.objects.bulk_create([
+            Permission(name='Can bulk {0}'.format(index), codename='bulk_{0}'.format(index), content_type=content_type)
+            for index in range(5000)
+        ])
+        users = get_user_model().objects.bulk_create_with_profiles([
+            get_user_model()(username='permission_user_{0}'.format(index)) for index in range(10000)
+        ])
+        permission.user_set.add(*users[:30])
+        permission.group_set.add(*groups)
+
+        with self.subTest('Check changelist queries'):
+            response, many_changelist_queries = get_page('/admin/auth/permission/')
+
+            self.assertEqual(len(response.context['cl'].result_list), 100)
+            self.assertEqual(few_changelist_queries, many_changelist_queries)
+
+        with self.subTest('Check change page queries'):
+            response, many_change_queries = get_page(permission_url)
+
+            self.assertEqual(few_change_queries, many_change_queries)
+
+            # Only assigned users and groups are rendered as options, along with the permission content type options.
+            content = response.content.decode()
+            self.assertEqual(
+                content.count('<option value="') - content.count('<option value=""'),
+                31 + 20 + ContentType.objects.count(),
+            )
+            self.assertNotContains(response, 'permission_user_30<')
+            self.assertContains(response, 'permission_user_29')
+            self.assertContains(response, 'permission_group_19')
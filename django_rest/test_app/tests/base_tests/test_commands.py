@@ -0,0 +1,451 @@
+"""
+Management command tests for Django REST test project app.
+
+Uses base/built-in Django logic to execute.
+"""
+
+# System Imports.
+import sqlite3
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+# Internal Imports.
+from test_app.bulk import deferred_indexes
+from test_app.models import ApiRequestJson, FavoriteFood, TableRowCount, UserProfile, UserSession
+from test_app.search import SEARCH_TABLE, search_user_ids
+
+
+class CommandTestCase(TestCase):
+    """Tests for app management commands."""
+
+    def test__backfill_profiles(self):
+        """Verifies that missing user profiles are created in batches."""
+        users = get_user_model().objects.bulk_create([
+            get_user_model()(username='backfill_user_{0}'.format(index)) for index in range(5)
+        ])
+        get_user_model().objects.create(username='profile_user')
+
+        with self.subTest('Check missing profiles are created'):
+            stdout = StringIO()
+            call_command('backfill_profiles', batch_size=2, stdout=stdout)
+
+            self.assertEqual(UserProfile.objects.count(), 6)
+            for user in users:
+                self.assertTrue(UserProfile.objects.filter(user_id=user.pk).exists())
+            self.assertIn('Created 2 profiles...', stdout.getvalue())
+            self.assertIn('Done. Created 5 profiles.', stdout.getvalue())
+
+        with self.subTest('Check repeat run does nothing'):
+            stdout = StringIO()
+            call_command('backfill_profiles', stdout=stdout)
+
+            self.assertEqual(UserProfile.objects.count(), 6)
+            self.assertIn('Done. Created 0 profiles.', stdout.getvalue())
+
+        with self.subTest('Check concurrently created profiles are skipped'):
+            racing_user = get_user_model().objects.bulk_create([get_user_model()(username='racing_user')])[0]
+            bulk_create = UserProfile.objects.bulk_create
+
+            def racing_bulk_create(*args, **kwargs):
+                # Simulate the profile being created after the missing profile query ran.
+                UserProfile.objects.create(user_id=racing_user.pk)
+                return bulk_create(*args, **kwargs)
+
+            with patch.object(UserProfile.objects, 'bulk_create', side_effect=racing_bulk_create):
+                call_command('backfill_profiles', stdout=StringIO())
+
+            self.assertEqual(UserProfile.objects.filter(user_id=racing_user.pk).count(), 1)
+
+        with self.subTest('Check concurrently created profiles are not counted'):
+            racing_users = get_user_model().objects.bulk_create([
+                get_user_model()(username='racing_user_{0}'.format(index)) for index in range(3)
+            ])
+            profile_filter = UserProfile.objects.filter
+
+            def racing_filter(*args, **kwargs):
+                # Simulate a profile being created after users without profiles were listed.
+                if not profile_filter(user_id=racing_users[0].pk).exists():
+                    UserProfile.objects.create(user_id=racing_users[0].pk)
+                return profile_filter(*args, **kwargs)
+
+            stdout = StringIO()
+            with patch.object(UserProfile.objects, 'filter', side_effect=racing_filter):
+                call_command('backfill_profiles', stdout=stdout)
+
+            self.assertEqual(UserProfile.objects.filter(user__in=racing_users).count(), 3)
+            self.assertIn('Done. Created 2 profiles.', stdout.getvalue())
+
+    def test__rebuild_user_search(self):
+        """Verifies that user search index is rebuilt from current data."""
+        user = get_user_model().objects.create(username='search_user')
+
+        # Simulate changes made outside of model signals.
+        get_user_model().objects.filter(pk=user.pk).update(first_name='Rebuilt')
+        with connection.cursor() as cursor:
+            cursor.execute('INSERT INTO {0}(rowid, username) VALUES (%s, %s)'.format(SEARCH_TABLE), [99999, 'stale'])
+        self.assertEqual(search_user_ids('rebuilt'), [])
+
+        stdout = StringIO()
+        call_command('rebuild_user_search', stdout=stdout)
+
+        self.assertEqual(search_user_ids('rebuilt'), [user.pk])
+        self.assertEqual(search_user_ids('stale'), [])
+        self.assertIn('Done. Indexed 1 users.', stdout.getvalue())
+
+    def test__purge_old(self):
+        """Verifies that old rows are deleted in batches, leaving newer rows."""
+        ApiRequestJson.objects.bulk_create([ApiRequestJson(json_value={'index': index}) for index in range(7)])
+        ApiRequestJson.objects.filter(json_value__index__lt=5).update(date_created=timezone.now() - timedelta(days=40))
+        ApiRequestJson.objects.filter(json_value__index=5).update(date_created=timezone.now() - timedelta(days=20))
+
+        with self.subTest('Check old rows are deleted'):
+            stdout = StringIO()
+            call_command('purge_old', model='ApiRequestJson', older_than='30d', batch_size=2, sleep=0, stdout=stdout)
+
+            self.assertEqual(
+                sorted(ApiRequestJson.objects.values_list('json_value__index', flat=True)),
+                [5, 6],
+            )
+            self.assertIn('Deleted 2 rows', stdout.getvalue())
+            self.assertIn('Deleted 4 rows', stdout.getvalue())
+            self.assertIn('Done. Deleted 5 rows', stdout.getvalue())
+
+        with self.subTest('Check repeat run resumes from remaining rows'):
+            stdout = StringIO()
+            call_command('purge_old', model='test_app.ApiRequestJson', older_than='2w', sleep=0, stdout=stdout)
+
+            self.assertEqual(list(ApiRequestJson.objects.values_list('json_value__index', flat=True)), [6])
+            self.assertIn('Done. Deleted 1 rows', stdout.getvalue())
+
+        with self.subTest('Check invalid arguments'):
+            with self.assertRaisesMessage(CommandError, 'Unknown model'):
+                call_command('purge_old', model='NotAModel', older_than='30d')
+            with self.assertRaisesMessage(CommandError, 'does not have a date_created field'):
+                call_command('purge_old', model='ModelVersion', older_than='30d')
+            with self.assertRaisesMessage(CommandError, 'Invalid --older-than value'):
+                call_command('purge_old', model='ApiRequestJson', older_than='30 days')
+
+    def test__purge_sessions(self):
+        """Verifies that expired sessions are deleted in batches, leaving active sessions."""
+        now = timezone.now()
+        Session.objects.bulk_create([
+            Session(session_key='expired_{0}'.format(index), session_data='', expire_date=now - timedelta(days=1))
+            for index in range(5)
+        ] + [
+            Session(session_key='active_{0}'.format(index), session_data='', expire_date=now + timedelta(days=1))
+            for index in range(2)
+        ])
+
+        with self.subTest('Check expired sessions are deleted'):
+            stdout = StringIO()
+            call_command('purge_sessions', batch_size=2, sleep=0, stdout=stdout)
+
+            self.assertEqual(sorted(Session.objects.values_list('session_key', flat=True)), ['active_0', 'active_1'])
+            self.assertIn('Deleted 2 rows', stdout.getvalue())
+            self.assertIn('Done. Deleted 5 sessions', stdout.getvalue())
+
+        with self.subTest('Check rate cap extends pauses'):
+            Session.objects.bulk_create([
+                Session(session_key='expired_{0}'.format(index), session_data='', expire_date=now - timedelta(days=1))
+                for index in range(4)
+            ])
+
+            with patch('test_app.bulk.time.sleep') as mock_sleep:
+                call_command('purge_sessions', batch_size=2, sleep=0, max_rate=1, stdout=StringIO())
+
+            # Pauses after each full batch of 2 are stretched to about 2 seconds, to stay at 1 session per second.
+            self.assertEqual(mock_sleep.call_count, 2)
+            self.assertGreater(mock_sleep.call_args_list[0][0][0], 1.5)
+            self.assertEqual(Session.objects.count(), 2)
+
+        with self.subTest('Check continuous mode runs until interrupted'):
+            Session.objects.bulk_create([
+                Session(session_key='expired_0', session_data='', expire_date=now - timedelta(days=1)),
+            ])
+
+            stdout = StringIO()
+            with patch('test_app.management.commands.purge_sessions.time.sleep', side_effect=KeyboardInterrupt):
+                call_command('purge_sessions', continuous=True, interval=30, stdout=stdout)
+
+            self.assertEqual(Session.objects.count(), 2)
+            self.assertIn('Done. Deleted 1 sessions', stdout.getvalue())
+            self.assertIn('Stopped.', stdout.getvalue())
+
+    def test__user_sessions(self):
+        """Verifies that user sessions are tracked on login/logout, and can be listed or revoked."""
+        user = get_user_model().objects.create(username='session_user')
+        other_user = get_user_model().objects.create(username='other_session_user')
+        clients = [Client(), Client()]
+        for client in clients:
+            client.force_login(user)
+        Client().force_login(other_user)
+
+        with self.subTest('Check sessions are tracked on login'):
+            self.assertEqual(UserSession.objects.filter(user=user).count(), 2)
+            self.assertEqual(UserSession.objects.filter(user=other_user).count(), 1)
+
+        with self.subTest('Check session tracking is removed on logout'):
+            clients[1].logout()
+            self.assertEqual(
+                list(UserSession.objects.filter(user=user).values_list('session_id', flat=True)),
+                [clients[0].session.session_key],
+            )
+
+        with self.subTest('Check session tracking follows key change on password change'):
+            password_user = get_user_model().objects.create(username='password_user')
+            password_user.set_password('old_password_1')
+            password_user.save()
+            client = Client()
+            self.assertTrue(client.login(username='password_user', password='old_password_1'))
+            old_session_key = client.session.session_key
+
+            response = client.post('/accounts/password_change/', {
+                'old_password': 'old_password_1',
+                'new_password1': 'Vq7-trellis-Bramble',
+                'new_password2': 'Vq7-trellis-Bramble',
+            })
+
+            self.assertEqual(response.status_code, 302)
+            self.assertNotEqual(client.session.session_key, old_session_key)
+            self.assertEqual(
+                list(UserSession.objects.filter(user=password_user).values_list('session_id', flat=True)),
+                [client.session.session_key],
+            )
+
+        with self.subTest('Check listing sessions'):
+            stdout = StringIO()
+            call_command('user_sessions', 'session_user', stdout=stdout)
+
+            self.assertIn(clients[0].session.session_key, stdout.getvalue())
+            self.assertIn('1 sessions for "session_user".', stdout.getvalue())
+
+        with self.subTest('Check revoking sessions'):
+            stdout = StringIO()
+            call_command('user_sessions', 'session_user', revoke=True, stdout=stdout)
+
+            self.assertIn('Revoked 1 sessions for "session_user".', stdout.getvalue())
+            self.assertFalse(Session.objects.filter(session_key=clients[0].session.session_key).exists())
+            self.assertFalse(UserSession.objects.filter(user=user).exists())
+            self.assertEqual(UserSession.objects.filter(user=other_user).count(), 1)
+
+        with self.subTest('Check backfilling untracked sessions'):
+            untracked_session = SessionStore()
+            untracked_session['_auth_user_id'] = str(user.pk)
+            untracked_session.create()
+            anonymous_session = SessionStore()
+            anonymous_session['value'] = 'anonymous'
+            anonymous_session.create()
+
+            stdout = StringIO()
+            call_command('user_sessions', backfill=True, batch_size=1, stdout=stdout)
+
+            self.assertEqual(
+                list(UserSession.objects.filter(user=user).values_list('session_id', flat=True)),
+                [untracked_session.session_key],
+            )
+            self.assertIn('Checked 2 sessions...', stdout.getvalue())
+            self.assertIn('Done. Tracked 1 sessions.', stdout.getvalue())
+
+        with self.subTest('Check unknown user'):
+            with self.assertRaisesMessage(CommandError, 'User "unknown_user" does not exist.'):
+                call_command('user_sessions', 'unknown_user')
+
+    def test__refresh_row_counts(self):
+        """Verifies that stored row counts are refreshed."""
+        get_user_model().objects.create(username='count_user')
+
+        with self.subTest('Check provided models are counted'):
+            stdout = StringIO()
+            call_command('refresh_row_counts', 'test_app.User', stdout=stdout)
+
+            self.assertEqual(TableRowCount.objects.get(label='test_app.user').row_count, 1)
+            self.assertIn('test_app.User: 1 rows', stdout.getvalue())
+
+        with self.subTest('Check stored models are recounted by default'):
+            get_user_model().objects.create(username='count_user_2')
+            call_command('refresh_row_counts', stdout=StringIO())
+
+            self.assertEqual(TableRowCount.objects.get(label='test_app.user').row_count, 2)
+
+        with self.subTest('Check unknown model'):
+            with self.assertRaisesMessage(CommandError, 'Unknown model "test_app.NotAModel".'):
+                call_command('refresh_row_counts', 'test_app.NotAModel')
+
+    def test__seed(self):
+        """Verifies that default models are created, plus deterministic fake data when requested."""
+        seed_options = {'users': 25, 'groups': 4, 'foods': 6, 'memberships_per_user': 2, 'seed': 7, 'batch_size': 10}
+
+        def get_seeded_users():
+            return list(get_user_model().objects.filter(username__startswith='seed_user_').order_by('pk').values_list(
+                'username',
+                'first_name',
+                'email',
+                'date_joined',
+                'is_active',
+                'profile__address_1',
+                'profile__state',
+                'profile__zipcode',
+            ))
+
+        with self.subTest('Check default models'):
+            call_command('seed', stdout=StringIO())
+
+            self.assertEqual(
+                set(get_user_model().objects.values_list('username', flat=True)),
+                {'test_superuser', 'test_admin', 'test_inactive', 'test_user'},
+            )
+            self.assertTrue(Group.objects.filter(name='test_group').exists())
+            self.assertTrue(Permission.objects.filter(codename='test_permission').exists())
+
+        with self.subTest('Check indexes left dropped by an interrupted seed are recreated'):
+            def get_index_names():
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT name FROM sqlite_master WHERE type = \'index\'')
+                    return {name for name, in cursor.fetchall()}
+
+            # Enter the block without exiting it, as when the process is killed mid-load.
+            interrupted_load = deferred_indexes(UserProfile)
+            interrupted_load.__enter__()
+            self.assertNotIn('userprofile_state_idx', get_index_names())
+
+            stdout = StringIO()
+            call_command('seed', stdout=stdout)
+
+            self.assertIn('userprofile_state_idx', get_index_names())
+            self.assertIn('Recreated 3 indexes left dropped by an interrupted seed.', stdout.getvalue())
+
+        with self.subTest('Check fake data'):
+            stdout = StringIO()
+            call_command('seed', stdout=stdout, **seed_options)
+
+            users = get_user_model().objects.filter(username__startswith='seed_user_')
+            self.assertEqual(users.count(), 25)
+            self.assertEqual(UserProfile.objects.filter(user__in=users).count(), 25)
+            self.assertEqual(get_user_model().groups.through.objects.filter(user__in=users).count(), 50)
+            self.assertEqual(FavoriteFood.user.through.objects.filter(user__in=users).count(), 50)
+            self.assertEqual(Group.objects.filter(name__startswith='seed_group_').count(), 4)
+            self.assertEqual(FavoriteFood.objects.count(), 6)
+            self.assertFalse(Group.objects.filter(name__startswith='seed_group_', permissions__isnull=True).exists())
+
+            # Every user has distinct memberships, and valid profile values.
+            for user in users.prefetch_related('groups'):
+                self.assertEqual(len({group.pk for group in user.groups.all()}), 2)
+                user.profile.full_clean()
+            self.assertEqual(search_user_ids('seed_user_25'), [users.get(username='seed_user_25').pk])
+            self.assertIn('Created 10/25 users', stdout.getvalue())
+            self.assertIn('Done. Created 25 users', stdout.getvalue())
+
+        with self.subTest('Check repeat run'):
+            with self.assertRaisesMessage(CommandError, 'Fake users already exist.'):
+                call_command('seed', stdout=StringIO(), **seed_options)
+
+        with self.subTest('Check same seed generates same data'):
+            seeded_users = get_seeded_users()
+            get_user_model().objects.filter(username__startswith='seed_user_').delete()
+            call_command('seed', stdout=StringIO(), **seed_options)
+
+            self.assertEqual(get_seeded_users(), seeded_users)
+
+        with self.subTest('Check worker processes generate same data'):
+            get_user_model().objects.filter(username__startswith='seed_user_').delete()
+            call_command('seed', stdout=StringIO(), **dict(seed_options, workers=2))
+
+            self.assertEqual(get_seeded_users(), seeded_users)
+
+        with self.subTest('Check different seed generates different data'):
+            get_user_model().objects.filter(username__startswith='seed_user_').delete()
+            call_command('seed', stdout=StringIO(), **dict(seed_options, seed=8))
+
+            self.assertNotEqual(get_seeded_users(), seeded_users)
+
+
+class SnapshotCommandTestCase(TransactionTestCase):
+    """Tests for the database snapshot command. Restores can not run inside the usual test transaction."""
+
+    def setUp(self):
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.snapshot_dir.cleanup)
+        settings_override = override_settings(DB_SNAPSHOT_DIR=self.snapshot_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def tearDown(self):
+        # Search rows are not model data, so they are not removed by the test case flush.
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {0}'.format(SEARCH_TABLE))
+
+    def test__snapshot(self):
+        """Verifies that snapshots are saved and restored, and that stale snapshots are not restored."""
+        get_user_model().objects.create(username='snapshot_user')
+
+        with self.subTest('Check save'):
+            stdout = StringIO()
+            call_command('snapshot', 'save', 'test_snapshot', stdout=stdout)
+
+            self.assertEqual(len(list(Path(self.snapshot_dir.name).glob('test_snapshot-*.sqlite3'))), 1)
+            self.assertIn('Done. Saved snapshot "test_snapshot"', stdout.getvalue())
+
+        with self.subTest('Check list'):
+            stdout = StringIO()
+            call_command('snapshot', 'list', stdout=stdout)
+
+            self.assertRegex(stdout.getvalue(), r'test_snapshot +[\d.]+ MB +current')
+
+        with self.subTest('Check restore'):
+            get_user_model().objects.filter(username='snapshot_user').delete()
+            get_user_model().objects.create(username='other_user')
+
+            stdout = StringIO()
+            call_command('snapshot', 'restore', 'test_snapshot', stdout=stdout)
+
+            self.assertEqual(list(get_user_model().objects.values_list('username', flat=True)), ['snapshot_user'])
+            self.assertEqual(search_user_ids('snapshot_user'), [get_user_model().objects.get().pk])
+            self.assertIn('Done. Restored snapshot "test_snapshot"', stdout.getvalue())
+
+        with self.subTest('Check stale snapshot'):
+            with patch('test_app.management.commands.snapshot.get_schema_key', return_value='changed'):
+                with self.assertRaisesMessage(CommandError, 'Snapshot "test_snapshot" is stale'):
+                    call_command('snapshot', 'restore', 'test_snapshot', stdout=StringIO())
+
+                stdout = StringIO()
+                call_command('snapshot', 'list', stdout=stdout)
+                self.assertRegex(stdout.getvalue(), r'test_snapshot +[\d.]+ MB +stale')
+
+                # Saving again replaces the stale snapshot.
+                call_command('snapshot', 'save', 'test_snapshot', stdout=StringIO())
+                self.assertEqual(
+                    [path.name for path in Path(self.snapshot_dir.name).glob('test_snapshot-*.sqlite3')],
+                    ['test_snapshot-changed.sqlite3'],
+                )
+
+        with self.subTest('Check failed save leaves no files'):
+            with patch(
+                'test_app.management.commands.snapshot.Command.show_progress',
+                side_effect=sqlite3.OperationalError('disk I/O error'),
+            ):
+                with self.assertRaises(sqlite3.OperationalError):
+                    call_command('snapshot', 'save', 'failed_snapshot', stdout=StringIO())
+
+            self.assertEqual(list(Path(self.snapshot_dir.name).glob('failed_snapshot-*')), [])
+
+        with self.subTest('Check missing snapshot'):
+            with self.assertRaisesMessage(CommandError, 'Snapshot "missing" does not exist.'):
+                call_command('snapshot', 'restore', 'missing', stdout=StringIO())
+
+        with self.subTest('Check invalid name'):
+            with self.assertRaisesMessage(CommandError, 'Provide a snapshot name'):
+                call_command('snapshot', 'save', '../outside', stdout=StringIO())
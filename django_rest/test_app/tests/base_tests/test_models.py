@@ -7,8 +7,9 @@ Uses base/built-in Django logic to execute.
 # Third-Party Imports.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.db import IntegrityError
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 # Internal Imports.
 from test_app.models import UserProfile
@@ -136,6 +137,67 @@ class ModelTestCase(TestCase):
             user_profile = UserProfile.objects.get(user=new_user)
             self.assertEqual(user_profile, new_user.profile)
 
+    def test__lazy_user_profile(self):
+        """Verifies that in lazy mode, profile rows are only written once a profile is first saved."""
+        with override_settings(LAZY_USER_PROFILES=True):
+            new_user = get_user_model().objects.create(username='lazy_user')
+
+            with self.subTest('Check no profile row on user creation'):
+                self.assertFalse(UserProfile.objects.filter(user=new_user).exists())
+
+            with self.subTest('Check reading profile returns defaults, without writing'):
+                new_user = get_user_model().objects.get(pk=new_user.pk)
+                with self.assertNumQueries(1):
+                    self.assertEqual(new_user.profile.city, '')
+                    self.assertIsNone(new_user.profile.pk)
+                    self.assertEqual(new_user.profile.user, new_user)
+                self.assertFalse(UserProfile.objects.filter(user=new_user).exists())
+
+            with self.subTest('Check select_related read'):
+                new_user = get_user_model().objects.select_related('profile').get(pk=new_user.pk)
+                with self.assertNumQueries(0):
+                    self.assertEqual(new_user.profile.city, '')
+
+            with self.subTest('Check profile row is written on first save'):
+                new_user.profile.city = 'Kalamazoo'
+                new_user.profile.save()
+
+                new_user = get_user_model().objects.get(pk=new_user.pk)
+                self.assertEqual(new_user.profile.city, 'Kalamazoo')
+                self.assertEqual(UserProfile.objects.filter(user=new_user).count(), 1)
+
+        with self.subTest('Check missing profile raises when not in lazy mode'):
+            lazy_user = get_user_model().objects.bulk_create([get_user_model()(username='no_profile_user')])[0]
+            with self.assertRaises(UserProfile.DoesNotExist):
+                lazy_user.profile
+
+    def test__bulk_create_with_profiles(self):
+        """Verifies that bulk created users are saved with primary keys and corresponding profiles."""
+        with self.subTest('Check bulk creation'):
+            users = get_user_model().objects.bulk_create_with_profiles(
+                [get_user_model()(username='bulk_user_{0}'.format(index)) for index in range(1200)],
+                batch_size=500,
+            )
+            self.assertEqual(len(users), 1200)
+            self.assertEqual(get_user_model().objects.filter(username__startswith='bulk_user_').count(), 1200)
+            self.assertEqual(UserProfile.objects.filter(user__username__startswith='bulk_user_').count(), 1200)
+
+            # Returned instances have primary keys, on all database backends.
+            for index in (0, 499, 500, 1199):
+                user = users[index]
+                self.assertIsNotNone(user.pk)
+                self.assertFalse(user._state.adding)
+                self.assertEqual(get_user_model().objects.get(pk=user.pk).username, 'bulk_user_{0}'.format(index))
+                self.assertEqual(user.profile, UserProfile.objects.get(user=user))
+
+        with self.subTest('Check nothing is written on error'):
+            with self.assertRaises(IntegrityError):
+                get_user_model().objects.bulk_create_with_profiles([
+                    get_user_model()(username='new_bulk_user'),
+                    get_user_model()(username='test_user'),
+                ])
+            self.assertFalse(get_user_model().objects.filter(username='new_bulk_user').exists())
+
     def test__assert_login(self):
         """Verifies that expected user model properly logs in."""
         with self.subTest('Check login using super user'):
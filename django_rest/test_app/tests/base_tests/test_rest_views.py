@@ -0,0 +1,723 @@
+"""
+REST API view tests for Django REST test project app.
+
+Uses base/built-in Django logic to execute.
+"""
+
+# System Imports.
+import csv
+import io
+import json
+import re
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import skipIf
+from unittest.mock import patch
+
+# Third-Party Imports.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Internal Imports.
+from test_app.filters import UserFilterSet
+from test_app.models import FavoriteFood
+from test_app.renderers import msgpack
+from test_app.search import filter_users
+from test_app.throttling import TokenBucketStore, bucket_store
+from test_app.views import GroupModelViewSet, UserModelViewSet
+
+
+class RestViewTestCase(TestCase):
+    """Tests for app REST API views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up testing data."""
+        # Call parent logic.
+        super().setUpTestData()
+
+        # Generate user models.
+        cls.test_super_user = get_user_model().objects.create(
+            username='test_superuser',
+            first_name='SuperUserFirst',
+            last_name='SuperUserLast',
+            is_superuser=True,
+            is_staff=False,
+            is_active=True,
+        )
+        cls.test_standard_user = get_user_model().objects.create(
+            username='test_user',
+            first_name='UserFirst',
+            last_name='UserLast',
+            is_superuser=False,
+            is_staff=False,
+            is_active=True,
+        )
+
+        # Generate permission/group models.
+        content_type = ContentType.objects.get_for_model(get_user_model())
+        cls.test_permission = Permission.objects.create(
+            content_type=content_type,
+            codename='test_permission',
+            name='Test Permission',
+        )
+        cls.test_group = Group.objects.create(name='test_group')
+
+    def test__conditional_get(self):
+        """Verifies that REST list/detail views return 304 for unchanged data."""
+        self.client.force_login(self.test_standard_user)
+
+        for url in ('/rest/users/', '/rest/groups/', '/rest/groups/{0}/'.format(self.test_group.pk)):
+            with self.subTest('Check validators are provided - {0}'.format(url)):
+                response = self.client.get(url, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('ETag', response)
+                self.assertIn('Last-Modified', response)
+
+            with self.subTest('Check unchanged request returns 304 - {0}'.format(url)):
+                etag = response['ETag']
+
+                # Session, user, and version lookup only. No serializer/queryset work.
+                with self.assertNumQueries(3):
+                    response = self.client.get(url, HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(response.content, b'')
+
+            with self.subTest('Check If-Modified-Since returns 304 - {0}'.format(url)):
+                response = self.client.get(
+                    url,
+                    HTTP_ACCEPT='application/json',
+                    HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+                )
+                self.assertEqual(response.status_code, 304)
+
+            with self.subTest('Check different query params do not match - {0}'.format(url)):
+                response = self.client.get(url + '?page=1', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+        with self.subTest('Check model save invalidates etag'):
+            response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json')
+            etag = response['ETag']
+
+            self.test_group.name = 'renamed_group'
+            self.test_group.save()
+
+            response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            self.assertIn('renamed_group', response.content.decode('utf-8'))
+
+        with self.subTest('Check m2m change invalidates etag'):
+            response = self.client.get('/rest/users/', HTTP_ACCEPT='application/json')
+            etag = response['ETag']
+
+            self.test_super_user.groups.add(self.test_group)
+
+            response = self.client.get('/rest/users/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+        with self.subTest('Check related model delete invalidates etag'):
+            response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json')
+            etag = response['ETag']
+
+            self.test_permission.delete()
+
+            response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test__cached_list(self):
+        """Verifies that REST list views are served from cache until a tracked model changes."""
+        self.client.force_login(self.test_standard_user)
+
+        for url in ('/rest/users/', '/rest/groups/'):
+            with self.subTest('Check repeated request is served from cache - {0}'.format(url)):
+                response = self.client.get(url, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 200)
+                expected_data = response.json()
+
+                # Session, user, and version lookup only.
+                with self.assertNumQueries(3):
+                    response = self.client.get(url, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected_data)
+
+        with self.subTest('Check unrelated user save keeps cached group list'):
+            self.test_super_user.last_login = timezone.now()
+            self.test_super_user.save(update_fields=['last_login'])
+
+            with self.assertNumQueries(3):
+                response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+
+        with self.subTest('Check model save invalidates cache'):
+            self.test_group.name = 'renamed_group'
+            self.test_group.save()
+
+            response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.json()['results'][0]['name'], 'renamed_group')
+
+        with self.subTest('Check m2m change invalidates cache'):
+            self.test_group.permissions.add(self.test_permission)
+
+            response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.json()['results'][0]['permissions'], [self.test_permission.pk])
+
+        with self.subTest('Check users with different permissions do not share entries'):
+            view = GroupModelViewSet()
+            other_user = get_user_model().objects.create(username='other_user')
+
+            standard_scope = view.get_permission_scope(SimpleNamespace(user=self.test_standard_user))
+            self.assertEqual(standard_scope, view.get_permission_scope(SimpleNamespace(user=other_user)))
+            self.assertNotEqual(standard_scope, view.get_permission_scope(SimpleNamespace(user=self.test_super_user)))
+
+            # Permission change for user produces a different scope.
+            view = GroupModelViewSet()
+            other_user.user_permissions.add(self.test_permission)
+            other_user = get_user_model().objects.get(pk=other_user.pk)
+            self.assertNotEqual(standard_scope, view.get_permission_scope(SimpleNamespace(user=other_user)))
+
+    def test__user_list_filters(self):
+        """Verifies that REST user list filters return expected users, using indexed queries."""
+        self.client.force_login(self.test_super_user)
+        now = timezone.now()
+
+        self.test_standard_user.groups.add(self.test_group)
+        self.test_standard_user.profile.state = 'MI'
+        self.test_standard_user.profile.zipcode = '49008'
+        self.test_standard_user.profile.save()
+        get_user_model().objects.filter(pk=self.test_standard_user.pk).update(
+            is_staff=True,
+            date_joined=now - timedelta(days=30),
+            last_login=now - timedelta(days=1),
+        )
+
+        filter_params = [
+            {'is_active': 'false'},
+            {'is_staff': 'true'},
+            {'group': str(self.test_group.pk)},
+            {'date_joined_before': (now - timedelta(days=7)).isoformat()},
+            {
+                'date_joined_after': (now - timedelta(days=60)).isoformat(),
+                'date_joined_before': (now - timedelta(days=7)).isoformat(),
+            },
+            {'last_login_before': (now - timedelta(hours=12)).isoformat()},
+            {
+                'last_login_after': (now - timedelta(days=7)).isoformat(),
+                'last_login_before': (now - timedelta(hours=12)).isoformat(),
+            },
+            {'state': 'MI'},
+            {'zipcode': '49008'},
+        ]
+        for params in filter_params:
+            with self.subTest('Check filter results - {0}'.format(sorted(params))):
+                response = self.client.get('/rest/users/', params, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 200)
+
+                usernames = [user['username'] for user in response.json()['results']]
+                self.assertEqual(usernames, [] if 'is_active' in params else ['test_user'])
+
+            with self.subTest('Check filter query does not scan user tables - {0}'.format(sorted(params))):
+                queryset = UserFilterSet(params, queryset=UserModelViewSet.queryset).qs
+                query_plan = queryset[:UserModelViewSet.pagination_class.page_size].explain()
+
+                # A "SCAN" without an index reads the full table. A "SCAN ... USING INDEX" walks the index
+                # in result order, and stops once the page is filled.
+                self.assertIsNone(
+                    re.search(r'SCAN (TABLE )?test_app_user\w*(?! USING)\b', query_plan),
+                    'Full table scan found in query plan:\n{0}'.format(query_plan),
+                )
+
+        with self.subTest('Check invalid filter value'):
+            response = self.client.get('/rest/users/', {'date_joined_after': 'abc'}, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 400)
+
+    def test__user_bulk_create(self):
+        """Verifies that multiple users can be created in one request, along with their profiles."""
+        self.client.force_login(self.test_super_user)
+
+        with self.subTest('Check bulk create'):
+            payload = [
+                {'username': 'bulk_user_{0}'.format(index), 'password': 'temppass2', 'groups': [self.test_group.pk]}
+                for index in range(25)
+            ]
+            response = self.client.post('/rest/users/bulk/', payload, content_type='application/json')
+            self.assertEqual(response.status_code, 201)
+
+            response_data = response.json()
+            self.assertEqual(len(response_data), 25)
+            self.assertEqual(response_data[0]['groups'], [self.test_group.pk])
+
+            users = get_user_model().objects.filter(username__startswith='bulk_user_')
+            self.assertEqual(users.count(), 25)
+            for user in users:
+                self.assertIsNotNone(user.profile.pk)
+                self.assertEqual(list(user.groups.all()), [self.test_group])
+
+        with self.subTest('Check per-item errors and nothing is written'):
+            payload = [
+                {'username': 'valid_user', 'password': 'temppass2'},
+                {'username': 'test_user', 'password': 'temppass2'},
+                {'username': 'duplicate_user', 'password': 'temppass2'},
+                {'username': 'duplicate_user', 'password': 'temppass2'},
+            ]
+            response = self.client.post('/rest/users/bulk/', payload, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+            response_data = response.json()
+            self.assertEqual(len(response_data), 4)
+            self.assertEqual(response_data[0], {})
+            self.assertIn('username', response_data[1])
+            self.assertEqual(response_data[2], {})
+            self.assertIn('username', response_data[3])
+            self.assertFalse(get_user_model().objects.filter(username='valid_user').exists())
+
+    def test__user_bulk_update_and_delete(self):
+        """Verifies that multiple users can be updated or deleted in one request."""
+        self.client.force_login(self.test_super_user)
+        users = get_user_model().objects.bulk_create_with_profiles([
+            get_user_model()(username='bulk_user_{0}'.format(index))
+            for index in range(10)
+        ])
+
+        with self.subTest('Check bulk partial update'):
+            payload = [
+                {'id': user.pk, 'first_name': 'Bulk{0}'.format(index), 'groups': [self.test_group.pk]}
+                for index, user in enumerate(users)
+            ]
+            response = self.client.patch('/rest/users/bulk/', payload, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+
+            for index, user in enumerate(users):
+                user.refresh_from_db()
+                self.assertEqual(user.first_name, 'Bulk{0}'.format(index))
+                self.assertEqual(user.last_name, '')
+                self.assertEqual(list(user.groups.all()), [self.test_group])
+
+        with self.subTest('Check bulk partial update errors'):
+            payload = [{'id': users[0].pk, 'username': 'test_user'}, {'id': 0, 'first_name': 'Missing'}]
+            response = self.client.patch('/rest/users/bulk/', payload, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+            response_data = response.json()
+            self.assertIn('username', response_data[0])
+            self.assertIn('id', response_data[1])
+
+        with self.subTest('Check bulk delete errors'):
+            response = self.client.delete(
+                '/rest/users/bulk/',
+                [users[0].pk, 0, 'abc'],
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()[0], {})
+            self.assertTrue(get_user_model().objects.filter(pk=users[0].pk).exists())
+
+        with self.subTest('Check bulk delete'):
+            response = self.client.delete(
+                '/rest/users/bulk/',
+                [user.pk for user in users],
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 204)
+            self.assertFalse(get_user_model().objects.filter(username__startswith='bulk_user_').exists())
+
+    def test__user_export(self):
+        """Verifies that user export streams all users, with related data."""
+        self.client.force_login(self.test_standard_user)
+        self.test_standard_user.groups.add(self.test_group)
+        self.test_standard_user.user_permissions.add(self.test_permission)
+        self.test_standard_user.profile.city = 'Test City'
+        self.test_standard_user.profile.state = 'MI'
+        self.test_standard_user.profile.save()
+        get_user_model().objects.bulk_create_with_profiles([
+            get_user_model()(username='export_user_{0}'.format(index))
+            for index in range(5)
+        ])
+
+        with self.subTest('Check NDJSON export'):
+            response = self.client.get('/rest/users/export/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+            rows = [json.loads(line) for line in b''.join(response.streaming_content).decode('utf-8').splitlines()]
+            self.assertEqual(len(rows), 7)
+            self.assertEqual([row['id'] for row in rows], sorted(row['id'] for row in rows))
+
+            row = next(row for row in rows if row['username'] == 'test_user')
+            self.assertEqual(row['groups'], ['test_group'])
+            self.assertEqual(row['permissions'], ['test_app.test_permission'])
+            self.assertEqual(row['city'], 'Test City')
+            self.assertEqual(row['state'], 'MI')
+            self.assertNotIn('password', row)
+
+        with self.subTest('Check CSV export'):
+            response = self.client.get('/rest/users/export/?export_format=csv')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'text/csv')
+
+            rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+            self.assertEqual(len(rows), 7)
+
+            row = next(row for row in rows if row['username'] == 'test_user')
+            self.assertEqual(row['groups'], 'test_group')
+            self.assertEqual(row['is_active'], 'True')
+            self.assertEqual(row['city'], 'Test City')
+
+        with self.subTest('Check query count is constant per chunk'):
+            with patch.object(UserModelViewSet, 'export_chunk_size', 2):
+                response = self.client.get('/rest/users/export/')
+
+                # Four chunks of users, with one users/profile query and two relation queries each.
+                with self.assertNumQueries(12):
+                    content = b''.join(response.streaming_content)
+            self.assertEqual(len(content.splitlines()), 7)
+
+        with self.subTest('Check invalid format'):
+            response = self.client.get('/rest/users/export/?export_format=xml')
+            self.assertEqual(response.status_code, 400)
+
+    def test__throttling(self):
+        """Verifies that REST views and api_parse are throttled per user and per IP."""
+        throttle_rates = {
+            'user_bucket': '3/min',
+            'ip_bucket': '5/min',
+            'api_parse_user_bucket': '100/min',
+            'api_parse_ip_bucket': '2/min',
+        }
+        bucket_store.reset()
+        self.addCleanup(bucket_store.reset)
+
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': throttle_rates}):
+
+            with self.subTest('Check per user limit'):
+                self.client.force_login(self.test_standard_user)
+                for __ in range(3):
+                    response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json')
+                    self.assertEqual(response.status_code, 200)
+
+                response = self.client.get('/rest/groups/', HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 429)
+                self.assertIn('Retry-After', response)
+
+            with self.subTest('Check per IP limit applies across users'):
+                # Throttled request above still took a token from the shared IP bucket.
+                self.client.force_login(self.test_super_user)
+                response = self.client.get('/rest/users/', HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 200)
+
+                response = self.client.get('/rest/users/', HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 429)
+
+            with self.subTest('Check api_parse limit'):
+                self.client.logout()
+                for __ in range(2):
+                    response = self.client.post('/test_app/api/parse/', {'key': 'value'}, content_type='application/json')
+                    self.assertEqual(response.status_code, 200)
+
+                response = self.client.post('/test_app/api/parse/', {'key': 'value'}, content_type='application/json')
+                self.assertEqual(response.status_code, 429)
+                self.assertIn('Retry-After', response)
+
+        with self.subTest('Check hit counters'):
+            self.assertEqual(
+                bucket_store.get_hits(),
+                {'user_bucket': 1, 'ip_bucket': 1, 'api_parse_ip_bucket': 1},
+            )
+
+            get_user_model().objects.filter(pk=self.test_super_user.pk).update(is_staff=True)
+            self.client.force_login(self.test_super_user)
+            response = self.client.get('/test_app/api/throttle-stats/', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['throttle_hits']['user_bucket'], 1)
+
+    def test__token_bucket_store(self):
+        """Verifies token bucket refill and shared cache synchronization."""
+        with self.subTest('Check burst and refill'):
+            store = TokenBucketStore()
+            for __ in range(4):
+                self.assertEqual(store.consume('key', 4, 1.0, now=100.0), 0)
+
+            # Empty bucket. Next token refills in one second.
+            self.assertEqual(store.consume('key', 4, 1.0, now=100.0), 1.0)
+            self.assertEqual(store.consume('key', 4, 1.0, now=100.5), 0.5)
+            self.assertEqual(store.consume('key', 4, 1.0, now=101.0), 0)
+
+            # Refill never exceeds capacity.
+            for __ in range(4):
+                self.assertEqual(store.consume('key', 4, 1.0, now=1000.0), 0)
+            self.assertGreater(store.consume('key', 4, 1.0, now=1000.0), 0)
+
+        with self.subTest('Check least recently used buckets are evicted past max keys'):
+            store = TokenBucketStore(max_keys=2)
+
+            # Slow refilling bucket, used recently, is kept over the fast refilling one.
+            self.assertEqual(store.consume('slow', 2, 0.001, now=0.0), 0)
+            self.assertEqual(store.consume('fast', 100, 100.0, now=0.0), 0)
+            self.assertEqual(store.consume('slow', 2, 0.001, now=10.0), 0)
+            self.assertEqual(store.consume('new', 100, 100.0, now=10.0), 0)
+
+            self.assertEqual(list(store.buckets), ['slow', 'new'])
+            self.assertGreater(store.consume('slow', 2, 0.001, now=10.0), 0)
+
+        with self.subTest('Check buckets are shared through cache'):
+            first_store = TokenBucketStore(cache_alias='default', sync_interval=1.0)
+            second_store = TokenBucketStore(cache_alias='default', sync_interval=1.0)
+            refill_rate = 4 / 3600
+
+            for __ in range(3):
+                self.assertEqual(first_store.consume('shared-key', 4, refill_rate, now=0.0), 0)
+            self.assertEqual(second_store.consume('shared-key', 4, refill_rate, now=0.0), 0)
+
+            # After syncing, each process sees usage from the other.
+            self.assertEqual(first_store.consume('shared-key', 4, refill_rate, now=1.0), 0)
+            self.assertGreater(second_store.consume('shared-key', 4, refill_rate, now=1.0), 0)
+
+        with self.subTest('Check shared cache is used without holding the lock'):
+            store = TokenBucketStore(cache_alias='default', sync_interval=1.0)
+            cache = caches['default']
+            cache_get = cache.get
+            lock_states = []
+
+            def get_unlocked(*args, **kwargs):
+                lock_states.append(store.lock.locked())
+                return cache_get(*args, **kwargs)
+
+            with patch.object(cache, 'get', side_effect=get_unlocked):
+                self.assertEqual(store.consume('unlocked-key', 4, 1.0, now=0.0), 0)
+                self.assertEqual(store.consume('unlocked-key', 4, 1.0, now=0.5), 0)
+
+            # Only the first request is due to sync.
+            self.assertEqual(lock_states, [False])
+
+    @skipIf(msgpack is None, 'Requires msgpack package.')
+    def test__messagepack(self):
+        """Verifies that REST views render and parse MessagePack when requested, and otherwise use JSON."""
+        self.client.force_login(self.test_super_user)
+
+        with self.subTest('Check JSON is used by default'):
+            response = self.client.get('/rest/users/')
+            self.assertEqual(response['Content-Type'], 'application/json')
+            json_data = response.json()
+
+        with self.subTest('Check MessagePack response'):
+            response = self.client.get('/rest/users/', HTTP_ACCEPT='application/msgpack')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'application/msgpack')
+            self.assertEqual(msgpack.unpackb(response.content), json_data)
+
+        with self.subTest('Check MessagePack request'):
+            response = self.client.post(
+                '/rest/groups/',
+                msgpack.packb({'name': 'msgpack_group', 'permissions': [self.test_permission.pk]}),
+                content_type='application/msgpack',
+                HTTP_ACCEPT='application/msgpack',
+            )
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(msgpack.unpackb(response.content)['name'], 'msgpack_group')
+            self.assertTrue(Group.objects.filter(name='msgpack_group', permissions=self.test_permission).exists())
+
+        with self.subTest('Check invalid MessagePack request'):
+            response = self.client.post('/rest/groups/', b'\xc1', content_type='application/msgpack')
+            self.assertEqual(response.status_code, 400)
+
+    def test__bulk_related_field_validation(self):
+        """Verifies that many-to-many pks are validated and written with a fixed number of queries."""
+        self.client.force_login(self.test_super_user)
+        content_type = ContentType.objects.get_for_model(Group)
+        permissions = Permission.objects.bulk_create([
+            Permission(content_type=content_type, codename='bulk_permission_{0}'.format(index), name='Bulk Permission')
+            for index in range(500)
+        ])
+        permission_ids = sorted(permission.pk for permission in permissions)
+        url = '/rest/groups/{0}/'.format(self.test_group.pk)
+
+        with self.subTest('Check query count does not depend on number of pks'):
+            query_counts = []
+            for count in (5, 250):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.put(
+                        url,
+                        {'name': 'test_group', 'permissions': permission_ids[:count]},
+                        content_type='application/json',
+                    )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.test_group.permissions.count(), count)
+                query_counts.append(len(queries))
+
+            self.assertEqual(query_counts[0], query_counts[1])
+
+        with self.subTest('Check 500 permission group update'):
+            self.test_group.permissions.clear()
+
+            # One IN query to validate all pks. Through rows are inserted in two batches, as SQLite
+            # limits each insert to 999 params.
+            with self.assertNumQueries(12):
+                response = self.client.put(
+                    url,
+                    {'name': 'test_group', 'permissions': permission_ids},
+                    content_type='application/json',
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(sorted(response.json()['permissions']), permission_ids)
+
+        with self.subTest('Check all invalid pks are reported together, in input order'):
+            missing_id = permission_ids[-1] + 1000
+            response = self.client.put(
+                url,
+                {'name': 'test_group', 'permissions': [permission_ids[0], missing_id, 'abc', missing_id + 1]},
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'permissions': [
+                'Invalid pk "{0}" - object does not exist.'.format(missing_id),
+                'Incorrect type. Expected pk value, received str.',
+                'Invalid pk "{0}" - object does not exist.'.format(missing_id + 1),
+            ]})
+
+        with self.subTest('Check user relations'):
+            response = self.client.patch(
+                '/rest/users/{0}/'.format(self.test_standard_user.pk),
+                {'groups': [self.test_group.pk], 'user_permissions': permission_ids[:50]},
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.test_standard_user.user_permissions.count(), 50)
+            self.assertEqual(list(self.test_standard_user.groups.all()), [self.test_group])
+
+    def test__user_list_expand(self):
+        """Verifies that profile and favorite foods can be included in REST user data, without per-user queries."""
+        self.client.force_login(self.test_super_user)
+
+        users = get_user_model().objects.bulk_create_with_profiles([
+            get_user_model()(username='expand_user_{0}'.format(index)) for index in range(15)
+        ])
+        pizza = FavoriteFood.objects.create(name='Pizza')
+        tacos = FavoriteFood.objects.create(name='Tacos')
+        pizza.user.add(*users)
+        tacos.user.add(*users[:5])
+        self.test_standard_user.profile.city = 'Kalamazoo'
+        self.test_standard_user.profile.save()
+
+        with self.subTest('Check data is not included by default'):
+            caches['default'].clear()
+            with CaptureQueriesContext(connection) as unexpanded_queries:
+                response = self.client.get('/rest/users/', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('profile', response.json()['results'][0])
+            self.assertNotIn('favorite_foods', response.json()['results'][0])
+
+        with self.subTest('Check expanded data, with one added query'):
+            caches['default'].clear()
+            with self.assertNumQueries(len(unexpanded_queries) + 1):
+                response = self.client.get(
+                    '/rest/users/',
+                    {'expand': 'profile,favorite_foods'},
+                    HTTP_ACCEPT='application/json',
+                )
+            self.assertEqual(response.status_code, 200)
+
+            results = response.json()['results']
+            self.assertEqual(len(results), 10)
+            for result in results:
+                self.assertEqual(result['profile']['city'], '')
+
+                index = int(result['username'].rsplit('_', 1)[1])
+                self.assertEqual(
+                    sorted(food['name'] for food in result['favorite_foods']),
+                    ['Pizza', 'Tacos'] if index < 5 else ['Pizza'],
+                )
+
+        with self.subTest('Check expanded detail'):
+            response = self.client.get(
+                '/rest/users/{0}/'.format(self.test_standard_user.pk),
+                {'expand': 'profile'},
+                HTTP_ACCEPT='application/json',
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['profile']['city'], 'Kalamazoo')
+            self.assertNotIn('favorite_foods', response.json())
+
+        with self.subTest('Check profile change invalidates cached data'):
+            self.test_standard_user.profile.city = 'Detroit'
+            self.test_standard_user.profile.save()
+            response = self.client.get(
+                '/rest/users/{0}/'.format(self.test_standard_user.pk),
+                {'expand': 'profile'},
+                HTTP_ACCEPT='application/json',
+            )
+            self.assertEqual(response.json()['profile']['city'], 'Detroit')
+
+        with self.subTest('Check invalid expand value'):
+            response = self.client.get('/rest/users/', {'expand': 'profile,password'}, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'expand': ['Invalid value "password".']})
+
+    def test__user_search(self):
+        """Verifies that users can be searched by prefix, with best matches first, and that the index stays in sync."""
+        self.client.force_login(self.test_super_user)
+
+        get_user_model().objects.create(username='jsmith', first_name='John', last_name='Smith', email='js@example.com')
+        get_user_model().objects.create(username='smithers', first_name='Waylon', email='waylon@example.com')
+        get_user_model().objects.bulk_create_with_profiles([
+            get_user_model()(username='bulk_search_user', first_name='Jane', last_name='Smithson'),
+        ])
+        self.test_standard_user.profile.city = 'Kalamazoo'
+        self.test_standard_user.profile.save()
+
+        def search(**params):
+            response = self.client.get('/rest/users/search/', params, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            return [user['username'] for user in response.json()['results']]
+
+        with self.subTest('Check prefix matching and ranking'):
+            # Username matches rank above last name matches.
+            usernames = search(q='smith')
+            self.assertEqual(usernames[0], 'smithers')
+            self.assertEqual(sorted(usernames), ['bulk_search_user', 'jsmith', 'smithers'])
+
+        with self.subTest('Check all words must match'):
+            self.assertEqual(search(q='jo smi'), ['jsmith'])
+            self.assertEqual(search(q='jane smith'), ['bulk_search_user'])
+
+        with self.subTest('Check profile fields'):
+            self.assertEqual(search(q='kalam'), ['test_user'])
+
+        with self.subTest('Check search operators are treated as text'):
+            self.assertEqual(search(q='smith OR NOT "jane'), [])
+            self.assertEqual(search(q='***'), [])
+
+        with self.subTest('Check limit'):
+            self.assertEqual(len(search(q='smith', limit=2)), 2)
+            response = self.client.get('/rest/users/search/', {'q': 'smith', 'limit': 1000})
+            self.assertEqual(response.status_code, 400)
+
+        with self.subTest('Check index follows updates and deletes'):
+            get_user_model().objects.filter(username='jsmith').get().delete()
+            self.test_standard_user.first_name = 'Smitty'
+            self.test_standard_user.save()
+            self.test_standard_user.profile.city = 'Detroit'
+            self.test_standard_user.profile.save()
+
+            self.assertEqual(sorted(search(q='smit')), ['bulk_search_user', 'smithers', 'test_user'])
+            self.assertEqual(search(q='kalam'), [])
+            self.assertEqual(search(q='detroit'), ['test_user'])
+
+        with self.subTest('Check fallback matching on other databases'):
+            with patch('test_app.search.get_search_connection', return_value=SimpleNamespace(vendor='postgresql')):
+                self.assertEqual(search(q='smith'), ['bulk_search_user', 'smithers'])
+                self.assertEqual(search(q='ROIT'), ['test_user'])
+                self.assertEqual(search(q='waylon example'), ['smithers'])
+                self.assertEqual(search(q='***'), [])
+
+                users = filter_users(get_user_model().objects.order_by('username'), 'smith')
+                self.assertEqual([user.username for user in users], ['bulk_search_user', 'smithers'])
@@ -0,0 +1,268 @@
+"""
+Request throttling for Django REST test project app.
+"""
+
+# System Imports.
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+
+# Third-Party Imports.
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketStore:
+    """Process-local token buckets, with constant-size state per key.
+
+    Each bucket is stored as a [tokens, last_refill] pair. Tokens refill continuously at the bucket rate,
+    up to its capacity, so no per-request timestamp history is kept.
+
+    Buckets are held in least recently used order. Once `max_keys` buckets are held, each new key evicts the
+    least recently used bucket, so the store has a fixed upper bound and eviction is constant time.
+
+    When a cache alias is provided, each bucket is periodically merged into a shared copy in that cache,
+    so that multiple processes approximately share one limit. The shared copy is only read and written
+    once per `sync_interval` per key, rather than on every request, and never while holding the lock.
+    """
+
+    def __init__(self, cache_alias=None, sync_interval=1.0, max_keys=100000):
+        """
+        :param cache_alias: Optional cache to synchronize buckets with. Buckets stay process-local if None.
+        :param sync_interval: Seconds between shared cache synchronizations, per key.
+        :param max_keys: Max number of buckets to hold. Least recently used buckets are evicted past this.
+        """
+        self.cache_alias = cache_alias
+        self.sync_interval = sync_interval
+        self.max_keys = max_keys
+
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+        self.synced = {}
+        self.hits = Counter()
+
+    def reset(self):
+        """Clears all bucket state and hit counters."""
+        with self.lock:
+            self.buckets.clear()
+            self.synced.clear()
+            self.hits.clear()
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        """Attempts to take one token from the bucket for the given key.
+
+        :param key: Bucket key.
+        :param capacity: Max number of tokens the bucket holds. Also the allowed burst size.
+        :param refill_rate: Tokens added per second.
+        :param now: Current time, in seconds. Defaults to `time.time()`.
+        :return: Seconds to wait until a token is available. Zero if a token was taken.
+        """
+        now = time.time() if now is None else now
+
+        with self.lock:
+            bucket = self._refill(key, capacity, refill_rate, now)
+            if self.cache_alias is None or (key in self.synced and now - self.synced[key][0] < self.sync_interval):
+                return self._take(bucket, refill_rate)
+
+            # Claim this sync interval, so other threads keep using the local bucket while the cache is read.
+            last_synced, synced_tokens = self.synced.get(key, (now, bucket[0]))
+            local_tokens = bucket[0]
+            self.synced[key] = (now, local_tokens)
+
+        # Shared cache round trips are made without holding the lock, so other requests are not held up by them.
+        shared_tokens = self._sync(key, local_tokens, last_synced, synced_tokens, capacity, refill_rate, now)
+
+        with self.lock:
+            # Apply usage by other processes to the bucket, keeping tokens taken locally during the sync.
+            bucket = self._refill(key, capacity, refill_rate, now)
+            bucket[0] = max(0.0, bucket[0] + shared_tokens - local_tokens)
+            self.synced[key] = (now, shared_tokens)
+            return self._take(bucket, refill_rate)
+
+    def record_hit(self, scope):
+        """Increments throttle hit counter for given scope."""
+        with self.lock:
+            self.hits[scope] += 1
+
+    def get_hits(self):
+        """Returns dict of {scope: number of throttled requests}."""
+        with self.lock:
+            return dict(self.hits)
+
+    def _evict(self):
+        """Drops the least recently used bucket.
+
+        With keys of all scopes sharing one store, this is usually a bucket of a client that has long since
+        gone idle, and so has refilled anyway.
+        """
+        key = self.buckets.popitem(last=False)[0]
+        self.synced.pop(key, None)
+
+    def _refill(self, key, capacity, refill_rate, now):
+        """Returns the bucket for a key, refilled up to now. Creates a full bucket if the key has none."""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self._evict()
+            bucket = self.buckets[key] = [float(capacity), now]
+        else:
+            self.buckets.move_to_end(key)
+            bucket[0] = min(capacity, bucket[0] + max(0.0, now - bucket[1]) * refill_rate)
+            bucket[1] = max(bucket[1], now)
+        return bucket
+
+    def _take(self, bucket, refill_rate):
+        """Takes one token from a bucket. Returns seconds to wait until a token is available, or zero if taken."""
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0
+
+        return (1 - bucket[0]) / refill_rate
+
+    def _sync(self, key, local_tokens, last_synced, synced_tokens, capacity, refill_rate, now):
+        """Merges local token usage since last sync into the shared cache copy of the bucket.
+
+        Only reads its arguments, so it can run without holding the lock.
+        :return: Number of tokens left in the bucket, after usage by all processes.
+        """
+        cache = caches[self.cache_alias]
+        cache_key = 'throttle-bucket:{0}'.format(key)
+
+        tokens = local_tokens
+        shared = cache.get(cache_key)
+        if shared is not None:
+            # Tokens used locally since last sync is what was taken, less what refilled since.
+            used = max(0, synced_tokens + (now - last_synced) * refill_rate - local_tokens)
+            shared_tokens, shared_refill = shared
+            shared_tokens = min(capacity, shared_tokens + (now - shared_refill) * refill_rate)
+            tokens = max(0.0, min(local_tokens, shared_tokens - used))
+
+        cache.set(cache_key, (tokens, now), int(capacity / refill_rate) + 1)
+        return tokens
+
+
+# Buckets used by all throttles in this process.
+bucket_store = TokenBucketStore(cache_alias=getattr(settings, 'THROTTLE_CACHE_ALIAS', None))
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttles requests with a token bucket per client key.
+
+    Rates are read from the `DEFAULT_THROTTLE_RATES` REST setting, by scope, in the standard
+    "<number>/<period>" format. The number is also the allowed burst size.
+    """
+
+    # Rate setting to use.
+    scope = None
+
+    # Buckets to consume from.
+    store = bucket_store
+
+    def __init__(self):
+        self.num_requests, self.duration = self.parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(self.scope))
+        self.wait_time = 0
+
+    def parse_rate(self, rate):
+        """Returns (num_requests, duration in seconds) for a rate string. Returns (None, None) if no rate."""
+        if rate is None:
+            return None, None
+        num, period = rate.split('/')
+        duration = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+        return int(num), duration
+
+    def get_cache_key(self, request, view):
+        """Returns the client key to throttle by, or None to not throttle the request."""
+        raise NotImplementedError('.get_cache_key() must be overridden.')
+
+    def allow_request(self, request, view):
+        if self.num_requests is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        self.wait_time = self.store.consume(
+            '{0}:{1}'.format(self.scope, key),
+            self.num_requests,
+            self.num_requests / self.duration,
+        )
+        if self.wait_time:
+            self.store.record_hit(self.scope)
+            return False
+
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Throttles per authenticated user, or per API token if the request is not yet authenticated."""
+
+    scope = 'user_bucket'
+
+    def get_cache_key(self, request, view):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return 'user-{0}'.format(user.pk)
+
+        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+        if auth_header.startswith('Token '):
+            return 'token-{0}'.format(hashlib.sha256(auth_header.encode('utf-8')).hexdigest()[:32])
+
+        return None
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Throttles per client IP address."""
+
+    scope = 'ip_bucket'
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class ApiParseUserThrottle(UserTokenBucketThrottle):
+    """Per user/token throttle for the api_parse view."""
+
+    scope = 'api_parse_user_bucket'
+
+
+class ApiParseIPThrottle(IPTokenBucketThrottle):
+    """Per IP throttle for the api_parse view."""
+
+    scope = 'api_parse_ip_bucket'
+
+
+def throttle_view(*throttle_classes):
+    """Decorator that applies REST throttle classes to a standard (non-REST) Django view.
+
+    Throttled requests receive a 429 JSON response, with a Retry-After header.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            wait_times = []
+            for throttle_class in throttle_classes:
+                throttle = throttle_class()
+                if not throttle.allow_request(request, view_func):
+                    wait_times.append(throttle.wait())
+
+            if wait_times:
+                wait_time = max(wait_times)
+                response = JsonResponse(
+                    {'success': False, 'detail': 'Request was throttled.', 'wait': wait_time},
+                    status=429,
+                )
+                response['Retry-After'] = str(int(wait_time) + 1)
+                return response
+
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -24,6 +24,7 @@ urlpatterns = [
 
     # Test REST API views.
     path('api/api-token-auth', rest_views.obtain_auth_token, name='api_token_auth'),
+    path('api/throttle-stats/', views.ThrottleStatsView.as_view(), name='api_throttle_stats'),
 
     # Test app root, but as a class.
     path('as_class', views.ExampleClassView.as_view(), name='index_as_class'),
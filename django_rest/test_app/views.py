@@ -11,21 +11,42 @@ import requests
 # Third-Party Imports.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required, permission_required
-from django.contrib.auth.models import Group
-from django.http import JsonResponse, QueryDict
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.http import JsonResponse, QueryDict, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.views.generic import TemplateView
 from django.shortcuts import redirect, render, reverse
-from rest_framework import permissions, viewsets
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 # Internal Imports.
+from test_app.exports import iter_csv, iter_ndjson, iter_user_export_chunks
+from test_app.filters import UserFilterSet
 from test_app.forms import ApiSendForm
-from test_app.models import ApiRequestJson
+from test_app.mixins import CachedListMixin, ConditionalGetMixin, MessagePackMixin
+from test_app.models import ApiRequestJson, FavoriteFood, ModelVersion, UserProfile
+from test_app.search import search_user_ids
 from test_app.serializers import (
+    FavoriteFoodsField,
     GroupSerializer,
+    UserProfileField,
     UserSerializer,
 )
+from test_app.throttling import (
+    ApiParseIPThrottle,
+    ApiParseUserThrottle,
+    IPTokenBucketThrottle,
+    UserTokenBucketThrottle,
+    bucket_store,
+    throttle_view,
+)
 
 
 # region Index/Root Views
@@ -190,6 +211,7 @@ def view_with_group_check(request):
 
 @csrf_exempt
 @require_http_methods(['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+@throttle_view(ApiParseUserThrottle, ApiParseIPThrottle)
 def api_parse(request):
     """Takes in JSON ping, and saves incoming value to web cookies.
 
@@ -577,21 +599,189 @@ def api_send(request):
 
 # region REST API Views
 
-class UserModelViewSet(viewsets.ModelViewSet):
+class UserModelViewSet(MessagePackMixin, ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows users to be viewed or edited.
     """
     queryset = get_user_model().objects.all().order_by('-date_joined')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = UserFilterSet
+    versioned_models = (get_user_model(), Group, Permission, UserProfile, FavoriteFood)
+
+    # Number of users read per query, when exporting.
+    export_chunk_size = 500
+
+    # Default and max number of users returned by search.
+    search_default_limit = 20
+    search_max_limit = 100
+
+    def get_expand(self):
+        """Returns tuple of related data names to include, from the "expand" query param."""
+        if not hasattr(self, '_expand'):
+            expand = [value for value in self.request.query_params.get('expand', '').split(',') if value]
+            invalid = [value for value in expand if value not in self.serializer_class.expandable_fields]
+            if invalid:
+                raise ValidationError({'expand': ['Invalid value "{0}".'.format(value) for value in invalid]})
+            self._expand = tuple(dict.fromkeys(expand))
+        return self._expand
+
+    def get_queryset(self):
+        """On read, loads all related data for a page of users in a fixed number of queries."""
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'retrieve', 'search'):
+            return queryset
+
+        queryset = queryset.prefetch_related('groups', 'user_permissions')
+
+        # Favorite foods are loaded once the users to return are known. See preload_expanded().
+        if 'profile' in self.get_expand():
+            queryset = queryset.annotate(**UserProfileField.annotations())
+
+        return queryset
+
+    def preload_expanded(self, users):
+        """Loads expanded relation data that get_queryset() can not join, for all provided users in one query."""
+        if 'favorite_foods' in self.get_expand():
+            FavoriteFoodsField.preload(users)
+        return users
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and self.action == 'list':
+            self.preload_expanded(page)
+        return page
+
+    def get_object(self):
+        user = super().get_object()
+        if self.action == 'retrieve':
+            self.preload_expanded([user])
+        return user
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Streams all users (or those matching list filters), with their groups, permissions, and profile fields.
+
+        Output format is set by the `export_format` query param. Either "ndjson" (default) or "csv".
+        """
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            raise ValidationError({'export_format': ['Must be one of "ndjson" or "csv".']})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        row_chunks = iter_user_export_chunks(queryset, chunk_size=self.export_chunk_size)
+        if export_format == 'csv':
+            response = StreamingHttpResponse(iter_csv(row_chunks), content_type='text/csv')
+        else:
+            response = StreamingHttpResponse(iter_ndjson(row_chunks), content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="users.{0}"'.format(export_format)
+
+        return response
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Returns users matching the `q` query param, best match first.
+
+        Each word is matched as a prefix of username, first/last name, email, or profile city/state/zipcode.
+        Number of results is set by the `limit` query param.
+        """
+        try:
+            limit = int(request.query_params.get('limit', self.search_default_limit))
+        except ValueError:
+            raise ValidationError({'limit': ['A valid integer is required.']})
+        if not 0 < limit <= self.search_max_limit:
+            raise ValidationError({'limit': ['Must be between 1 and {0}.'.format(self.search_max_limit)]})
+
+        user_ids = search_user_ids(request.query_params.get('q', ''), limit=limit)
+        users = self.get_queryset().in_bulk(user_ids)
+        users = self.preload_expanded([users[pk] for pk in user_ids if pk in users])
+
+        return Response({'count': len(users), 'results': self.get_serializer(users, many=True).data})
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_create(self, request):
+        """Creates multiple users from a list payload, using batched inserts."""
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        users = serializer.save()
+
+        # Load relations for response in one query each, instead of per user.
+        prefetch_related_objects(users, 'groups', 'user_permissions')
+        return Response(self.get_serializer(users, many=True).data, status=status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_partial_update(self, request):
+        """Partially updates multiple users from a list payload, using batched updates.
+
+        Each item must include the id of the user to update.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+
+        ids = [item.get('id') for item in request.data if isinstance(item, dict)]
+        users = list(self.get_queryset().filter(pk__in=[pk for pk in ids if isinstance(pk, int)]))
+
+        serializer = self.get_serializer(users, data=request.data, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        users = serializer.save()
+
+        # Load relations for response in one query each, instead of per user.
+        prefetch_related_objects(users, 'groups', 'user_permissions')
+        return Response(self.get_serializer(users, many=True).data)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        """Deletes multiple users from a list of ids, in one transaction."""
+        if not isinstance(request.data, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of user ids.']})
+
+        ids = [pk for pk in request.data if isinstance(pk, int)]
+        existing_ids = set(self.get_queryset().filter(pk__in=ids).values_list('pk', flat=True))
+
+        # Report errors per item, in the same order as provided.
+        errors = []
+        for pk in request.data:
+            if not isinstance(pk, int):
+                errors.append({'id': ['A valid integer is required.']})
+            elif pk not in existing_ids:
+                errors.append({'id': ['Must be the id of an existing user.']})
+            else:
+                errors.append({})
+        if any(errors):
+            raise ValidationError(errors)
 
+        # Delete fires signals per row. Merge resulting version bumps into one.
+        with transaction.atomic(), ModelVersion.objects.batched():
+            self.get_queryset().filter(pk__in=existing_ids).delete()
 
-class GroupModelViewSet(viewsets.ModelViewSet):
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class GroupModelViewSet(MessagePackMixin, ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows groups to be viewed or edited.
     """
-    queryset = Group.objects.all()
+    queryset = Group.objects.all().order_by('id')
     serializer_class = GroupSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UserTokenBucketThrottle, IPTokenBucketThrottle]
+    versioned_models = (Group, Permission)
+
+
+class ThrottleStatsView(APIView):
+    """
+    API endpoint that displays number of throttled requests, per throttle scope, for the current process.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({'throttle_hits': bucket_store.get_hits()})
 
 # endregion REST API Views
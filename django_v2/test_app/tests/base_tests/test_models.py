@@ -7,6 +7,7 @@ Uses base/built-in Django logic to execute.
 # Third-Party Imports.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.db import IntegrityError
 from django.shortcuts import reverse
 from django.test import TestCase
 
@@ -136,6 +137,33 @@ class ModelTestCase(TestCase):
             user_profile = UserProfile.objects.get(user=new_user)
             self.assertEqual(user_profile, new_user.profile)
 
+    def test__bulk_create_with_profiles(self):
+        """Verifies that bulk created users are saved with primary keys and corresponding profiles."""
+        with self.subTest('Check bulk creation'):
+            users = get_user_model().objects.bulk_create_with_profiles(
+                [get_user_model()(username='bulk_user_{0}'.format(index)) for index in range(1200)],
+                batch_size=500,
+            )
+            self.assertEqual(len(users), 1200)
+            self.assertEqual(get_user_model().objects.filter(username__startswith='bulk_user_').count(), 1200)
+            self.assertEqual(UserProfile.objects.filter(user__username__startswith='bulk_user_').count(), 1200)
+
+            # Returned instances have primary keys, on all database backends.
+            for index in (0, 499, 500, 1199):
+                user = users[index]
+                self.assertIsNotNone(user.pk)
+                self.assertFalse(user._state.adding)
+                self.assertEqual(get_user_model().objects.get(pk=user.pk).username, 'bulk_user_{0}'.format(index))
+                self.assertEqual(user.profile, UserProfile.objects.get(user=user))
+
+        with self.subTest('Check nothing is written on error'):
+            with self.assertRaises(IntegrityError):
+                get_user_model().objects.bulk_create_with_profiles([
+                    get_user_model()(username='new_bulk_user'),
+                    get_user_model()(username='test_user'),
+                ])
+            self.assertFalse(get_user_model().objects.filter(username='new_bulk_user').exists())
+
     def test__assert_login(self):
         """Verifies that expected user model properly logs in."""
         with self.subTest('Check login using super user'):
@@ -3,8 +3,8 @@ Models for Django v4.2 test project app.
 """
 
 # Third-Party Imports.
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.auth.models import AbstractUser, UserManager as AuthUserManager
+from django.db import models, transaction
 from localflavor.us.models import USStateField, USZipCodeField
 
 
@@ -18,12 +18,68 @@ class BaseAbstractModel(models.Model):
     date_created = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        abstract = True
+
+
+class UserManager(AuthUserManager):
+    """Manager for custom user model."""
+
+    def bulk_create_with_profiles(self, users, batch_size=None):
+        """Inserts provided users, plus their corresponding UserProfile models, in batched statements.
+
+        Standard bulk_create() skips User.save(), so profiles have to be generated here instead.
+
+        :param users: Iterable of unsaved User instances.
+        :param batch_size: Max number of rows per INSERT statement. Defaults to the largest the database allows.
+        :return: List of saved User instances.
+        """
+        users = list(users)
+
+        with transaction.atomic(using=self.db):
+            users = self.bulk_create(users, batch_size=batch_size)
+            self._set_missing_pks(users, batch_size=batch_size)
+            profiles = UserProfile.objects.using(self.db).bulk_create(
+                [UserProfile(user=user) for user in users],
+                batch_size=batch_size,
+            )
+
+            # If profile primary keys were not returned, drop cached profiles so they are loaded on access.
+            for user, profile in zip(users, profiles):
+                if profile.pk is None:
+                    self.model.profile.related.delete_cached_value(user)
+
+        return users
+
+    def _set_missing_pks(self, users, batch_size=None):
+        """Sets primary keys on bulk inserted users, for databases that do not return them from inserts.
+
+        Such as SQLite on Django versions prior to 4.0. Looked up by username, which is unique.
+        """
+        missing = [user for user in users if user.pk is None]
+        if not missing:
+            return
+
+        batch_size = batch_size or 500
+        username_field = self.model.USERNAME_FIELD
+        for index in range(0, len(missing), batch_size):
+            batch = missing[index:index + batch_size]
+            pks = dict(self.filter(**{
+                '{0}__in'.format(username_field): [user.get_username() for user in batch],
+            }).values_list(username_field, 'pk'))
+            for user in batch:
+                user.pk = pks[user.get_username()]
+                user._state.adding = False
+                user._state.db = self.db
+
 
 class User(AbstractUser):
     """Custom user model definition.
     Defined as per the Django docs. Not yet directly used.
     """
 
+    objects = UserManager()
+
     def clean(self, *args, **kwargs):
         """
         Custom cleaning implementation. Includes validation, setting fields, etc.